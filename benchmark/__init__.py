@@ -0,0 +1,8 @@
+"""
+离线基准测试, 使用进程内模拟的 Alist 文件系统及 TMDB 接口测试重命名流程各阶段的耗时及内存峰值
+
+用例: python -m benchmark --sizes 10,1000,10000 --compare
+"""
+
+from .bench import STAGES, compare, make_amr, pipeline, run_benchmark  # noqa: F401
+from .fake import FakeAlist, FakeServices, FakeTMDB  # noqa: F401
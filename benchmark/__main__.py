@@ -0,0 +1,132 @@
+import json
+import sys
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from .bench import STAGES, compare, environment, run_benchmark
+
+# 输出重定向至文件时使用较宽的表格, 避免列标题被截断
+console = Console() if sys.stdout.isatty() else Console(width=160)
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def print_results(results: list[dict]):
+    """输出各阶段耗时及内存峰值"""
+
+    table = Table(title="基准测试结果 (耗时单位: 毫秒)")
+    table.add_column("文件数", justify="right")
+    for stage in STAGES:
+        table.add_column(stage, justify="right")
+    table.add_column("总耗时", justify="right", style="bold")
+    table.add_column("文件/秒", justify="right")
+    table.add_column("请求/重试", justify="right")
+    table.add_column("内存峰值", justify="right")
+    for result in results:
+        peak = result.get("peak_memory")
+        table.add_row(
+            str(result["files"]),
+            *(f"{result['stages'][stage] * 1000:.0f}" for stage in STAGES),
+            f"{result['total'] * 1000:.0f}",
+            f"{result['throughput']:.0f}",
+            f"{result['requests']}/{result['retries']}",
+            f"{peak / 2**20:.1f}MB" if peak is not None else "-",
+        )
+    console.print(table)
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option(
+    "--sizes",
+    default="10,1000,10000",
+    show_default=True,
+    help="剧集视频文件数量, 以逗号分隔, 最大支持 100000",
+)
+@click.option("--latency", default=0.0, show_default=True, help="模拟请求延迟(秒)")
+@click.option("--error-rate", default=0.0, show_default=True, help="模拟请求出错的概率")
+@click.option(
+    "--throttle",
+    default=0,
+    show_default=True,
+    help="Alist 同时处理的最大请求数, 超出时返回 429, 0 为不限制",
+)
+@click.option(
+    "--tmdb-rate", default=0, show_default=True, help="TMDB 每秒最大请求数, 0 为不限制"
+)
+@click.option("--concurrency", default=8, show_default=True, help="异步重命名并发数")
+@click.option(
+    "--per-page", default=1000, show_default=True, help="获取文件列表时每页文件数量"
+)
+@click.option("--no-memory", is_flag=True, help="不记录内存峰值, 每项仅运行一次")
+@click.option("--output", "-o", type=click.Path(), help="将结果以 JSON 格式保存")
+@click.option(
+    "--baseline",
+    type=click.Path(),
+    default=str(DEFAULT_BASELINE),
+    show_default=True,
+    help="基准结果文件",
+)
+@click.option("--save-baseline", is_flag=True, help="将本次结果保存为基准结果")
+@click.option("--compare", "do_compare", is_flag=True, help="与基准结果比较")
+@click.option("--tolerance", default=0.5, show_default=True, help="允许的性能波动比例")
+def main(
+    sizes,
+    latency,
+    error_rate,
+    throttle,
+    tmdb_rate,
+    concurrency,
+    per_page,
+    no_memory,
+    output,
+    baseline,
+    save_baseline,
+    do_compare,
+    tolerance,
+):
+    """
+    离线基准测试, 使用模拟 Alist 及 TMDB 测试剧集重命名各阶段的耗时及内存峰值
+    """
+
+    knobs = {
+        "latency": latency,
+        "error_rate": error_rate,
+        "throttle": throttle,
+        "tmdb_rate": tmdb_rate,
+        "rename_concurrency": concurrency,
+        "per_page": per_page,
+    }
+    results = []
+    for size in (int(s) for s in sizes.split(",") if s.strip()):
+        with console.status(f"正在测试 {size} 个文件..."):
+            results.append(run_benchmark(size, memory=not no_memory, **knobs))
+    print_results(results)
+
+    report = {"environment": environment(), "knobs": knobs, "results": results}
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if save_baseline:
+        Path(baseline).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        console.print(f"[green]已保存基准结果: {baseline}")
+
+    if do_compare:
+        path = Path(baseline)
+        if not path.exists():
+            console.print(f"[red]基准结果文件不存在: {baseline}")
+            sys.exit(1)
+        base = json.loads(path.read_text(encoding="utf-8"))
+        if base.get("knobs") != knobs:
+            console.print("[yellow]模拟参数与基准结果不同, 比较结果仅供参考")
+        regressions = compare(results, base, tolerance)
+        if regressions:
+            for message in regressions:
+                console.print(f"[red]性能下降: {message}")
+            sys.exit(1)
+        console.print("[green]未发现性能下降")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from AlistMediaRename import Amr, Config
+from AlistMediaRename.client import HttpClients
+from AlistMediaRename.output import Output, console
+
+from .fake import FakeAlist, FakeServices, FakeTMDB
+
+# 重命名流程各阶段: 获取文件列表, 查找 TMDB 信息, 匹配, 输出重命名信息, 重命名, 输出重命名结果
+STAGES = ["list", "lookup", "plan", "render", "apply", "summary"]
+
+
+def make_files(count: int) -> list[str]:
+    """生成剧集文件名, 每 10 个视频文件附带 1 个字幕文件"""
+
+    videos = [f"[Group] Show - {i:0>6} [1080p].mkv" for i in range(1, count + 1)]
+    subtitles = [f"[Group] Show - {i:0>6}.ass" for i in range(1, count // 10 + 1)]
+    return videos + subtitles
+
+
+def make_amr(
+    files: int,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    throttle: int = 0,
+    tmdb_rate: int = 0,
+    rename_concurrency: int = 8,
+    per_page: int = 1000,
+    seed: int = 0,
+    amr_class: type[Amr] = Amr,
+    config: Optional[Config] = None,
+) -> tuple[Amr, FakeServices]:
+    """
+    创建连接模拟 Alist 及 TMDB 的 Amr
+
+    :param files: 剧集视频文件数量
+    :param latency: 每个请求的延迟(秒)
+    :param error_rate: 请求随机出错的概率, Alist 读取请求返回响应体错误码 500, TMDB 返回 503
+    :param throttle: Alist 同时处理的最大请求数, 0 为不限制
+    :param tmdb_rate: TMDB 每秒最大请求数, 0 为不限制
+    :param rename_concurrency: 异步重命名最大并发数
+    :param per_page: 获取文件列表时每页文件数量
+    :param seed: 随机数种子
+    :param amr_class: Amr 或 AsyncAmr
+    :param config: 基础配置, 模拟服务地址等参数写入其中, 默认使用默认配置
+    """
+
+    alist = FakeAlist(
+        latency=latency, error_rate=error_rate, max_in_flight=throttle, seed=seed
+    )
+    alist.add_folder("/show", make_files(files))
+    tmdb = FakeTMDB(
+        episodes=files,
+        rate_limit=tmdb_rate,
+        latency=latency,
+        error_rate=error_rate,
+        seed=seed,
+    )
+    services = FakeServices(alist, tmdb)
+
+    config = config or Config()
+    config.alist.url = services.alist_url
+    config.alist.list_per_page = per_page
+    config.tmdb.api_url = services.tmdb_url
+    config.tmdb.rate_limit = 0
+    config.amr.connection_warmup = False
+    config.amr.rename_max_concurrency = rename_concurrency
+    config.amr.retry_backoff = 0.01
+    config.amr.retry_max_backoff = 1.0
+
+    transport, async_transport = services.transports()
+    clients = HttpClients(transport=transport, async_transport=async_transport)
+    return amr_class(config, clients=clients), services
+
+
+def pipeline(amr: Amr, stage: Callable) -> list:
+    """
+    按 tv_rename_id 的流程执行重命名, 无需用户选择及确认
+
+    :param amr: Amr
+    :param stage: 记录各阶段的上下文管理器
+    :return: 重命名请求结果
+    """
+
+    folder_path = "/show/"
+    language = amr.config.tmdb.language
+    with stage("list"):
+        media = amr._list_folder(folder_path)
+    with stage("lookup"):
+        tv_info = amr.tmdb.tv_info("1", language)
+        season_info = amr.tmdb.tv_season_info("1", 1, language)
+    with stage("plan"):
+        video_rename_list, subtitle_rename_list, title = amr._tv_plan(
+            "1", tv_info.data, season_info.data, media, folder_path, "1-"
+        )
+        folder_rename_list = amr._folder_rename_list(folder_path, title)
+    with stage("render"):
+        Output.print_rename_info(
+            video_rename_list,
+            subtitle_rename_list,
+            amr.config.amr.media_folder_rename,
+            title,
+            folder_path,
+        )
+    with stage("apply"):
+        results = amr._apply(
+            video_rename_list, subtitle_rename_list, folder_rename_list
+        )
+    with stage("summary"):
+        Output.print_rename_result(
+            results,
+            len(video_rename_list),
+            len(subtitle_rename_list),
+            len(folder_rename_list),
+            amr.retry_count,
+        )
+    return results
+
+
+@contextmanager
+def quiet_console() -> Iterator[None]:
+    """输出写入空设备, 仍包含表格渲染耗时"""
+
+    file = console.file
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        console.file = devnull
+        try:
+            yield
+        finally:
+            console.file = file
+
+
+def run_benchmark(files: int, memory: bool = True, **knobs) -> dict:
+    """
+    运行单项基准测试, 先记录各阶段耗时, 再使用 tracemalloc 记录各阶段内存峰值
+
+    :param files: 剧集视频文件数量
+    :param memory: 是否记录内存峰值, 记录时需要重新运行一次
+    :param knobs: 模拟服务参数, 参考 make_amr
+    :return: 基准测试结果
+    """
+
+    timings: dict[str, float] = {}
+
+    @contextmanager
+    def timed(name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        timings[name] = time.perf_counter() - start
+
+    amr, services = make_amr(files, **knobs)
+    with amr, quiet_console():
+        results = pipeline(amr, timed)
+        retries = amr.retry_count
+
+    total = sum(timings.values())
+    result = {
+        "files": files,
+        "renamed": sum(r.success for r in results),
+        "failed": sum(not r.success for r in results),
+        "retries": retries,
+        "requests": services.alist.requests + services.tmdb.requests,
+        "stages": timings,
+        "total": total,
+        "throughput": files / total if total else 0.0,
+    }
+
+    if memory:
+        stage_memory: dict[str, int] = {}
+
+        @contextmanager
+        def traced(name: str) -> Iterator[None]:
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            yield
+            stage_memory[name] = tracemalloc.get_traced_memory()[1] - start
+
+        amr, _ = make_amr(files, **knobs)
+        tracemalloc.start()
+        try:
+            with amr, quiet_console():
+                pipeline(amr, traced)
+                result["peak_memory"] = max(stage_memory.values())
+        finally:
+            tracemalloc.stop()
+        result["stage_memory"] = stage_memory
+
+    return result
+
+
+def environment() -> dict:
+    """运行环境, 与基准测试结果一同保存"""
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float = 0.5) -> list[str]:
+    """
+    与基准结果比较, 总耗时或内存峰值超出基准值的 (1 + tolerance) 倍时视为性能下降
+
+    :param results: 基准测试结果
+    :param baseline: 基准结果, 格式与 run_benchmark 的返回值相同
+    :param tolerance: 允许的波动比例
+    :return: 性能下降信息, 无下降时返回空列表
+    """
+
+    # 耗时较短时波动较大, 允许额外 50 毫秒的误差
+    slack = 0.05
+    base = {item["files"]: item for item in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        expected = base.get(result["files"])
+        if expected is None:
+            continue
+        if result["total"] > expected["total"] * (1 + tolerance) + slack:
+            regressions.append(
+                f"{result['files']} 个文件: 总耗时 {result['total']:.3f}s, 基准 {expected['total']:.3f}s"
+            )
+        if (
+            "peak_memory" in result
+            and "peak_memory" in expected
+            and result["peak_memory"] > expected["peak_memory"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f"{result['files']} 个文件: 内存峰值 {result['peak_memory'] / 2**20:.1f}MB, 基准 {expected['peak_memory'] / 2**20:.1f}MB"
+            )
+    return regressions
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+
+
+class FakeServer:
+    """
+    模拟服务端基类
+    同步/异步传输层共用同一处理函数, 可设置请求延迟、错误率及限流
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        max_in_flight: int = 0,
+        seed: int = 0,
+    ):
+        """
+        初始化参数
+
+        :param latency: 每个请求的延迟(秒)
+        :param error_rate: 随机返回错误的概率
+        :param max_in_flight: 同时处理的最大请求数, 超出时返回限流错误, 0 为不限制
+        :param seed: 随机数种子
+        """
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_in_flight = max_in_flight
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        # 统计信息
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """处理请求, 由子类实现"""
+
+        raise NotImplementedError
+
+    def reject(self, request: httpx.Request, throttled: bool) -> httpx.Response:
+        """
+        请求被限流或随机出错时返回的响应
+
+        :param request: 请求
+        :param throttled: 是否为限流, 否则为随机错误
+        """
+
+        if throttled:
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={})
+        return httpx.Response(503, json={})
+
+    def _enter(self, request: httpx.Request) -> Optional[httpx.Response]:
+        """开始处理请求, 需要返回错误或限流时返回对应响应"""
+
+        with self.lock:
+            self.requests += 1
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                self.throttled += 1
+                return self.reject(request, True)
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.errors += 1
+                return self.reject(request, False)
+            self.in_flight += 1
+        return None
+
+    def _exit(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def sync_handle(self, request: httpx.Request) -> httpx.Response:
+        rejected = self._enter(request)
+        if rejected is not None:
+            return rejected
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return self.handle(request)
+        finally:
+            self._exit()
+
+    async def async_handle(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        rejected = self._enter(request)
+        if rejected is not None:
+            return rejected
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self.handle(request)
+        finally:
+            self._exit()
+
+
+class FakeAlist(FakeServer):
+    """
+    模拟 Alist 文件系统, 支持登录、分页获取文件列表及重命名.
+    与 Alist 相同, 后端出错时 HTTP 状态码为 200, 错误码在响应体 code 字段中
+    """
+
+    # 幂等请求, 限流或随机出错时返回响应体错误码
+    read_paths = {"/api/auth/login", "/api/fs/list", "/api/fs/get"}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # 文件夹路径(以 / 结尾) -> 文件名 -> 是否为文件夹
+        self.fs: dict[str, dict[str, bool]] = {"/": {}}
+
+    def add_folder(self, path: str, files: list[str]):
+        """添加文件夹及其中的文件"""
+
+        path = path.rstrip("/") + "/"
+        parent, name = path[:-1].rsplit("/", 1)
+        self.fs.setdefault(parent + "/", {})[name] = True
+        self.fs[path] = {file: False for file in files}
+
+    def reject(self, request: httpx.Request, throttled: bool) -> httpx.Response:
+        if request.url.path in self.read_paths:
+            message = "storage busy" if throttled else "internal error"
+            return self._result(code=500, message=message)
+        # 重命名不按响应体错误码重试, 模拟前置代理未转发请求时返回的 429/503
+        return super().reject(request, throttled)
+
+    @staticmethod
+    def _result(data: Optional[dict] = None, code: int = 200, message: str = "success"):
+        return httpx.Response(
+            200, json={"code": code, "message": message, "data": data}
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/api/auth/login":
+            return self._result({"token": "token"})
+        if path == "/api/fs/list":
+            return self._list(request)
+        if path == "/api/fs/rename":
+            return self._rename(json.loads(request.content))
+        return httpx.Response(404, json={})
+
+    def _list(self, request: httpx.Request) -> httpx.Response:
+        folder = request.url.params["path"].rstrip("/") + "/"
+        files = self.fs.get(folder)
+        if files is None:
+            return self._result(code=500, message="object not found")
+        per_page = int(request.url.params.get("per_page") or 0)
+        page = int(request.url.params.get("page") or 1)
+        names = list(files)
+        if per_page > 0:
+            names = names[(page - 1) * per_page : page * per_page]
+        content = [
+            {"name": name, "is_dir": files[name], "size": 0, "modified": ""}
+            for name in names
+        ]
+        return self._result({"content": content, "total": len(files)})
+
+    def _rename(self, body: dict) -> httpx.Response:
+        folder, name = body["path"].rsplit("/", 1)
+        folder += "/"
+        with self.lock:
+            files = self.fs.get(folder, {})
+            if name not in files:
+                return self._result(code=500, message="object not found")
+            is_dir = files.pop(name)
+            files[body["name"]] = is_dir
+            if is_dir:
+                self.fs[folder + body["name"] + "/"] = self.fs.pop(folder + name + "/")
+        return self._result()
+
+
+class FakeTMDB(FakeServer):
+    """
+    模拟 TMDB 接口, 剧集包含指定数量的单集, 支持 append_to_response 及每秒请求数限制
+    """
+
+    def __init__(self, episodes: int = 12, rate_limit: int = 0, **kwargs):
+        """
+        初始化参数
+
+        :param episodes: 每季单集数量
+        :param rate_limit: 每秒最大请求数, 超出时返回 429, 0 为不限制
+        """
+
+        super().__init__(**kwargs)
+        self.episodes = episodes
+        self.rate_limit = rate_limit
+        self._window: deque[float] = deque()
+
+    def _season(self, number: int) -> dict:
+        return {
+            "season_number": number,
+            "air_date": "2020-01-01",
+            "episodes": [
+                {
+                    "episode_number": i,
+                    "air_date": "2020-01-01",
+                    "vote_average": 8.0,
+                    "name": f"Episode {i}",
+                }
+                for i in range(1, self.episodes + 1)
+            ],
+        }
+
+    def _tv(self) -> dict:
+        return {
+            "id": 1,
+            "name": "Show",
+            "original_name": "Show",
+            "first_air_date": "2020-01-01",
+            "original_language": "ja",
+            "origin_country": ["JP"],
+            "vote_average": 8.0,
+            "overview": "",
+            "seasons": [
+                {
+                    "season_number": 1,
+                    "air_date": "2020-01-01",
+                    "episode_count": self.episodes,
+                    "name": "Season 1",
+                }
+            ],
+        }
+
+    def _throttled(self) -> bool:
+        """滑动窗口统计最近一秒的请求数"""
+
+        now = time.monotonic()
+        with self.lock:
+            while self._window and now - self._window[0] > 1:
+                self._window.popleft()
+            if len(self._window) >= self.rate_limit:
+                self.throttled += 1
+                return True
+            self._window.append(now)
+        return False
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.rate_limit and self._throttled():
+            return httpx.Response(429, headers={"Retry-After": "1"}, json={})
+
+        parts = request.url.path.rstrip("/").split("/")
+        if "search" in parts:
+            return httpx.Response(200, json={"results": [self._tv()]})
+        if "season" in parts:
+            return httpx.Response(200, json=self._season(int(parts[-1])))
+        data = self._tv()
+        for item in (request.url.params.get("append_to_response") or "").split(","):
+            if item.startswith("season/"):
+                data[item] = self._season(int(item.split("/")[1]))
+        return httpx.Response(200, json=data)
+
+
+class FakeServices:
+    """按请求域名将请求分发至模拟 Alist 及 TMDB"""
+
+    alist_url = "http://alist"
+    tmdb_url = "http://tmdb/3"
+
+    def __init__(self, alist: FakeAlist, tmdb: FakeTMDB):
+        self.alist = alist
+        self.tmdb = tmdb
+
+    def _server(self, request: httpx.Request) -> FakeServer:
+        return self.tmdb if request.url.host == "tmdb" else self.alist
+
+    def transports(self) -> tuple[httpx.MockTransport, httpx.MockTransport]:
+        """同步及异步传输层"""
+
+        def handle(request: httpx.Request) -> httpx.Response:
+            return self._server(request).sync_handle(request)
+
+        async def async_handle(request: httpx.Request) -> httpx.Response:
+            return await self._server(request).async_handle(request)
+
+        return httpx.MockTransport(handle), httpx.MockTransport(async_handle)
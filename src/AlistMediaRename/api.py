@@ -1,11 +1,17 @@
 import asyncio
+import threading
 from functools import wraps
 import httpx
-import pyotp
-from typing import Callable
-
-from .models import ApiResponseModel, RenameTask
-from .log import HandleException
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from .cache import TMDBCache
+from .client import HttpClients
+from .retry import RetryPolicy
+from .scheduler import AdaptiveLimiter, RateLimiter
+from .session import TokenStore
+from .models import ApiResponseModel, RenameCallback, RenameLike
+from .log import ApiResponseError, HandleException
+from .metrics import metrics
 from .output import Output
 from .utils import Tools
 
@@ -82,10 +88,7 @@ class ApiResponse:
         封装TMDB api返回信息装饰器.
         """
 
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> ApiResponseModel:
-            rawdata, status_code = func(*args, **kwargs)
-
+        def response(rawdata: dict, status_code: int, args, kwargs) -> ApiResponseModel:
             if status_code == 200:
                 if "results" in rawdata and rawdata["results"] == []:
                     return ApiResponseModel(
@@ -117,7 +120,20 @@ class ApiResponse:
                     kwargs=kwargs,
                 )
 
-        return wrapper
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs) -> ApiResponseModel:
+            rawdata, status_code = await func(*args, **kwargs)
+            return response(rawdata, status_code, args, kwargs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> ApiResponseModel:
+            rawdata, status_code = func(*args, **kwargs)
+            return response(rawdata, status_code, args, kwargs)
+
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper  # type: ignore
+        else:
+            return wrapper
 
 
 class AlistApi:
@@ -132,7 +148,11 @@ class AlistApi:
         user: str = "",
         password: str = "",
         totp_code: str = "",
-        sync_client=None,
+        clients: Optional[HttpClients] = None,
+        token_store: Optional[TokenStore] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        read_retry: Optional[RetryPolicy] = None,
+        write_retry: Optional[RetryPolicy] = None,
     ):
         """
         初始化参数.
@@ -141,38 +161,161 @@ class AlistApi:
         :param user: Alist 登录账号
         :param password: Alist 登录密码
         :param totp_code: Alist 2FA 验证码
+        :param clients: 会话共享的HTTP客户端
+        :param token_store: Token 本地存储, 为空则每次运行重新登录
+        :param limiter: 异步重命名并发控制器
+        :param read_retry: 登录及获取文件列表等幂等请求的重试策略
+        :param write_retry: 重命名等修改文件请求的重试策略
         """
 
         self.url = url.rstrip("/")
         self.user = user
         self.password = password
-        # 使用self.totp_code.now() 生成实时 TOTP 验证码
-        self.totp_code = pyotp.TOTP(totp_code)
+        # 登录时生成实时 TOTP 验证码
+        self.totp_code = totp_code
         self.token = ""
         self.timeout = 10
+        self.token_store = token_store
+        self.limiter = limiter or AdaptiveLimiter()
+        self.read_retry = read_retry or RetryPolicy()
+        self.write_retry = write_retry or RetryPolicy(idempotent=False)
 
-        self._sync_client = sync_client or httpx.Client()
+        self.clients = clients or HttpClients()
+        self._sync_client = self.clients.sync
+        self._token_lock = threading.Lock()
 
-    @HandleException.raise_error
-    @Output.output_alist_login
-    @HandleException.catch_api_exceptions
-    @ApiResponse.alist_api_response
-    def login(self) -> dict:
+    def _load_token(self) -> bool:
+        """读取本地保存的Token, 返回是否已有可用Token"""
+
+        if not self.token and self.token_store:
+            self.token = self.token_store.get(self.url, self.user) or ""
+        return bool(self.token)
+
+    def _drop_token(self, expired_token: str):
+        """清除失效的Token, 多个请求同时失效时只清除一次"""
+
+        if self.token != expired_token:
+            return
+        self.token = ""
+        if self.token_store:
+            self.token_store.remove(self.url, self.user)
+
+    def ensure_login(self):
+        """确保已获取Token, 优先使用本地保存的Token, 否则登录Alist, 多个线程同时等待时只登录一次"""
+
+        if self._load_token():
+            return
+        with self._token_lock:
+            if not self.token:
+                self.login()
+
+    async def _ensure_login_async(self):
+        """在异步请求中确保已获取Token, 在线程中登录, 不阻塞事件循环"""
+
+        if not self._load_token():
+            await asyncio.to_thread(self.ensure_login)
+
+    @staticmethod
+    def _is_unauthorized(r: httpx.Response) -> bool:
+        if r.status_code == 401:
+            return True
+        try:
+            return r.json().get("code") == 401
+        except ValueError:
+            return False
+
+    def _retry(self, write: bool) -> RetryPolicy:
+        """获取请求对应的重试策略"""
+
+        return self.write_retry if write else self.read_retry
+
+    def _post(self, path: str, write: bool = False, **kwargs) -> dict:
         """
-        获取登录Token
+        发送需要认证的POST请求, Token失效时自动重新登录并重试.
+        幂等请求的响应体错误码为 5xx 时(Alist 后端出错)按重试策略重试.
 
-        :param silent: 是否不显示登录状态信息
-        :return: 获取Token请求结果
+        :param path: 接口路径, 如 /api/fs/list
+        :param write: 是否为修改文件的请求, 使用对应的重试策略
+        :return: 请求结果
         """
 
-        # 发送请求
-        post_url = self.url + "/api/auth/login"
-        post_datas = {
+        retry = self._retry(write)
+        self.ensure_login()
+        token = self.token
+        r = retry.send(
+            lambda: self._sync_client.post(
+                url=self.url + path,
+                headers={"Authorization": token},
+                timeout=self.timeout,
+                **kwargs,
+            ),
+            body_code=not write,
+        )
+        if self._is_unauthorized(r):
+            self._drop_token(token)
+            self.ensure_login()
+            r = retry.send(
+                lambda: self._sync_client.post(
+                    url=self.url + path,
+                    headers={"Authorization": self.token},
+                    timeout=self.timeout,
+                    **kwargs,
+                ),
+                body_code=not write,
+            )
+        return r.json()
+
+    async def _post_async(self, path: str, write: bool = False, **kwargs) -> dict:
+        """
+        异步发送需要认证的POST请求, Token失效时自动重新登录并重试.
+        幂等请求的响应体错误码为 5xx 时(Alist 后端出错)按重试策略重试.
+
+        :param path: 接口路径, 如 /api/fs/rename
+        :param write: 是否为修改文件的请求, 使用对应的重试策略
+        :return: 请求结果
+        """
+
+        retry = self._retry(write)
+        await self._ensure_login_async()
+        token = self.token
+        client = self.clients.async_client
+        r = await retry.send_async(
+            lambda: client.post(
+                url=self.url + path,
+                headers={"Authorization": token},
+                timeout=self.timeout,
+                **kwargs,
+            ),
+            body_code=not write,
+        )
+        if self._is_unauthorized(r):
+            self._drop_token(token)
+            await self._ensure_login_async()
+            r = await retry.send_async(
+                lambda: client.post(
+                    url=self.url + path,
+                    headers={"Authorization": self.token},
+                    timeout=self.timeout,
+                    **kwargs,
+                ),
+                body_code=not write,
+            )
+        return r.json()
+
+    def _login_form(self) -> dict:
+        """登录请求参数"""
+
+        # 仅登录时使用, 延迟导入
+        import pyotp
+
+        return {
             "Username": self.user,
             "Password": self.password,
-            "OtpCode": self.totp_code.now(),
+            "OtpCode": pyotp.TOTP(self.totp_code).now(),
         }
-        r = self._sync_client.post(url=post_url, data=post_datas, timeout=self.timeout)
+
+    def _login_result(self, r: httpx.Response) -> dict:
+        """处理登录请求结果, 保存Token"""
 
         if r.status_code != 200:
             return {"message": "Alist 网站连接失败", "code": r.status_code, "data": {}}
@@ -184,11 +327,36 @@ class AlistApi:
 
         if return_data["message"] == "success":
             self.token = return_data["data"]["token"]
+            if self.token_store:
+                self.token_store.set(self.url, self.user, self.token)
             # 隐藏Token信息
             return_data["data"]["token"] = "********"
         # 返回请求结果
         return return_data
 
+    @HandleException.raise_error
+    @Output.output_alist_login
+    @HandleException.catch_api_exceptions
+    @ApiResponse.alist_api_response
+    def login(self) -> dict:
+        """
+        获取登录Token
+
+        :param silent: 是否不显示登录状态信息
+        :return: 获取Token请求结果
+        """
+
+        # 发送请求
+        post_url = self.url + "/api/auth/login"
+        r = self.read_retry.send(
+            lambda: self._sync_client.post(
+                url=post_url, data=self._login_form(), timeout=self.timeout
+            ),
+            body_code=True,
+        )
+
+        return self._login_result(r)
+
     @HandleException.raise_error
     @Output.output_alist_file_list
     @HandleException.catch_api_exceptions
@@ -213,8 +381,6 @@ class AlistApi:
         """
 
         # 发送请求
-        post_url = self.url + "/api/fs/list"
-        post_headers = {"Authorization": self.token}
         post_params = {
             "path": path,
             "password": password,
@@ -222,15 +388,144 @@ class AlistApi:
             "per_page": per_page,
             "page": page,
         }
-        r = self._sync_client.post(
-            url=post_url, headers=post_headers, params=post_params, timeout=self.timeout
-        )
 
         # 获取请求结果
-        return r.json()
+        return self._post("/api/fs/list", params=post_params)
+
+    @HandleException.catch_api_exceptions
+    @ApiResponse.alist_api_response
+    async def file_list_async(
+        self,
+        path: str = "/",
+        password=None,
+        refresh: bool = False,
+        per_page: int = 0,
+        page: int = 1,
+    ) -> dict:
+        """
+        异步获取文件列表, 请求失败时返回失败结果而不停止, 用于遍历文件夹.
+
+        :param path: 路径, 默认为首页/
+        :param password: 路径访问密码, 默认为空
+        :param refresh: 是否强制刷新文件夹, 默认为否
+        :param per_page: 每页显示文件数量, 默认为0, 获取全部
+        :param page: 当前页数, 默认为1;
+        :return: 获取文件列表请求结果
+        """
+
+        post_params = {
+            "path": path,
+            "password": password,
+            "refresh": refresh,
+            "per_page": per_page,
+            "page": page,
+        }
+        return await self._post_async("/api/fs/list", params=post_params)
+
+    async def _file_list_pages(
+        self,
+        path: str,
+        password,
+        refresh: bool,
+        per_page: int,
+        max_concurrency: int,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        分页获取文件列表, 获取第一页后根据文件总数同时请求其余页面, 按页面顺序返回.
+        参数参考 iter_file_list_async
+        """
+
+        def content(result: ApiResponseModel) -> list[dict]:
+            if not result.success:
+                raise ApiResponseError(result.error, result)
+            # 文件信息逐页返回, 不在日志中保留
+            return result.data.pop("content", None) or []
+
+        first = await self.file_list_async(path, password, refresh, per_page, 1)
+        yield content(first)
+
+        total = first.data.get("total") or 0
+        if per_page <= 0 or total <= per_page:
+            return
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def page(number: int) -> ApiResponseModel:
+            async with semaphore:
+                return await self.file_list_async(
+                    path, password, False, per_page, number
+                )
+
+        pages = [
+            asyncio.ensure_future(page(number))
+            for number in range(2, (total - 1) // per_page + 2)
+        ]
+        try:
+            for task in pages:
+                yield content(await task)
+        finally:
+            for task in pages:
+                task.cancel()
+
+    async def iter_file_list_async(
+        self,
+        path: str = "/",
+        password=None,
+        refresh: bool = False,
+        per_page: int = 1000,
+        max_concurrency: int = 4,
+    ) -> AsyncIterator[dict]:
+        """
+        分页获取文件列表, 并逐项返回文件信息.
+
+        :param path: 路径, 默认为首页/
+        :param password: 路径访问密码, 默认为空
+        :param refresh: 是否强制刷新文件夹, 仅在请求第一页时刷新
+        :param per_page: 每页文件数量, 为0时一次获取全部
+        :param max_concurrency: 同时请求的最大页面数
+        :return: 文件信息异步迭代器
+        """
+
+        pages = self._file_list_pages(
+            path, password, refresh, per_page, max_concurrency
+        )
+        try:
+            async for page in pages:
+                for item in page:
+                    yield item
+        finally:
+            await pages.aclose()
+
+    def iter_file_list(
+        self,
+        path: str = "/",
+        password=None,
+        refresh: bool = False,
+        per_page: int = 1000,
+        max_concurrency: int = 4,
+    ) -> Iterator[dict]:
+        """
+        分页获取文件列表, 并逐项返回文件信息, 在会话事件循环中运行异步请求.
+        参数参考 iter_file_list_async
+        """
+
+        pages = self._file_list_pages(
+            path, password, refresh, per_page, max_concurrency
+        )
+        try:
+            while True:
+                try:
+                    yield from self.clients.run(pages.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.clients.run(pages.aclose())
 
     def rename_list(
-        self, rename_list: list[RenameTask], async_mode: bool = True
+        self,
+        rename_list: list[RenameLike],
+        async_mode: bool = True,
+        callback: Optional[RenameCallback] = None,
     ) -> list[ApiResponseModel]:
         """
         批量重命名文件.
@@ -238,63 +533,97 @@ class AlistApi:
         :param rename_list: 重命名文件列表
         :param folder_path: 文件所在文件夹路径
         :param async_mode: 是否使用异步方式重命名文件
+        :param callback: 每项重命名完成后调用, 参数为任务序号及请求结果
         :return: 重命名文件请求结果
         """
 
         if async_mode:
-            return self.rename_list_async(rename_list)
+            return self.rename_list_async(rename_list, callback)
         else:
-            return self.rename_list_sync(rename_list)
+            return self.rename_list_sync(rename_list, callback)
 
     def rename_list_async(
-        self, rename_list: list[RenameTask]
+        self,
+        rename_list: list[RenameLike],
+        callback: Optional[RenameCallback] = None,
     ) -> list[ApiResponseModel]:
-        async def async_run(rename_list: list[RenameTask]) -> list[ApiResponseModel]:
-            async_client = httpx.AsyncClient()
-
-            @HandleException.catch_api_exceptions
-            @ApiResponse.alist_api_response
-            async def rename_async(name: str, path: str) -> dict:
-                """
-                异步重命名文件/文件夹.
-
-                :param name: 重命名名称
-                :param path: 源文件/文件夹路径
-                :return: 重命名文件/文件夹请求结果
-                """
-
-                # 发送请求
-                post_url = self.url + "/api/fs/rename"
-                post_headers = {"Authorization": self.token}
-                post_json = {"name": name, "path": path}
-
-                r = await async_client.post(
-                    url=post_url,
-                    headers=post_headers,
-                    json=post_json,
-                    timeout=self.timeout,
-                )
-                # 获取请求结果
-                return r.json()
+        """
+        异步批量重命名文件.
 
-            async with async_client:
-                tasks = []
-                for file in rename_list:
-                    name = Tools.replace_illegal_char(file.target_name)
-                    path = file.folder_path + file.original_name
-                    tasks.append(asyncio.ensure_future(rename_async(name, path)))  # type: ignore
+        :param rename_list: 重命名文件列表
+        :param callback: 每项重命名完成后调用, 参数为任务序号及请求结果
+        :return: 重命名文件请求结果
+        """
 
-                results: list[ApiResponseModel] = await asyncio.gather(*tasks)
-            return results
+        # 在会话事件循环中运行, 复用异步客户端已建立的连接
+        return self.clients.run(self._rename_batch(rename_list, callback=callback))
 
-        return asyncio.run(async_run(rename_list))
+    async def _rename_batch(
+        self,
+        rename_list: list[RenameLike],
+        concurrent: bool = True,
+        callback: Optional[RenameCallback] = None,
+    ) -> list[ApiResponseModel]:
+        """
+        异步批量重命名文件, 并发请求数量由 self.limiter 控制.
+
+        :param rename_list: 重命名文件列表
+        :param concurrent: 是否并发请求, 否则逐个重命名
+        :param callback: 每项重命名完成后调用, 参数为任务序号及请求结果
+        :return: 重命名文件请求结果
+        """
+
+        @HandleException.catch_api_exceptions
+        @ApiResponse.alist_api_response
+        async def rename_async(name: str, path: str) -> dict:
+            """
+            异步重命名文件/文件夹.
+
+            :param name: 重命名名称
+            :param path: 源文件/文件夹路径
+            :return: 重命名文件/文件夹请求结果
+            """
+
+            # 发送请求
+            post_json = {"name": name, "path": path}
+
+            # 获取请求结果
+            return await self._post_async("/api/fs/rename", write=True, json=post_json)
+
+        async def run(i: int, name: str, path: str) -> ApiResponseModel:
+            if concurrent:
+                result = await self.limiter.run(rename_async, name, path)
+            else:
+                result = await rename_async(name, path)
+            if callback:
+                callback(i, result)  # type: ignore[arg-type]
+            return result  # type: ignore[return-value]
+
+        tasks = []
+        for file in rename_list:
+            name = Tools.replace_illegal_char(file.target_name)
+            path = file.folder_path + file.original_name
+            tasks.append((name, path))
+
+        if not concurrent:
+            return [await run(i, name, path) for i, (name, path) in enumerate(tasks)]
+
+        results: list[ApiResponseModel] = await asyncio.gather(
+            *[run(i, name, path) for i, (name, path) in enumerate(tasks)]
+        )
+        return results
 
-    def rename_list_sync(self, rename_list: list[RenameTask]) -> list[ApiResponseModel]:
+    def rename_list_sync(
+        self,
+        rename_list: list[RenameLike],
+        callback: Optional[RenameCallback] = None,
+    ) -> list[ApiResponseModel]:
         """
         批量重命名文件.
 
         :param rename_list: 重命名文件列表
         :param folder_path: 文件所在文件夹路径
+        :param callback: 每项重命名完成后调用, 参数为任务序号及请求结果
         :return: 重命名文件请求结果
         """
 
@@ -311,21 +640,18 @@ class AlistApi:
             """
 
             # 发送请求
-            post_url = self.url + "/api/fs/rename"
-            post_headers = {"Authorization": self.token}
             post_json = {"name": name, "path": path}
-            r = self._sync_client.post(
-                url=post_url, headers=post_headers, json=post_json, timeout=self.timeout
-            )
 
             # 获取请求结果
-            return r.json()
+            return self._post("/api/fs/rename", write=True, json=post_json)
 
         result = []
-        for file in rename_list:
+        for i, file in enumerate(rename_list):
             name = Tools.replace_illegal_char(file.target_name)
             path = file.folder_path + file.original_name
             result.append(rename(name, path))
+            if callback:
+                callback(i, result[-1])
 
         return result
 
@@ -342,14 +668,10 @@ class AlistApi:
         """
 
         # 发送请求
-        post_url = self.url + "/api/fs/move"
-        post_headers = {"Authorization": self.token}
         post_json = {"src_dir": src_dir, "dst_dir": dst_dir, "names": names}
-        r = self._sync_client.post(
-            url=post_url, headers=post_headers, json=post_json, timeout=self.timeout
-        )
+
         # 获取请求结果
-        return r.json()
+        return self._post("/api/fs/move", write=True, json=post_json)
 
     @Output.output_alist_mkdir
     @HandleException.catch_api_exceptions
@@ -362,14 +684,10 @@ class AlistApi:
         :return: 新建文件夹请求结果
         """
         # 发送请求
-        post_url = self.url + "/api/fs/mkdir"
-        post_headers = {"Authorization": self.token}
         post_json = {"path": path}
-        r = self._sync_client.post(
-            url=post_url, headers=post_headers, json=post_json, timeout=self.timeout
-        )
+
         # 获取请求结果
-        return r.json()
+        return self._post("/api/fs/mkdir", write=True, json=post_json)
 
     @Output.output_alist_remove
     @HandleException.catch_api_exceptions
@@ -384,15 +702,10 @@ class AlistApi:
         """
 
         # 发送请求
-        post_url = self.url + "/api/fs/remove"
-        post_headers = {"Authorization": self.token}
         post_json = {"dir": path, "names": names}
-        r = self._sync_client.post(
-            url=post_url, headers=post_headers, json=post_json, timeout=self.timeout
-        )
 
         # 获取请求结果
-        return r.json()
+        return self._post("/api/fs/remove", write=True, json=post_json)
 
 
 class TMDBApi:
@@ -401,19 +714,196 @@ class TMDBApi:
     TMDB api官方说明文档(https://developers.themoviedb.org/3)
     """
 
-    def __init__(self, api_url: str, api_key: str, sync_client=None):
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        clients: Optional[HttpClients] = None,
+        cache: Optional[TMDBCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+    ):
         """
         初始化参数
 
         :param key: TMDB Api Key(V3)
+        :param clients: 会话共享的HTTP客户端
+        :param cache: TMDB 请求结果缓存, 为空则不使用缓存
+        :param retry: 请求重试策略
+        :param limiter: 请求速率控制器, 为空则不限制
         """
 
         # self.api_url = "https://api.themoviedb.org/3"
         self.api_url = api_url
         self.api_key = api_key
         self.timeout = 10
+        self.cache = cache
+        self.retry = retry or RetryPolicy()
+        self.limiter = limiter or RateLimiter()
+        # append_to_response 单次请求最多附加的季度数量
+        self.append_limit = 20
+
+        self.clients = clients or HttpClients()
+        self._sync_client = self.clients.sync
+
+    def _cache_get(self, path: str, params: dict) -> tuple[str, Optional[dict]]:
+        """读取本地缓存, 返回缓存键及缓存结果"""
+
+        key = TMDBCache.make_key(path, params)
+        if self.cache:
+            data = self.cache.get(key)
+            metrics.inc(
+                "amr_tmdb_cache_lookups", result="miss" if data is None else "hit"
+            )
+            return key, data
+        return key, None
+
+    def _cache_set(self, key: str, data: dict, status_code: int):
+        """仅缓存成功且有结果的请求"""
+
+        if self.cache and status_code == 200 and data.get("results") != []:
+            self.cache.set(key, data)
+
+    def _get(self, path: str, params: dict, cache: bool = True) -> tuple:
+        """
+        发送GET请求, 优先读取本地缓存.
+
+        :param path: 接口路径, 如 /tv/45782
+        :param params: 查询参数, 不包含 api_key
+        :param cache: 是否读取及写入缓存
+        :return: 请求结果与请求状态码
+        """
+
+        key, data = self._cache_get(path, params) if cache else ("", None)
+        if data is not None:
+            return data, 200
+
+        # 发送请求
+        def request() -> httpx.Response:
+            self.limiter.acquire()
+            return self._sync_client.get(
+                f"{self.api_url}{path}",
+                params={"api_key": self.api_key, **params},
+                timeout=self.timeout,
+            )
+
+        r = self.retry.send(request)
+        data = r.json()
+        if cache:
+            self._cache_set(key, data, r.status_code)
+
+        return data, r.status_code
+
+    async def _get_async(self, path: str, params: dict, cache: bool = True) -> tuple:
+        """
+        异步发送GET请求, 优先读取本地缓存.
+
+        :param path: 接口路径, 如 /tv/45782
+        :param params: 查询参数, 不包含 api_key
+        :param cache: 是否读取及写入缓存
+        :return: 请求结果与请求状态码
+        """
+
+        key, data = self._cache_get(path, params) if cache else ("", None)
+        if data is not None:
+            return data, 200
+
+        # 发送请求
+        async def request() -> httpx.Response:
+            await self.limiter.acquire_async()
+            return await self.clients.async_client.get(
+                f"{self.api_url}{path}",
+                params={"api_key": self.api_key, **params},
+                timeout=self.timeout,
+            )
+
+        r = await self.retry.send_async(request)
+        data = r.json()
+        if cache:
+            self._cache_set(key, data, r.status_code)
+
+        return data, r.status_code
+
+    def _seasons_plan(
+        self,
+        tv_id: str,
+        season_numbers: list[int],
+        language: str,
+        refresh: bool = False,
+    ) -> tuple[Optional[dict], dict[int, dict], list[list[int]]]:
+        """
+        读取缓存中的剧集及季度信息, 并将未缓存的季度按 append_to_response 数量限制分组
+
+        :param refresh: 是否忽略已缓存的季度信息, 重新请求并更新缓存
+        :return: 剧集信息, 季度信息, 需要请求的季度分组
+        """
+
+        params = {"language": language}
+        _, tv = self._cache_get(f"/tv/{tv_id}", params)
+        seasons: dict[int, dict] = {}
+        missing: list[int] = []
+        for number in dict.fromkeys(season_numbers):
+            if refresh:
+                missing.append(number)
+                continue
+            _, season = self._cache_get(f"/tv/{tv_id}/season/{number}", params)
+            if season is None:
+                missing.append(number)
+            else:
+                seasons[number] = season
+
+        chunks = [
+            missing[i : i + self.append_limit]
+            for i in range(0, len(missing), self.append_limit)
+        ]
+        # 季度均已缓存但剧集信息未缓存时, 仅请求剧集信息
+        if not chunks and tv is None:
+            chunks = [[]]
+        return tv, seasons, chunks
+
+    @staticmethod
+    def _seasons_params(chunk: list[int], language: str) -> dict:
+        """附加季度信息的查询参数"""
+
+        params = {"language": language}
+        if chunk:
+            params["append_to_response"] = ",".join(f"season/{n}" for n in chunk)
+        return params
+
+    def _seasons_split(
+        self,
+        tv_id: str,
+        language: str,
+        data: dict,
+        chunk: list[int],
+        seasons: dict[int, dict],
+    ) -> dict:
+        """
+        从请求结果中拆分出各季度信息, 剧集及季度信息分别写入缓存
+
+        :return: 剧集信息
+        """
 
-        self._sync_client = sync_client or httpx.Client()
+        params = {"language": language}
+        for number in chunk:
+            season = data.pop(f"season/{number}", None)
+            if season is not None:
+                seasons[number] = season
+                key = TMDBCache.make_key(f"/tv/{tv_id}/season/{number}", params)
+                self._cache_set(key, season, 200)
+        self._cache_set(TMDBCache.make_key(f"/tv/{tv_id}", params), data, 200)
+        return data
+
+    @staticmethod
+    def _seasons_result(
+        tv: Optional[dict], seasons: dict[int, dict], season_numbers: list[int]
+    ) -> dict:
+        """合并剧集信息及季度信息, 季度按请求顺序排列, 不存在的季度不包含在结果中"""
+
+        return {
+            "tv": tv or {},
+            "seasons": {n: seasons[n] for n in season_numbers if n in seasons},
+        }
 
     @HandleException.raise_error
     @Output.output_tmdb_tv_info
@@ -429,11 +919,7 @@ class TMDBApi:
         """
 
         # 发送请求
-        post_url = f"{self.api_url}/tv/{tv_id}"
-        post_params = {"api_key": self.api_key, "language": language}
-        r = self._sync_client.get(post_url, params=post_params, timeout=self.timeout)
-        # 获取请求结果
-        return r.json(), r.status_code
+        return self._get(f"/tv/{tv_id}", {"language": language})
 
     @HandleException.raise_error
     @Output.output_tmdb_search_tv
@@ -449,12 +935,7 @@ class TMDBApi:
         """
 
         # 发送请求
-        post_url = f"{self.api_url}/search/tv"
-        post_params = {"api_key": self.api_key, "query": keyword, "language": language}
-        r = self._sync_client.get(post_url, params=post_params, timeout=self.timeout)
-
-        # 获取请求结果
-        return r.json(), r.status_code
+        return self._get("/search/tv", {"query": keyword, "language": language})
 
     @HandleException.raise_error
     @Output.output_tmdb_tv_season_info
@@ -472,12 +953,41 @@ class TMDBApi:
         """
 
         # 发送请求
-        post_url = f"{self.api_url}/tv/{tv_id}/season/{season_number}"
-        post_params = {"api_key": self.api_key, "language": language}
-        r = self._sync_client.get(post_url, params=post_params, timeout=self.timeout)
+        return self._get(f"/tv/{tv_id}/season/{season_number}", {"language": language})
 
-        # 获取请求结果
-        return r.json(), r.status_code
+    @HandleException.raise_error
+    @HandleException.catch_api_exceptions
+    @ApiResponse.tmdb_api_response
+    def tv_seasons_info(
+        self,
+        tv_id: str,
+        season_numbers: list[int],
+        language: str = "zh-CN",
+        refresh: bool = False,
+    ) -> tuple:
+        """
+        获取剧集信息及多个季度信息.
+        使用 append_to_response 每次请求附加最多 20 个季度, 拆分后分别写入缓存,
+        之后的 tv_info/tv_season_info 请求可直接读取缓存
+
+        :param tv_id: 剧集id
+        :param season_numbers: 季度列表
+        :param language: TMDB搜索语言
+        :param refresh: 是否忽略已缓存的季度信息, 重新请求并更新缓存
+        :return: 请求结果 {"tv": 剧集信息, "seasons": {季度: 季度信息}} 与请求状态码
+        """
+
+        tv, seasons, chunks = self._seasons_plan(
+            tv_id, season_numbers, language, refresh
+        )
+        for chunk in chunks:
+            data, status_code = self._get(
+                f"/tv/{tv_id}", self._seasons_params(chunk, language), cache=False
+            )
+            if status_code != 200:
+                return data, status_code
+            tv = self._seasons_split(tv_id, language, data, chunk, seasons)
+        return self._seasons_result(tv, seasons, season_numbers), 200
 
     @HandleException.raise_error
     @Output.output_tmdb_movie_info
@@ -494,12 +1004,7 @@ class TMDBApi:
         """
 
         # 发送请求
-        post_url = f"{self.api_url}/movie/{movie_id}"
-        post_params = {"api_key": self.api_key, "language": language}
-        r = self._sync_client.get(post_url, params=post_params, timeout=self.timeout)
-
-        # 获取请求结果
-        return r.json(), r.status_code
+        return self._get(f"/movie/{movie_id}", {"language": language})
 
     @HandleException.raise_error
     @Output.output_tmdb_search_movie
@@ -515,9 +1020,293 @@ class TMDBApi:
         """
 
         # 发送请求
-        post_url = f"{self.api_url}/search/movie"
-        post_params = {"api_key": self.api_key, "query": keyword, "language": language}
-        r = self._sync_client.get(post_url, params=post_params, timeout=self.timeout)
+        return self._get("/search/movie", {"query": keyword, "language": language})
+
+
+def _async_only(name: str, alternative: str) -> Callable[..., None]:
+    """
+    异步接口中不可用的同步方法, 调用时直接抛出 TypeError
+
+    :param name: 方法名称
+    :param alternative: 应使用的异步方法
+    """
+
+    def method(self, *args, **kwargs):
+        raise TypeError(
+            f"{type(self).__name__} 不支持同步方法 {name}, 请使用 {alternative}"
+        )
+
+    method.__name__ = name
+    return method
+
+
+class AsyncAlistApi(AlistApi):
+    """
+    Alist异步请求函数, 接口与 AlistApi 相同, 请求函数均为协程, 可在已有事件循环中使用
+    继承的同步方法不可用, 调用时抛出 TypeError
+    """
+
+    ensure_login = _async_only("ensure_login", "await login()")
+    iter_file_list = _async_only("iter_file_list", "iter_file_list_async")
+    rename_list_async = _async_only("rename_list_async", "await rename_list()")
+    rename_list_sync = _async_only(
+        "rename_list_sync", "await rename_list(async_mode=False)"
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._login_lock: Optional[asyncio.Lock] = None
+
+    async def _ensure_login_async(self):
+        """确保已获取Token, 多个请求同时等待时只登录一次"""
+
+        if self._load_token():
+            return
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        async with self._login_lock:
+            if not self.token:
+                await self.login()
+
+    @HandleException.raise_error
+    @Output.output_alist_login
+    @HandleException.catch_api_exceptions
+    @ApiResponse.alist_api_response
+    async def login(self) -> dict:
+        """
+        获取登录Token
+
+        :return: 获取Token请求结果
+        """
+
+        # 发送请求
+        post_url = self.url + "/api/auth/login"
+        r = await self.read_retry.send_async(
+            lambda: self.clients.async_client.post(
+                url=post_url, data=self._login_form(), timeout=self.timeout
+            ),
+            body_code=True,
+        )
+
+        return self._login_result(r)
+
+    @HandleException.raise_error
+    @Output.output_alist_file_list
+    @HandleException.catch_api_exceptions
+    @ApiResponse.alist_api_response
+    async def file_list(
+        self,
+        path: str = "/",
+        password=None,
+        refresh: bool = True,
+        per_page: int = 0,
+        page: int = 1,
+    ) -> dict:
+        """
+        获取文件列表.
+
+        :param path: 路径, 默认为首页/
+        :param password: 路径访问密码, 默认为空
+        :param refresh: 是否强制刷新文件夹, 默认为否
+        :param per_page: 每页显示文件数量, 默认为0, 获取全部
+        :param page: 当前页数, 默认为1;
+        :return: 获取文件列表请求结果
+        """
+
+        # 发送请求
+        post_params = {
+            "path": path,
+            "password": password,
+            "refresh": refresh,
+            "per_page": per_page,
+            "page": page,
+        }
 
         # 获取请求结果
-        return r.json(), r.status_code
+        return await self._post_async("/api/fs/list", params=post_params)
+
+    async def rename_list(  # type: ignore[override]
+        self,
+        rename_list: list[RenameLike],
+        async_mode: bool = True,
+        callback: Optional[RenameCallback] = None,
+    ) -> list[ApiResponseModel]:
+        """
+        批量重命名文件.
+
+        :param rename_list: 重命名文件列表
+        :param async_mode: 是否并发重命名文件
+        :param callback: 每项重命名完成后调用, 参数为任务序号及请求结果
+        :return: 重命名文件请求结果
+        """
+
+        return await self._rename_batch(rename_list, async_mode, callback)
+
+    @Output.output_alist_move
+    @HandleException.catch_api_exceptions
+    @ApiResponse.alist_api_response
+    async def move(self, names: list, src_dir: str, dst_dir: str) -> dict:
+        """
+        移动文件/文件夹.
+        :param names: 需要移动的文件名称列表
+        :param src_dir: 需要移动的源文件所在文件夹
+        :param dst_dir: 需要移动的目标文件夹
+        :return: 移动文件/文件夹请求结果
+        """
+
+        post_json = {"src_dir": src_dir, "dst_dir": dst_dir, "names": names}
+        return await self._post_async("/api/fs/move", write=True, json=post_json)
+
+    @Output.output_alist_mkdir
+    @HandleException.catch_api_exceptions
+    @ApiResponse.alist_api_response
+    async def mkdir(self, path: str) -> dict:
+        """
+        新建文件夹.
+
+        :param path: 新建文件夹路径
+        :return: 新建文件夹请求结果
+        """
+
+        return await self._post_async("/api/fs/mkdir", write=True, json={"path": path})
+
+    @Output.output_alist_remove
+    @HandleException.catch_api_exceptions
+    @ApiResponse.alist_api_response
+    async def remove(self, path: str, names: list) -> dict:
+        """
+        删除文件/文件夹.
+
+        :param path: 待删除文件/文件夹所在目录
+        :param names: 待删除文件/文件夹列表
+        :return: 删除文件/文件夹请求结果
+        """
+
+        post_json = {"dir": path, "names": names}
+        return await self._post_async("/api/fs/remove", write=True, json=post_json)
+
+
+class AsyncTMDBApi(TMDBApi):
+    """
+    TMDB异步请求函数, 接口与 TMDBApi 相同, 请求函数均为协程, 可在已有事件循环中使用
+    """
+
+    @HandleException.raise_error
+    @Output.output_tmdb_tv_info
+    @HandleException.catch_api_exceptions
+    @ApiResponse.tmdb_api_response
+    async def tv_info(self, tv_id: str, language: str = "zh-CN") -> tuple:
+        """
+        根据提供的id获取剧集信息.
+
+        :param tv_id: 剧集id
+        :param language: TMDB搜索语言
+        :return: 请求状态码与剧集信息请求结果
+        """
+
+        return await self._get_async(f"/tv/{tv_id}", {"language": language})
+
+    @HandleException.raise_error
+    @Output.output_tmdb_search_tv
+    @HandleException.catch_api_exceptions
+    @ApiResponse.tmdb_api_response
+    async def search_tv(self, keyword: str, language: str = "zh-CN") -> tuple:
+        """
+        根据关键字匹配剧集, 获取相关信息.
+
+        :param keyword: 剧集搜索关键词
+        :param language: TMDB搜索语言
+        :return: 匹配剧集信息请求结果
+        """
+
+        return await self._get_async(
+            "/search/tv", {"query": keyword, "language": language}
+        )
+
+    @HandleException.raise_error
+    @Output.output_tmdb_tv_season_info
+    @HandleException.catch_api_exceptions
+    @ApiResponse.tmdb_api_response
+    async def tv_season_info(
+        self, tv_id: str, season_number: int, language: str = "zh-CN"
+    ) -> tuple:
+        """
+        获取指定季度剧集信息.
+        :param tv_id: 剧集id
+        :param season_number: 指定第几季
+        :param language: TMDB搜索语言
+        :return: 返回获取指定季度剧集信息结果
+        """
+
+        return await self._get_async(
+            f"/tv/{tv_id}/season/{season_number}", {"language": language}
+        )
+
+    @HandleException.raise_error
+    @HandleException.catch_api_exceptions
+    @ApiResponse.tmdb_api_response
+    async def tv_seasons_info(
+        self,
+        tv_id: str,
+        season_numbers: list[int],
+        language: str = "zh-CN",
+        refresh: bool = False,
+    ) -> tuple:
+        """
+        获取剧集信息及多个季度信息, 各分组请求同时进行.
+
+        :param tv_id: 剧集id
+        :param season_numbers: 季度列表
+        :param language: TMDB搜索语言
+        :param refresh: 是否忽略已缓存的季度信息, 重新请求并更新缓存
+        :return: 请求结果 {"tv": 剧集信息, "seasons": {季度: 季度信息}} 与请求状态码
+        """
+
+        tv, seasons, chunks = self._seasons_plan(
+            tv_id, season_numbers, language, refresh
+        )
+        responses = await asyncio.gather(
+            *[
+                self._get_async(
+                    f"/tv/{tv_id}", self._seasons_params(chunk, language), cache=False
+                )
+                for chunk in chunks
+            ]
+        )
+        for chunk, (data, status_code) in zip(chunks, responses):
+            if status_code != 200:
+                return data, status_code
+            tv = self._seasons_split(tv_id, language, data, chunk, seasons)
+        return self._seasons_result(tv, seasons, season_numbers), 200
+
+    @HandleException.raise_error
+    @Output.output_tmdb_movie_info
+    @HandleException.catch_api_exceptions
+    @ApiResponse.tmdb_api_response
+    async def movie_info(self, movie_id: str, language: str = "zh-CN") -> tuple:
+        """
+        根据提供的id获取电影信息.
+
+        :param movie_id: 电影id
+        :param language: TMDB搜索语言
+        :return: 请求状态码与电影信息请求结果
+        """
+
+        return await self._get_async(f"/movie/{movie_id}", {"language": language})
+
+    @HandleException.raise_error
+    @Output.output_tmdb_search_movie
+    @HandleException.catch_api_exceptions
+    @ApiResponse.tmdb_api_response
+    async def search_movie(self, keyword: str, language: str = "zh-CN") -> tuple:
+        """
+        根据关键字匹配电影, 获取相关信息.
+
+        :param keyword: 剧集搜索关键词
+        :param language: TMDB搜索语言
+        :return: 匹配剧集信息请求结果
+        """
+
+        return await self._get_async(
+            "/search/movie", {"query": keyword, "language": language}
+        )
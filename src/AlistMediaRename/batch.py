@@ -0,0 +1,74 @@
+import csv
+import json
+import os
+
+from pydantic import ValidationError
+from ruamel.yaml import YAML
+
+from .models import BatchEntry
+
+
+class Manifest:
+    """
+    批量重命名任务清单
+    支持 yaml/csv/jsonl 格式, 每项任务包含 keyword/tmdb_id, dir, type, season, number 等字段
+    """
+
+    @staticmethod
+    def load(filepath: str) -> list[BatchEntry]:
+        """
+        读取任务清单, 根据文件后缀判断格式.
+
+        :param filepath: 任务清单文件路径
+        :return: 重命名任务列表
+        """
+
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext not in (".yaml", ".yml", ".csv", ".jsonl", ".ndjson"):
+            raise ValueError(f"不支持的任务清单格式: {ext}, 请使用 yaml/csv/jsonl")
+
+        with open(filepath, "r", encoding="utf-8", newline="") as f:
+            if ext == ".csv":
+                rows = list(csv.DictReader(f))
+            elif ext in (".jsonl", ".ndjson"):
+                rows = [json.loads(line) for line in f if line.strip()]
+            else:
+                rows = Manifest._load_yaml(f)
+
+        return [Manifest.parse(row, i) for i, row in enumerate(rows, 1)]
+
+    @staticmethod
+    def _load_yaml(f) -> list:
+        """读取 yaml 任务清单, 顶层为任务列表, 或包含 entries 任务列表"""
+
+        data = YAML(typ="safe").load(f) or []
+        if isinstance(data, dict):
+            data = data.get("entries") or []
+        if not isinstance(data, list):
+            raise ValueError("任务清单格式错误: 应为任务列表")
+        return data
+
+    @staticmethod
+    def parse(row: dict, line: int = 0) -> BatchEntry:
+        """
+        解析单项任务, 忽略空字段.
+
+        :param row: 任务字段
+        :param line: 任务序号, 用于错误提示
+        :return: 重命名任务
+        """
+
+        if not isinstance(row, dict):
+            raise ValueError(f"任务清单第 {line} 项格式错误: {row}")
+        fields = {
+            k.strip(): v.strip() if isinstance(v, str) else v
+            for k, v in row.items()
+            if k and v is not None and v != ""
+        }
+        try:
+            entry = BatchEntry(**fields)
+        except ValidationError as e:
+            raise ValueError(f"任务清单第 {line} 项格式错误: {e}") from e
+        if not entry.keyword and not entry.tmdb_id:
+            raise ValueError(f"任务清单第 {line} 项缺少 keyword 或 tmdb_id")
+        return entry
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class TMDBCache:
+    """
+    TMDB 请求结果本地缓存
+    基于 SQLite 持久化保存, 每条记录带有过期时间, 超出容量时按最近访问时间(LRU)淘汰
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        ttl: int = 86400,
+        max_size: int = 2000,
+        refresh: bool = False,
+    ):
+        """
+        初始化参数
+
+        :param filepath: 缓存数据库文件路径
+        :param ttl: 缓存有效时间(秒)
+        :param max_size: 最大缓存条数
+        :param refresh: 是否忽略已有缓存, 强制重新请求并更新缓存
+        """
+
+        self.filepath = filepath
+        self.ttl = ttl
+        self.max_size = max_size
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tmdb_cache ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                "expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tmdb_cache_accessed "
+                "ON tmdb_cache (accessed)"
+            )
+
+    @staticmethod
+    def make_key(path: str, params: dict) -> str:
+        """
+        生成缓存键, 由接口路径(包含id/季度)及查询参数(关键词/语言)组成
+
+        :param path: 接口路径, 如 /tv/45782/season/1
+        :param params: 查询参数, 不包含 api_key
+        :return: 缓存键
+        """
+
+        query = "&".join(
+            f"{k}={v}" for k, v in sorted(params.items()) if k != "api_key"
+        )
+        return f"{path}?{query}"
+
+    def get(self, key: str) -> Optional[dict]:
+        """读取缓存, 未命中或已过期返回 None"""
+
+        if self.refresh:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires FROM tmdb_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE tmdb_cache SET accessed = ? WHERE key = ?", (now, key)
+                )
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, data: dict):
+        """写入缓存, 超出容量时淘汰最久未访问的记录"""
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tmdb_cache (key, data, expires, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(data, ensure_ascii=False), now + self.ttl, now),
+            )
+            self._conn.execute("DELETE FROM tmdb_cache WHERE expires < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM tmdb_cache WHERE key IN ("
+                "SELECT key FROM tmdb_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
+
+    def clear(self):
+        """清空缓存"""
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tmdb_cache")
+
+    def close(self):
+        """关闭缓存数据库"""
+
+        with self._lock:
+            self._conn.close()
+
+
+class FolderStateStore:
+    """
+    Alist 文件夹状态记录
+    保存上次强制刷新文件夹的时间及文件列表指纹, 用于判断是否需要再次强制刷新
+    """
+
+    def __init__(self, filepath: str):
+        """
+        初始化参数
+
+        :param filepath: 数据库文件路径
+        """
+
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS folder_state ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                "checked REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def fingerprint(items: list[dict]) -> str:
+        """
+        生成文件列表指纹, 由文件数量、最近修改时间及排序后的文件名与大小的摘要组成,
+        文件数量不变时的新增、删除或重命名也会改变指纹
+
+        :param items: Alist 文件列表
+        """
+
+        modified = max((item.get("modified") or "" for item in items), default="")
+        digest = hashlib.sha1(
+            json.dumps(
+                sorted((item["name"], item.get("size") or 0) for item in items),
+                ensure_ascii=False,
+            ).encode("utf-8")
+        ).hexdigest()
+        return f"{len(items)}|{modified}|{digest}"
+
+    def get(self, url: str, path: str) -> Optional[tuple[str, float]]:
+        """读取文件夹状态, 返回文件列表指纹及上次强制刷新时间"""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, checked FROM folder_state WHERE key = ?",
+                (f"{url}|{path}",),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, url: str, path: str, fingerprint: str):
+        """记录强制刷新后的文件夹状态"""
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO folder_state (key, fingerprint, checked) "
+                "VALUES (?, ?, ?)",
+                (f"{url}|{path}", fingerprint, time.time()),
+            )
+
+    def close(self):
+        """关闭数据库"""
+
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,124 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from natsort import natsort_keygen
+
+
+class MediaClassifier:
+    """
+    媒体文件分类
+    预先编译各类别的匹配规则, 单次遍历文件列表完成分类, 并以自然排序返回.
+    各类别互斥, 文件按类别顺序匹配, 归入第一个匹配的类别.
+    形如 (?i).*\\.(mp4|mkv)$ 的后缀规则直接按文件后缀查找类别, 无需正则匹配
+    """
+
+    # 后缀规则: 可选的忽略大小写标记 + 任意文件名 + 后缀列表
+    _extension_rule = re.compile(r"^(\(\?i\))?\.\*\\\.\(([\w|]+)\)\$$")
+
+    def __init__(self, patterns: dict[str, str], cache_size: int = 100_000):
+        """
+        初始化参数
+
+        :param patterns: 类别名称及对应的匹配规则(正则表达式), 按顺序匹配, 同一文件只属于第一个匹配的类别
+        :param cache_size: 缓存自然排序键的最大文件数
+        """
+
+        self.categories = list(patterns)
+        # 类别 -> 匹配顺序
+        self._rank = {category: i for i, category in enumerate(self.categories)}
+        # 后缀 -> 第一个匹配的类别, 区分是否忽略大小写
+        self._extensions: dict[str, str] = {}
+        self._extensions_ignorecase: dict[str, str] = {}
+        # 其他规则仍使用正则匹配
+        self._regexes: list[tuple[str, re.Pattern]] = []
+        # 所有规则, 文件名无法使用后缀查找时使用
+        self._all_regexes = [
+            (category, re.compile(pattern)) for category, pattern in patterns.items()
+        ]
+
+        for category, pattern in patterns.items():
+            rule = self._parse_extensions(pattern)
+            if rule is None:
+                self._regexes.append((category, re.compile(pattern)))
+                continue
+            extensions, ignorecase = rule
+            table = self._extensions_ignorecase if ignorecase else self._extensions
+            for extension in extensions:
+                table.setdefault(extension, category)
+
+        self.sort_key = lru_cache(maxsize=cache_size)(natsort_keygen())
+
+    @classmethod
+    def _parse_extensions(cls, pattern: str) -> Optional[tuple[set[str], bool]]:
+        """
+        解析后缀规则
+
+        :param pattern: 匹配规则
+        :return: 后缀集合及是否忽略大小写, 非后缀规则返回 None
+        """
+
+        match = cls._extension_rule.match(pattern)
+        if match is None:
+            return None
+        ignorecase = match.group(1) is not None
+        extensions = match.group(2).split("|")
+        if not all(extension.isascii() for extension in extensions):
+            return None
+        if ignorecase:
+            extensions = [extension.lower() for extension in extensions]
+        return set(extensions), ignorecase
+
+    def match(self, name: str) -> Optional[str]:
+        """
+        获取文件所属类别
+
+        :param name: 文件名
+        :return: 第一个匹配的类别, 均不匹配时返回 None
+        """
+
+        _, dot, extension = name.rpartition(".")
+        # 包含换行符或非 ASCII 后缀时与正则匹配结果可能不同, 使用全部正则匹配
+        if "\n" in name or not extension.isascii():
+            for category, regex in self._all_regexes:
+                if regex.match(name):
+                    return category
+            return None
+
+        candidates = []
+        if dot:
+            for table, key in (
+                (self._extensions, extension),
+                (self._extensions_ignorecase, extension.lower()),
+            ):
+                category = table.get(key)
+                if category is not None:
+                    candidates.append(category)
+        best = min(candidates, key=self._rank.__getitem__, default=None)
+        # 仅需检查顺序在后缀规则匹配结果之前的正则规则
+        for category, regex in self._regexes:
+            if best is not None and self._rank[category] > self._rank[best]:
+                break
+            if regex.match(name):
+                return category
+        return best
+
+    def classify(self, file_list: Iterable[str]) -> dict[str, list[str]]:
+        """
+        单次遍历文件名完成分类
+
+        :param file_list: 文件名, 可为逐项返回的迭代器
+        :return: 各类别文件名列表(自然排序), 包含所有类别
+        """
+
+        buckets: dict[str, list[str]] = {category: [] for category in self.categories}
+        for name in file_list:
+            category = self.match(name)
+            if category is not None:
+                buckets[category].append(name)
+        return {category: self.sort(names) for category, names in buckets.items()}
+
+    def sort(self, names: list[str]) -> list[str]:
+        """使用缓存的自然排序键排序"""
+
+        return sorted(names, key=self.sort_key)
@@ -1,27 +1,103 @@
-from typing import Union
-from importlib.metadata import version
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Optional, Union
 
-from AlistMediaRename import Amr, logger
 import click
-from rich.traceback import install
 
-install(show_locals=False, suppress=[click])
+# rich, pydantic, httpx 等依赖导入较慢, 在执行命令时才导入, 以加快 amr --help 等命令的启动速度
+if TYPE_CHECKING:
+    from AlistMediaRename import Config
 
 
-@click.command(
+class DefaultGroup(click.Group):
+    """未指定子命令时, 执行默认的重命名命令"""
+
+    default_command = "rename"
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if (
+            args
+            and args[0] not in self.commands
+            and args[0] not in ctx.help_option_names + ["-v", "--version"]
+        ):
+            args.insert(0, self.default_command)
+        return super().parse_args(ctx, args)
+
+
+def config_options(func):
+    """配置文件及缓存相关的公共参数"""
+
+    func = click.option("--verbose", is_flag=True, help="显示详细信息(可选)")(func)
+    func = click.option(
+        "--refresh-cache", is_flag=True, help="忽略并刷新TMDB缓存(可选)"
+    )(func)
+    func = click.option("--no-cache", is_flag=True, help="不使用TMDB缓存(可选)")(func)
+    func = click.option(
+        "-c",
+        "--config",
+        type=str,
+        default="./config.yaml",
+        show_default=True,
+        help="指定配置文件路径, 默认为程序所在路径(可选)",
+    )(func)
+    return func
+
+
+def load_config(config: str, no_cache: bool, verbose: bool) -> "Config":
+    """
+    加载配置文件
+
+    :param config: 配置文件路径
+    :param no_cache: 不使用TMDB缓存
+    :param verbose: 显示详细信息
+    """
+
+    from AlistMediaRename import Config, logger
+
+    # 设置日志级别
+    if verbose:
+        logger.verbose_mode = True
+
+    settings = Config(config)
+    if no_cache:
+        settings.tmdb.cache_enable = False
+    return settings
+
+
+@click.group(
+    cls=DefaultGroup,
     options_metavar="[选项]",
+    subcommand_metavar="[命令] [参数]...",
     epilog="主页: https://github.com/jkoor/Alist-Media-Rename",
     context_settings=dict(help_option_names=["-h", "--help"]),
 )
-@click.argument("keyword", type=str, required=True, metavar="关键词")
-@click.option(
-    "-c",
-    "--config",
-    type=str,
-    default="./config.yaml",
-    show_default=True,
-    help="指定配置文件路径, 默认为程序所在路径(可选)",
+@click.version_option(
+    None,
+    "-v",
+    "--version",
+    package_name="AlistMediaRename",
+    help="显示版本信息",
 )
+def start():
+    """
+    利用TMDB api获取剧集标题, 并对Alist对应剧集文件进行重命名, 便于播放器识别剧集信息\n
+    用例: amr 刀剑神域 -d /阿里云盘/刀剑神域/\n
+    批量: amr batch manifest.yaml\n
+    监视: amr watch manifest.yaml\n
+    计划: amr plan manifest.yaml -o plan.jsonl, amr apply plan.jsonl\n
+    继续: amr resume, 撤销: amr undo 任务名称
+    """
+
+    from rich.traceback import install
+
+    install(show_locals=False, suppress=[click])
+
+
+@start.command(
+    options_metavar="[选项]",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("keyword", type=str, required=True, metavar="关键词")
+@config_options
 @click.option("-d", "--dir", type=str, required=True, help="Alist剧集文件所在文件夹")
 @click.option("-i", "--id", is_flag=True, help="通过id搜索TMDB剧集信息(可选)")
 @click.option("-m", "--movie", is_flag=True, help="搜索电影而不是剧集")
@@ -35,59 +111,603 @@ install(show_locals=False, suppress=[click])
 )
 @click.option("-p", "--password", type=str, help="文件访问密码(可选)")
 @click.option(
-    "--folder/--no-folder", default=None, help="是否对父文件夹进行重命名(可选)"
+    "--profile",
+    is_flag=True,
+    help="记录各阶段耗时、CPU时间及内存峰值, 完成后输出性能分析结果(可选)",
 )
-@click.option("--verbose", is_flag=True, help="显示详细信息(可选)")
-@click.version_option(
-    version("AlistMediaRename"), "-v", "--version", help="显示版本信息"
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False),
+    help="将性能分析结果以JSON格式保存至指定文件, 同时启用--profile(可选)",
 )
-def start(
+@click.option(
+    "--cprofile",
+    is_flag=True,
+    help="性能分析时使用cProfile记录函数调用耗时, 同时启用--profile(可选)",
+)
+@click.option(
+    "-s",
+    "--show",
+    is_flag=True,
+    help="重命名整部剧集, 文件夹中的季度文件夹自动对应TMDB季度(可选)",
+)
+@click.option(
+    "--folder/--no-folder", default=None, help="是否对父文件夹进行重命名(可选)"
+)
+def rename(
     config: str,
+    cprofile: bool,
     dir: str,
     folder: Union[bool, None],
     id: bool,
     keyword: str,
     movie: bool,
+    no_cache: bool,
     number: str,
     password: str,
+    profile: bool,
+    profile_output: Optional[str],
+    refresh_cache: bool,
+    show: bool,
     verbose: bool,
 ):
     """
-    利用TMDB api获取剧集标题, 并对Alist对应剧集文件进行重命名, 便于播放器识别剧集信息\n
-    用例: amr 刀剑神域 -d /阿里云盘/刀剑神域/
+    重命名指定文件夹中的剧集/电影文件(默认命令)\n
+    用例: amr 刀剑神域 -d /阿里云盘/刀剑神域/\n
+    整部剧集: amr 刀剑神域 -d /阿里云盘/刀剑神域/ -s
 
     \f
     :param config: 配置文件路径
+    :param cprofile: 性能分析时使用cProfile记录函数调用耗时
     :param dir: Alist剧集文件所在文件夹
     :param folder: 是否对父文件夹进行重命名
     :param id: 通过id搜索TMDB剧集信息
     :param keyword: 关键词
     :param movie: 搜索电影而不是剧集
+    :param no_cache: 不使用TMDB缓存
     :param number: 指定从第几集开始重命名
     :param password: 文件访问密码
+    :param profile: 输出性能分析结果
+    :param profile_output: 性能分析结果保存路径
+    :param refresh_cache: 忽略并刷新TMDB缓存
+    :param show: 重命名整部剧集
     """
 
-    # 设置日志级别
-    if verbose:
-        logger.verbose_mode = True
+    import asyncio
+
+    from AlistMediaRename import Amr, AsyncAmr, Profiler
+    from AlistMediaRename.output import Message, Output
+
+    if show and movie:
+        Message.error("整部剧集模式不支持电影")
+        raise SystemExit(1)
+
+    # 性能分析
+    profiler = None
+    if profile or profile_output or cprofile:
+        profiler = Profiler(cpu_profile=cprofile)
+    try:
+        with profiler or nullcontext():
+            # 整部剧集: 各季度同时获取及匹配
+            if show:
+                settings = load_config(config, no_cache, verbose)
+                if folder is not None:
+                    settings.settings.amr.media_folder_rename = folder
+
+                async def main():
+                    async with AsyncAmr(
+                        settings, refresh_cache=refresh_cache, profiler=profiler
+                    ) as amr:
+                        if id:
+                            await amr.show_rename_id(keyword, dir, password)
+                        else:
+                            await amr.show_rename_keyword(keyword, dir, password)
+
+                asyncio.run(main())
+                return
+
+            # 初始化
+            amr = Amr(
+                load_config(config, no_cache, verbose),
+                refresh_cache=refresh_cache,
+                profiler=profiler,
+            )
+            if folder is not None:
+                amr.config.settings.amr.media_folder_rename = folder
+
+            with amr:
+                # TMDB搜索电影
+                if movie:
+                    if id:
+                        amr.movie_rename_id(keyword, dir, password)
+                    else:
+                        amr.movie_rename_keyword(keyword, dir, password)
+                # TMDB搜索剧集
+                else:
+                    if id:
+                        amr.tv_rename_id(keyword, dir, password, number)
+                    else:
+                        amr.tv_rename_keyword(keyword, dir, password, number)
+    finally:
+        if profiler:
+            Output.print_profile(profiler.report())
+            if profile_output:
+                profiler.dump(profile_output)
+                Message.info(f"性能分析结果已保存: {profile_output}")
+
+
+@start.command(
+    options_metavar="[选项]",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("manifest", type=click.Path(exists=True), metavar="任务清单")
+@config_options
+@click.option("-j", "--jobs", type=int, help="同时处理的任务数, 默认使用配置参数(可选)")
+@click.option(
+    "--folder/--no-folder", default=None, help="是否对父文件夹进行重命名(可选)"
+)
+def batch(
+    config: str,
+    folder: Union[bool, None],
+    jobs: Optional[int],
+    manifest: str,
+    no_cache: bool,
+    refresh_cache: bool,
+    verbose: bool,
+):
+    """
+    根据任务清单(yaml/csv/jsonl)批量重命名, 无需选择及确认\n
+    任务字段: keyword/tmdb_id, dir, type(tv/movie), season, number, password, select\n
+    用例: amr batch manifest.yaml
+
+    \f
+    :param config: 配置文件路径
+    :param folder: 是否对父文件夹进行重命名
+    :param jobs: 同时处理的任务数
+    :param manifest: 任务清单文件路径
+    :param no_cache: 不使用TMDB缓存
+    :param refresh_cache: 忽略并刷新TMDB缓存
+    """
+
+    import asyncio
+
+    from AlistMediaRename import AsyncAmr
+    from AlistMediaRename.batch import Manifest
+    from AlistMediaRename.metrics import metrics
+    from AlistMediaRename.output import Message, Output, console
+
+    try:
+        entries = Manifest.load(manifest)
+    except ValueError as e:
+        Message.error(str(e))
+        raise SystemExit(1)
+
+    settings = load_config(config, no_cache, verbose)
+    if folder is not None:
+        settings.settings.amr.media_folder_rename = folder
+
+    async def main():
+        async with AsyncAmr(settings, refresh_cache=refresh_cache) as amr:
+            results = await amr.batch(entries, jobs)
+            return results, amr.tmdb.limiter.stats(), amr.journal_job
+
+    # 运行期间提供运行指标接口
+    server = None
+    if settings.amr.metrics_port:
+        server = metrics.serve(settings.amr.metrics_port)
+        Message.info(f"运行指标: http://127.0.0.1:{server.server_address[1]}/metrics")
+
+    # 并发任务的输出会相互穿插, 仅在显示详细信息时输出
+    Message.info(f"正在处理 {len(entries)} 项任务...")
+    console.quiet = not verbose
+    try:
+        results, rate_stats, job = asyncio.run(main())
+    finally:
+        console.quiet = False
+        if server:
+            server.shutdown()
+
+    Output.print_batch_summary(results)
+    if rate_stats["wait_count"] > 0:
+        Message.info(
+            f"TMDB 请求限速: 等待 {rate_stats['wait_count']} 次, 共 {rate_stats['wait_time']:.1f} 秒"
+        )
+    if job:
+        Message.info(f"重命名记录: {job}")
+    if not all(result.success for result in results):
+        raise SystemExit(1)
+
+
+@start.command(
+    options_metavar="[选项]",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("manifest", type=click.Path(exists=True), metavar="任务清单")
+@config_options
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    default="./plan.jsonl",
+    show_default=True,
+    help="重命名计划保存路径(可选)",
+)
+@click.option("-j", "--jobs", type=int, help="同时处理的任务数, 默认使用配置参数(可选)")
+@click.option(
+    "--folder/--no-folder", default=None, help="是否对父文件夹进行重命名(可选)"
+)
+def plan(
+    config: str,
+    folder: Union[bool, None],
+    jobs: Optional[int],
+    manifest: str,
+    no_cache: bool,
+    output: str,
+    refresh_cache: bool,
+    verbose: bool,
+):
+    """
+    根据任务清单生成重命名计划并保存, 不进行重命名, 之后使用 apply 命令执行\n
+    任务清单格式与 batch 命令相同\n
+    用例: amr plan manifest.yaml -o plan.jsonl
+
+    \f
+    :param config: 配置文件路径
+    :param folder: 是否对父文件夹进行重命名
+    :param jobs: 同时处理的任务数
+    :param manifest: 任务清单文件路径
+    :param no_cache: 不使用TMDB缓存
+    :param output: 重命名计划保存路径
+    :param refresh_cache: 忽略并刷新TMDB缓存
+    """
+
+    import asyncio
+
+    from AlistMediaRename import AsyncAmr
+    from AlistMediaRename.batch import Manifest
+    from AlistMediaRename.output import Message, Output, console
+    from AlistMediaRename.plan import PlanFile
+
+    try:
+        entries = Manifest.load(manifest)
+    except ValueError as e:
+        Message.error(str(e))
+        raise SystemExit(1)
+
+    settings = load_config(config, no_cache, verbose)
+    if folder is not None:
+        settings.settings.amr.media_folder_rename = folder
+
+    async def main():
+        async with AsyncAmr(settings, refresh_cache=refresh_cache) as amr:
+            return await amr.plan(entries, jobs)
+
+    Message.info(f"正在生成 {len(entries)} 项任务的重命名计划...")
+    console.quiet = not verbose
+    try:
+        plans = asyncio.run(main())
+    finally:
+        console.quiet = False
+
+    Output.print_plan_summary(plans)
+    PlanFile.dump(output, plans)
+    Message.info(f"重命名计划已保存: {output}")
+    if any(plan.error for plan in plans):
+        raise SystemExit(1)
+
+
+@start.command(
+    options_metavar="[选项]",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("plan_file", type=click.Path(exists=True), metavar="重命名计划")
+@config_options
+@click.option("-j", "--jobs", type=int, help="同时处理的计划数, 默认使用配置参数(可选)")
+@click.option("-p", "--password", type=str, help="文件访问密码(可选)")
+def apply(
+    config: str,
+    jobs: Optional[int],
+    no_cache: bool,
+    password: Optional[str],
+    plan_file: str,
+    refresh_cache: bool,
+    verbose: bool,
+):
+    """
+    执行 plan 命令保存的重命名计划, 无需查询TMDB及确认\n
+    文件夹的文件列表与生成计划时不一致时跳过该文件夹\n
+    用例: amr apply plan.jsonl
+
+    \f
+    :param config: 配置文件路径
+    :param jobs: 同时处理的计划数
+    :param no_cache: 不使用TMDB缓存
+    :param password: 文件访问密码, 计划文件中不保存密码
+    :param plan_file: 重命名计划文件路径
+    :param refresh_cache: 忽略并刷新TMDB缓存
+    """
+
+    import asyncio
+
+    from AlistMediaRename import AsyncAmr
+    from AlistMediaRename.metrics import metrics
+    from AlistMediaRename.output import Message, Output, console
+    from AlistMediaRename.plan import PlanFile
+
+    try:
+        plans = PlanFile.load(plan_file)
+    except ValueError as e:
+        Message.error(str(e))
+        raise SystemExit(1)
+
+    settings = load_config(config, no_cache, verbose)
+
+    async def main():
+        async with AsyncAmr(settings, refresh_cache=refresh_cache) as amr:
+            return await amr.apply(plans, jobs, password), amr.journal_job
+
+    # 运行期间提供运行指标接口
+    server = None
+    if settings.amr.metrics_port:
+        server = metrics.serve(settings.amr.metrics_port)
+        Message.info(f"运行指标: http://127.0.0.1:{server.server_address[1]}/metrics")
+
+    count = sum(len(p.video) + len(p.subtitle) + len(p.folder) for p in plans)
+    Message.info(f"正在执行 {len(plans)} 个文件夹的 {count} 项重命名任务...")
+    console.quiet = not verbose
+    try:
+        results, job = asyncio.run(main())
+    finally:
+        console.quiet = False
+        if server:
+            server.shutdown()
+
+    Output.print_batch_summary(results)
+    if job:
+        Message.info(f"重命名记录: {job}")
+    if not all(result.success for result in results):
+        raise SystemExit(1)
+
+
+@start.command(
+    options_metavar="[选项]",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("job", type=str, required=False, metavar="[任务名称]")
+@config_options
+@click.option("-p", "--password", type=str, help="文件访问密码(可选)")
+def resume(
+    config: str,
+    job: Optional[str],
+    no_cache: bool,
+    refresh_cache: bool,
+    verbose: bool,
+    password: Optional[str],
+):
+    """
+    根据重命名记录继续中断的重命名, 无需重新获取文件列表及TMDB信息\n
+    未指定任务名称时继续最近一次未完成的任务\n
+    用例: amr resume 20240101-120000-1234
+
+    \f
+    :param config: 配置文件路径
+    :param job: 重命名记录任务名称
+    :param no_cache: 不使用TMDB缓存
+    :param refresh_cache: 忽略并刷新TMDB缓存
+    :param password: 文件访问密码
+    """
+
+    import asyncio
+
+    from AlistMediaRename import AsyncAmr
+    from AlistMediaRename.journal import RenameJournal
+    from AlistMediaRename.output import Message, Output, console
+
+    settings = load_config(config, no_cache, verbose)
+
+    async def main():
+        async with AsyncAmr(settings, refresh_cache=refresh_cache) as amr:
+            name = job
+            if not name and amr.journal_dir:
+                name = RenameJournal.latest_unfinished(amr.journal_dir)
+            if not name:
+                return None
+            with console.status("正在重命名文件..."):
+                file_results, folder_results = await amr.resume(name, password)
+            return name, file_results, folder_results, amr.retry_count
 
-    # 初始化
-    amr = Amr(config)
+    try:
+        result = asyncio.run(main())
+    except ValueError as e:
+        Message.error(str(e))
+        raise SystemExit(1)
+
+    if result is None:
+        Message.info("没有未完成的重命名记录")
+        return
+    name, file_results, folder_results, retry_count = result
+    if not file_results and not folder_results:
+        Message.success(f"重命名记录 {name} 中的重命名均已完成")
+        return
+
+    Output.print_rename_result(
+        file_results + (folder_results or AsyncAmr._folder_skipped()),
+        len(file_results),
+        0,
+        len(folder_results),
+        retry_count,
+        name,
+    )
+    if not all(r.success for r in file_results + folder_results):
+        raise SystemExit(1)
+
+
+@start.command(
+    options_metavar="[选项]",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("job", type=str, required=True, metavar="任务名称")
+@config_options
+@click.option("-p", "--password", type=str, help="文件访问密码(可选)")
+@click.option("-y", "--yes", is_flag=True, help="无需确认, 直接撤销(可选)")
+def undo(
+    config: str,
+    job: str,
+    no_cache: bool,
+    refresh_cache: bool,
+    verbose: bool,
+    password: Optional[str],
+    yes: bool,
+):
+    """
+    根据重命名记录撤销重命名, 恢复文件及父文件夹的原名称\n
+    当前文件不存在或原文件名已被占用时跳过该文件\n
+    用例: amr undo 20240101-120000-1234
+
+    \f
+    :param config: 配置文件路径
+    :param job: 重命名记录任务名称
+    :param no_cache: 不使用TMDB缓存
+    :param refresh_cache: 忽略并刷新TMDB缓存
+    :param password: 文件访问密码
+    :param yes: 无需确认
+    """
+
+    import asyncio
+
+    from AlistMediaRename import AsyncAmr
+    from AlistMediaRename.output import Message, Output, UserExit, console
+
+    settings = load_config(config, no_cache, verbose)
+
+    async def main():
+        async with AsyncAmr(settings, refresh_cache=refresh_cache) as amr:
+            files, folders = amr.undo_items(job)
+            if not files and not folders:
+                return None
+            Message.info(
+                f"重命名记录 {job}: 撤销 {len(files)} 个文件及 {len(folders)} 个父文件夹的重命名"
+            )
+            if not yes:
+                Output.require_confirmation()
+            with console.status("正在撤销重命名..."):
+                file_results, folder_results = await amr.undo(job, password)
+            return file_results, folder_results, amr.retry_count, amr.journal_job
+
+    try:
+        result = asyncio.run(main())
+    except ValueError as e:
+        Message.error(str(e))
+        raise SystemExit(1)
+    except UserExit:
+        return
+
+    if result is None:
+        Message.info(f"重命名记录 {job} 中没有已完成的重命名")
+        return
+    file_results, folder_results, retry_count, undo_job = result
+    Output.print_rename_result(
+        file_results + (folder_results or AsyncAmr._folder_skipped()),
+        len(file_results),
+        0,
+        len(folder_results),
+        retry_count,
+        undo_job,
+    )
+    if not all(r.success for r in file_results + folder_results):
+        raise SystemExit(1)
+
+
+@start.command(
+    options_metavar="[选项]",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+@click.argument("manifest", type=click.Path(exists=True), metavar="任务清单")
+@config_options
+@click.option(
+    "-i",
+    "--interval",
+    type=float,
+    help="检查文件夹的间隔(秒), 默认使用配置参数(可选)",
+)
+@click.option("--once", is_flag=True, help="只检查一次后退出(可选)")
+@click.option(
+    "--folder/--no-folder", default=None, help="是否对父文件夹进行重命名(可选)"
+)
+def watch(
+    config: str,
+    folder: Union[bool, None],
+    interval: Optional[float],
+    manifest: str,
+    no_cache: bool,
+    once: bool,
+    refresh_cache: bool,
+    verbose: bool,
+):
+    """
+    监视任务清单中的文件夹, 定时重命名新增的文件, 无需选择及确认\n
+    任务清单格式与 batch 命令相同\n
+    用例: amr watch manifest.yaml -i 300
+
+    \f
+    :param config: 配置文件路径
+    :param folder: 是否对父文件夹进行重命名
+    :param interval: 检查文件夹的间隔
+    :param manifest: 任务清单文件路径
+    :param no_cache: 不使用TMDB缓存
+    :param once: 只检查一次
+    :param refresh_cache: 忽略并刷新TMDB缓存
+    """
+
+    import asyncio
+
+    from AlistMediaRename import AsyncAmr
+    from AlistMediaRename.batch import Manifest
+    from AlistMediaRename.metrics import metrics
+    from AlistMediaRename.output import Message
+
+    try:
+        entries = Manifest.load(manifest)
+    except ValueError as e:
+        Message.error(str(e))
+        raise SystemExit(1)
+
+    settings = load_config(config, no_cache, verbose)
     if folder is not None:
-        amr.config.settings.amr.media_folder_rename = folder
-
-    # TMDB搜索电影
-    if movie:
-        if id:
-            amr.movie_rename_id(keyword, dir, password)
-        else:
-            amr.movie_rename_keyword(keyword, dir, password)
-    # TMDB搜索剧集
-    else:
-        if id:
-            amr.tv_rename_id(keyword, dir, password, number)
-        else:
-            amr.tv_rename_keyword(keyword, dir, password, number)
+        settings.settings.amr.media_folder_rename = folder
+
+    def report(results: list):
+        for result in results:
+            if result.error:
+                Message.error(f"{result.entry.dir}: {result.error}")
+            else:
+                Message.success(
+                    f"{result.entry.dir}: 视频 {result.video_count}, 字幕 {result.subtitle_count}"
+                    + (f" -> {result.title}" if result.folder_count else "")
+                )
+
+    async def main():
+        async with AsyncAmr(settings, refresh_cache=refresh_cache) as amr:
+            watcher = amr.watcher(entries, interval)
+            if not once:
+                Message.info(
+                    f"正在监视 {len(entries)} 个文件夹, 每 {watcher.interval:g} 秒检查一次, 按 Ctrl+C 退出"
+                )
+            await watcher.run(1 if once else None, report)
+
+    # 运行期间提供运行指标接口
+    server = None
+    if settings.amr.metrics_port and not once:
+        server = metrics.serve(settings.amr.metrics_port)
+        Message.info(f"运行指标: http://127.0.0.1:{server.server_address[1]}/metrics")
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        Message.info("已停止监视")
+    finally:
+        if server:
+            server.shutdown()
 
 
 if __name__ == "__main__":
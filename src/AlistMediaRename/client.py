@@ -0,0 +1,179 @@
+import asyncio
+import importlib.util
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+
+from .output import Message
+
+T = TypeVar("T")
+
+
+class HttpClients:
+    """
+    HTTP 请求客户端
+    一次 Amr 会话中共享带连接池的同步/异步客户端, 以及运行异步请求的事件循环,
+    各批次请求之间复用已建立的连接
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        初始化参数
+
+        :param max_connections: 每个客户端最大连接数
+        :param max_keepalive_connections: 每个客户端最大保持连接数
+        :param http2: 是否启用 HTTP/2, 需要安装 h2
+        :param transport: 自定义同步传输层, 用于测试
+        :param async_transport: 自定义异步传输层, 用于测试
+        """
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            Message.warning(
+                "未安装 h2, 已使用 HTTP/1.1, 启用 HTTP/2 请安装: pip install httpx[http2]"
+            )
+            http2 = False
+
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._async_transport = async_transport
+        # 事件循环 -> 异步客户端, 异步客户端的连接只能在创建时的事件循环中使用
+        self._async: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._warmups: list[threading.Thread] = []
+        # 需要预先连接的地址, 及各事件循环中异步客户端预先连接的任务
+        self._warmup_urls: list[str] = []
+        self._async_warmups: dict[asyncio.AbstractEventLoop, list[asyncio.Task]] = {}
+
+        self.sync = httpx.Client(
+            limits=self.limits, http2=self.http2, transport=transport
+        )
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        当前事件循环的异步客户端, 首次使用时创建.
+        同步接口通过 run 在会话事件循环中使用同一客户端, AsyncAmr 在调用方的事件循环中使用另一客户端
+        """
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = self.loop
+        client = self._async.get(loop)
+        if client is None:
+            # 已关闭的事件循环中的客户端无法再使用
+            for closed in [key for key in self._async if key.is_closed()]:
+                del self._async[closed]
+            client = self._async[loop] = httpx.AsyncClient(
+                limits=self.limits, http2=self.http2, transport=self._async_transport
+            )
+        return client
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """会话事件循环, 异步客户端的连接绑定在该事件循环上"""
+
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """在会话事件循环中运行协程"""
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._warmup_async(self.loop)
+            return self.loop.run_until_complete(coro)
+        coro.close()
+        raise RuntimeError("当前已在事件循环中运行, 请使用 AsyncAmr")
+
+    def warmup(self, urls: list[str]):
+        """
+        后台预先建立连接, 使 TCP/TLS 握手与其他操作同时进行, 关闭客户端前等待完成.
+        同步客户端立即在后台线程中连接; 异步客户端的连接绑定事件循环,
+        在会话事件循环首次运行时(run)或 AsyncAmr 进入会话时(awarmup)在对应事件循环中连接
+
+        :param urls: 需要预先连接的地址
+        """
+
+        def connect(url: str):
+            try:
+                self.sync.head(url, timeout=5)
+            except Exception:
+                pass
+
+        self._warmup_urls = [url for url in urls if url]
+        for url in self._warmup_urls:
+            thread = threading.Thread(target=connect, args=(url,), daemon=True)
+            thread.start()
+            self._warmups.append(thread)
+
+    async def awarmup(self):
+        """在当前事件循环中后台预先建立异步客户端的连接"""
+
+        self._warmup_async(asyncio.get_running_loop())
+
+    def _warmup_async(self, loop: asyncio.AbstractEventLoop):
+        """
+        在事件循环中创建异步客户端预先连接的任务, 与之后的请求同时进行, 每个事件循环只进行一次
+
+        :param loop: 异步客户端所在的事件循环
+        """
+
+        if not self._warmup_urls or loop in self._async_warmups:
+            return
+        client = self.async_client
+
+        async def connect(url: str):
+            try:
+                await client.head(url, timeout=5)
+            except Exception:
+                pass
+
+        self._async_warmups[loop] = [
+            loop.create_task(connect(url)) for url in self._warmup_urls
+        ]
+
+    def _join_warmups(self):
+        """等待预先连接完成"""
+
+        for thread in self._warmups:
+            thread.join()
+        self._warmups.clear()
+
+    async def aclose(self):
+        """在当前事件循环中关闭客户端"""
+
+        await asyncio.to_thread(self._join_warmups)
+        self.sync.close()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*self._async_warmups.pop(loop, []))
+        client = self._async.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        """关闭客户端及事件循环"""
+
+        self._join_warmups()
+        self.sync.close()
+        tasks = self._async_warmups.pop(self._loop, []) if self._loop else []
+        client = self._async.pop(self._loop, None) if self._loop else None
+        if client is not None and not self._loop.is_closed():
+            if tasks:
+                self._loop.run_until_complete(asyncio.wait(tasks))
+            self.run(client.aclose())
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
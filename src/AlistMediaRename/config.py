@@ -1,4 +1,6 @@
 import importlib.resources
+import os
+from typing import Optional
 from ruamel.yaml import YAML
 from .models import Settings
 from .output import Message, console
@@ -23,6 +25,13 @@ class Config:
                 self.set()
                 self.save(self.filepath)
 
+    @property
+    def dirpath(self) -> Optional[str]:
+        """配置文件所在文件夹, 用于保存缓存等本地数据"""
+        if not self.filepath:
+            return None
+        return os.path.dirname(os.path.abspath(self.filepath))
+
     @property
     def alist(self):
         return self.settings.alist
@@ -0,0 +1,1958 @@
+import asyncio
+import os
+import time
+from contextlib import nullcontext
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar, Union
+
+from .api import AlistApi, AsyncAlistApi, AsyncTMDBApi, TMDBApi
+from .cache import FolderStateStore, TMDBCache
+from .classifier import MediaClassifier
+from .client import HttpClients
+from .config import Config
+from .journal import RenameJournal
+from .log import ApiResponseError, logger, HandleException
+from .metrics import metrics
+from .models import (
+    ApiResponseModel,
+    BatchEntry,
+    BatchResult,
+    FolderPlan,
+    Formated_Variables,
+    JournalItem,
+    RenameCallback,
+    RenameItem,
+    SeasonPlan,
+)
+from .output import Message, Output, console
+from .profiler import Profiler
+from .retry import RetryPolicy, retry_counter
+from .scheduler import AdaptiveLimiter, RateLimiter
+from .session import TokenStore
+from .utils import Tools
+from .walker import AlistWalker
+from .watch import Watcher
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Amr:
+    """
+    利用TMDB api获取剧集标题, 并对Alist对应剧集文件进行重命名, 便于播放器刮削识别剧集
+    文件命名格式: {剧集名称}-S{季度}E{集数}.{该集标题}.{文件后缀}
+    文件命名举例: 间谍过家家-S01E01.行动代号“枭”.mkv
+    文件夹命名格式: {剧集名称} ({首播年份})
+    文件夹命名举例: 间谍过家家 (2022)
+
+    """
+
+    alist_class = AlistApi
+    tmdb_class = TMDBApi
+
+    @HandleException.catch_main_exceptions
+    def __init__(
+        self,
+        config: Union[Config, str],
+        refresh_cache: bool = False,
+        clients: Optional[HttpClients] = None,
+        profiler: Optional[Profiler] = None,
+    ):
+        """
+        初始化参数
+        :param config: 配置参数
+        :param refresh_cache: 忽略已有TMDB缓存, 重新请求并更新缓存
+        :param clients: 自定义HTTP客户端, 默认根据配置创建
+        :param profiler: 性能分析, 设置后记录重命名流程各阶段耗时及内存峰值
+        """
+
+        self.config = config if type(config) is Config else Config(config)
+        self.profiler = profiler
+
+        # 会话共享的HTTP客户端, 所有请求复用连接池
+        self.clients = clients or HttpClients(
+            self.config.amr.max_connections,
+            self.config.amr.max_keepalive_connections,
+            self.config.amr.http2,
+        )
+
+        # TMDB 请求结果缓存, 保存在配置文件所在目录
+        self.tmdb_cache = None
+        if self.config.tmdb.cache_enable and self.config.dirpath:
+            self.tmdb_cache = TMDBCache(
+                os.path.join(self.config.dirpath, "amr_cache.db"),
+                self.config.tmdb.cache_ttl,
+                self.config.tmdb.cache_max_size,
+                refresh_cache,
+            )
+
+        # 请求日志, 相对路径以配置文件所在目录为准
+        log_file = self.config.amr.log_file
+        if log_file and not os.path.isabs(log_file):
+            log_file = os.path.join(self.config.dirpath or "", log_file)
+        logger.configure(self.config.amr.log_capacity, log_file)
+
+        # 运行指标文件, 相对路径以配置文件所在目录为准
+        self.metrics_file = self.config.amr.metrics_file
+        if self.metrics_file and not os.path.isabs(self.metrics_file):
+            self.metrics_file = os.path.join(
+                self.config.dirpath or "", self.metrics_file
+            )
+
+        # 重命名记录文件夹, 相对路径以配置文件所在目录为准, 未使用配置文件时不记录
+        self.journal_dir = self.config.amr.journal_dir
+        if self.journal_dir and not os.path.isabs(self.journal_dir):
+            self.journal_dir = (
+                os.path.join(self.config.dirpath, self.journal_dir)
+                if self.config.dirpath
+                else ""
+            )
+        self.journal: Optional[RenameJournal] = None
+
+        # 媒体文件分类, 预先编译匹配规则
+        self.classifier = MediaClassifier(
+            {
+                "video": self.config.amr.video_regex_pattern,
+                "subtitle": self.config.amr.subtitle_regex_pattern,
+                **self.config.amr.media_categories,
+            }
+        )
+
+        # 文件夹状态记录, 用于判断是否需要强制刷新文件夹
+        self.folder_state = None
+        if self.config.amr.refresh_policy == "if-stale" and self.config.dirpath:
+            self.folder_state = FolderStateStore(
+                os.path.join(self.config.dirpath, "amr_cache.db")
+            )
+
+        # Alist 登录 Token 本地存储, 保存在配置文件所在目录
+        self.token_store = None
+        if self.config.alist.save_token and self.config.dirpath:
+            self.token_store = TokenStore(
+                os.path.join(self.config.dirpath, "amr_token.json")
+            )
+
+        # 初始化 AlistApi 和 TMDBApi, 首次请求 Alist 时再登录或使用已保存的 Token
+        self.alist = self.alist_class(
+            self.config.alist.url,
+            self.config.alist.user,
+            self.config.alist.password,
+            self.config.alist.totp,
+            self.clients,
+            self.token_store,
+            AdaptiveLimiter(
+                self.config.amr.rename_max_concurrency,
+                self.config.amr.rename_adaptive,
+            ),
+            self._retry_policy(self.config.amr.read_retries),
+            self._retry_policy(self.config.amr.write_retries, idempotent=False),
+        )
+        self.tmdb = self.tmdb_class(
+            self.config.tmdb.api_url,
+            self.config.tmdb.api_key,
+            self.clients,
+            self.tmdb_cache,
+            self._retry_policy(self.config.amr.read_retries),
+            RateLimiter.shared(
+                self.config.tmdb.api_url,
+                self.config.tmdb.rate_limit,
+                self.config.tmdb.rate_burst,
+            ),
+        )
+
+        # 预先建立连接
+        if self.config.amr.connection_warmup:
+            self.clients.warmup([self.alist.url, self.tmdb.api_url])
+
+    def close(self):
+        """关闭HTTP客户端及缓存, 并写入运行指标文件"""
+
+        self.clients.close()
+        logger.flush()
+        if self.journal:
+            self.journal.close()
+        self._write_metrics()
+        if self.tmdb_cache:
+            self.tmdb_cache.close()
+        if self.folder_state:
+            self.folder_state.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _write_metrics(self):
+        """写入运行指标文件, 写入失败不影响重命名结果"""
+
+        if not self.metrics_file:
+            return
+        try:
+            metrics.write_textfile(self.metrics_file)
+        except OSError as e:
+            Message.warning(f"写入运行指标文件失败: {e}")
+
+    def _stage(self, name: str):
+        """性能分析阶段, 未设置性能分析时不做任何操作"""
+
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
+    def _retry_policy(self, max_retries: int, idempotent: bool = True) -> RetryPolicy:
+        """根据配置创建请求重试策略"""
+
+        return RetryPolicy(
+            max_retries,
+            self.config.amr.retry_backoff,
+            self.config.amr.retry_max_backoff,
+            idempotent,
+        )
+
+    @property
+    def journal_job(self) -> str:
+        """本次会话的重命名记录任务名称, 未记录时为空"""
+
+        return self.journal.job if self.journal else ""
+
+    def _journal_callback(
+        self, items: list[RenameItem], is_dir: bool = False
+    ) -> Optional[RenameCallback]:
+        """
+        重命名前写入重命名记录, 首次重命名时创建任务并清理超出保留数量的已完成任务
+
+        :param items: 重命名任务
+        :param is_dir: 是否为父文件夹重命名
+        :return: 记录重命名结果的回调函数, 未启用重命名记录时为 None
+        """
+
+        if not self.journal_dir or not items:
+            return None
+        if self.journal is None:
+            self.journal = RenameJournal(self.journal_dir, url=self.alist.url)
+            callback = self.journal.intend(items, is_dir)
+            RenameJournal.prune(
+                self.journal_dir, self.config.amr.journal_keep, self.journal.job
+            )
+            return callback
+        return self.journal.intend(items, is_dir)
+
+    @property
+    def retry_count(self) -> int:
+        """本次会话中请求重试次数"""
+
+        return (
+            self.alist.read_retry.retries
+            + self.alist.write_retry.retries
+            + self.tmdb.retry.retries
+        )
+
+    def walker(self, **kwargs) -> AlistWalker:
+        """
+        创建 Alist 文件夹遍历器, 参数参考 AlistWalker
+
+        用例: for entry in amr.walker(max_depth=2).walk("/动漫/"): ...
+        """
+
+        kwargs.setdefault("max_concurrency", self.config.amr.walk_max_concurrency)
+        kwargs.setdefault("per_page", self.config.alist.list_per_page)
+        kwargs.setdefault("page_concurrency", self.config.alist.list_page_concurrency)
+        return AlistWalker(self.alist, **kwargs)
+
+    def _classify(self, file_list: Iterable[str]) -> dict[str, list[str]]:
+        """
+        筛选视频文件、字幕文件及其他附属文件
+
+        :param file_list: 文件名, 可为逐项返回的迭代器
+        :return: 各类别文件名列表, 包含 video, subtitle 及 media_categories 中的类别
+        """
+
+        return self.classifier.classify(file_list)
+
+    def _match_media(
+        self,
+        media: dict[str, list[str]],
+        target_list: list[str],
+        folder_path: str,
+        first_number: str,
+        exclude_renamed: Optional[bool] = None,
+    ) -> tuple[list[RenameItem], list[RenameItem]]:
+        """
+        匹配文件列表, 字幕文件及其他附属文件按类别分别匹配
+
+        :param media: 各类别文件名列表
+        :param target_list: 目标文件名列表(不含后缀)
+        :param folder_path: 文件夹路径
+        :param first_number: 从指定集数开始命名
+        :param exclude_renamed: 是否排除已重命名的文件, 默认使用配置参数
+        :return: 视频重命名列表, 字幕及附属文件重命名列表
+        """
+
+        if exclude_renamed is None:
+            exclude_renamed = self.config.amr.exclude_renamed
+
+        video_rename_list: list[RenameItem] = Tools.match_episode_items(
+            media["video"],
+            target_list,
+            folder_path,
+            exclude_renamed,
+            first_number,
+        )
+        subtitle_rename_list: list[RenameItem] = []
+        for category, file_list in media.items():
+            if category == "video":
+                continue
+            subtitle_rename_list += Tools.match_episode_items(
+                file_list,
+                target_list,
+                folder_path,
+                exclude_renamed,
+                first_number,
+            )
+        return video_rename_list, subtitle_rename_list
+
+    def _refresh_first(self, folder_path: str) -> bool:
+        """
+        根据刷新策略判断首次获取文件列表时是否强制刷新
+
+        :param folder_path: 文件夹路径
+        """
+
+        policy = self.config.amr.refresh_policy
+        if policy != "if-stale":
+            return policy == "always"
+        if self.folder_state is None:
+            return True
+        state = self.folder_state.get(self.alist.url, folder_path)
+        return (
+            state is None or time.time() - state[1] >= self.config.amr.refresh_interval
+        )
+
+    def _check_state(self, folder_path: str, refreshed: bool, fingerprint: str) -> bool:
+        """
+        记录刷新后的文件夹状态, 未刷新时判断文件列表是否有变化
+
+        :param folder_path: 文件夹路径
+        :param refreshed: 获取文件列表时是否已强制刷新
+        :param fingerprint: 文件列表指纹
+        :return: 是否需要强制刷新后重新获取
+        """
+
+        if self.folder_state is None:
+            return False
+        if refreshed:
+            self.folder_state.set(self.alist.url, folder_path, fingerprint)
+            return False
+        state = self.folder_state.get(self.alist.url, folder_path)
+        return state is None or state[0] != fingerprint
+
+    def _read_folder(
+        self, folder_path: str, folder_password, refresh: bool
+    ) -> tuple[list[str], str]:
+        """
+        分页获取文件夹文件名列表
+
+        :return: 文件名列表, 文件列表指纹
+        """
+
+        items = list(
+            self.alist.iter_file_list(
+                folder_path,
+                folder_password,
+                refresh,
+                self.config.alist.list_per_page,
+                self.config.alist.list_page_concurrency,
+            )
+        )
+        return [item["name"] for item in items], FolderStateStore.fingerprint(items)
+
+    def _list_folder(
+        self, folder_path: str, folder_password=None
+    ) -> dict[str, list[str]]:
+        """
+        获取文件夹文件列表, 并筛选视频文件和字幕文件.
+        根据刷新策略决定是否强制刷新, 获取失败时刷新父文件夹后重试
+
+        :param folder_path: 文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 各类别文件名列表
+        """
+
+        refresh = self._refresh_first(folder_path)
+        try:
+            names, fingerprint = self._read_folder(
+                folder_path, folder_password, refresh
+            )
+        except ApiResponseError:
+            if self.config.amr.refresh_policy == "never":
+                Message.error(f"获取文件列表失败: {folder_path}")
+                raise
+            # 刷新文件夹所在父文件夹，防止Alist未及时刷新，导致无法获取文件列表
+            self.alist.file_list(
+                Tools.get_parent_path(folder_path), folder_password, True, per_page=1
+            )
+            refresh = True
+            try:
+                names, fingerprint = self._read_folder(
+                    folder_path, folder_password, refresh
+                )
+            except ApiResponseError:
+                Message.error(f"获取文件列表失败: {folder_path}")
+                raise
+
+        # 文件列表有变化时强制刷新, 获取网盘最新文件
+        if self._check_state(folder_path, refresh, fingerprint):
+            names, fingerprint = self._read_folder(folder_path, folder_password, True)
+            self._check_state(folder_path, True, fingerprint)
+
+        return self._classify(names)
+
+    def _tv_plan(
+        self,
+        tv_id: str,
+        tv_info: dict,
+        season_info: dict,
+        media: dict[str, list[str]],
+        folder_path: str,
+        first_number: str,
+        exclude_renamed: Optional[bool] = None,
+    ) -> tuple[list[RenameItem], list[RenameItem], str]:
+        """
+        匹配剧集信息-文件列表
+
+        :param tv_id: 剧集id
+        :param tv_info: 剧集信息
+        :param season_info: 季度信息
+        :param media: 各类别文件名列表
+        :param folder_path: 文件夹路径
+        :param first_number: 从指定集数开始命名
+        :param exclude_renamed: 是否排除已重命名的文件, 默认使用配置参数
+        :return: 视频重命名列表, 字幕重命名列表, 父文件夹重命名标题
+        """
+
+        fv_tv = Formated_Variables.tv(
+            name=tv_info["name"],
+            original_name=tv_info["original_name"],
+            year=tv_info["first_air_date"][:4],
+            first_air_date=tv_info["first_air_date"],
+            language=tv_info["original_language"],
+            region=tv_info["origin_country"][0],
+            rating=tv_info["vote_average"],
+            season=season_info["season_number"],
+            season_year=season_info["air_date"][:4],
+            tmdb_id=tv_id,
+        )
+
+        # 创建包含源文件名以及目标文件名列表
+        # 保存剧集标题
+        episode_list_video = list(
+            map(
+                lambda x: self.config.amr.tv_name_format.format(
+                    **vars(fv_tv),
+                    episode=x["episode_number"],
+                    air_date=x["air_date"],
+                    episode_rating=x["vote_average"],
+                    title=x["name"],
+                ),
+                season_info["episodes"],
+            )
+        )
+
+        # 匹配剧集信息/文件列表
+        video_rename_list, subtitle_rename_list = self._match_media(
+            media, episode_list_video, folder_path, first_number, exclude_renamed
+        )
+
+        # 获取父文件夹重命名标题
+        tv_folder_target_name = self.config.amr.tv_folder_name_format.format(
+            **vars(fv_tv)
+        )
+
+        return video_rename_list, subtitle_rename_list, tv_folder_target_name
+
+    def _movie_plan(
+        self,
+        movie_id: str,
+        movie_info: dict,
+        media: dict[str, list[str]],
+        folder_path: str,
+        exclude_renamed: Optional[bool] = None,
+    ) -> tuple[list[RenameItem], list[RenameItem], str]:
+        """
+        匹配电影信息-文件列表
+
+        :param movie_id: 电影id
+        :param movie_info: 电影信息
+        :param media: 各类别文件名列表
+        :param folder_path: 文件夹路径
+        :param exclude_renamed: 是否排除已重命名的文件, 默认使用配置参数
+        :return: 视频重命名列表, 字幕重命名列表, 父文件夹重命名标题
+        """
+
+        fv_movie = Formated_Variables.movie(
+            name=movie_info["title"],
+            original_name=movie_info["original_title"],
+            year=movie_info["release_date"][:4],
+            release_date=movie_info["release_date"],
+            language=movie_info["original_language"],
+            region=movie_info["origin_country"][0],
+            rating=movie_info["vote_average"],
+            tmdb_id=movie_id,
+        )
+
+        # 创建包含源文件名以及目标文件名列表
+        target_name = self.config.amr.movie_name_format.format(**vars(fv_movie))
+
+        # 匹配剧集信息/文件列表
+        video_rename_list, subtitle_rename_list = self._match_media(
+            media, [target_name], folder_path, "1", exclude_renamed
+        )
+        # 获取父文件夹重命名标题
+        movie_folder_target_name = self.config.amr.movie_folder_name_format.format(
+            **vars(fv_movie)
+        )
+
+        return video_rename_list, subtitle_rename_list, movie_folder_target_name
+
+    def _folder_rename_list(
+        self, folder_path: str, folder_target_name: str
+    ) -> list[RenameItem]:
+        """
+        父文件夹重命名任务, 格式: 复仇者联盟 (2012), 无需重命名时返回空列表
+
+        :param folder_path: 文件夹路径
+        :param folder_target_name: 父文件夹重命名标题
+        """
+
+        original_name = Tools.get_current_path(folder_path)
+        if (
+            not self.config.amr.media_folder_rename
+            or original_name == folder_target_name
+        ):
+            return []
+        return [
+            RenameItem(
+                original_name,
+                folder_target_name,
+                Tools.get_parent_path(folder_path),
+            )
+        ]
+
+    @staticmethod
+    def _folder_skipped() -> list[ApiResponseModel]:
+        """未重命名父文件夹时的请求结果"""
+
+        return [
+            ApiResponseModel(
+                success=True,
+                status_code=200,
+                error="",
+                data={"result": "未重命名父文件夹"},
+                function="重命名父文件夹",
+                args=(),
+                kwargs={},
+            )
+        ]
+
+    def _apply(
+        self,
+        video_rename_list: list[RenameItem],
+        subtitle_rename_list: list[RenameItem],
+        folder_rename_list: list[RenameItem],
+    ) -> list[ApiResponseModel]:
+        """
+        进行重命名操作, 先重命名文件, 再重命名父文件夹
+
+        :return: 文件及父文件夹重命名请求结果
+        """
+
+        with console.status("正在重命名文件..."):
+            # 重命名文件
+            rename_list = video_rename_list + subtitle_rename_list
+            result_rename_list: list[ApiResponseModel] = self.alist.rename_list(
+                rename_list,
+                async_mode=self.config.amr.rename_by_async,
+                callback=self._journal_callback(rename_list),
+            )
+
+            # 重命名父文件夹
+            if folder_rename_list:
+                result_folder_rename = self.alist.rename_list(
+                    folder_rename_list,
+                    async_mode=False,
+                    callback=self._journal_callback(folder_rename_list, True),
+                )
+            else:
+                result_folder_rename = self._folder_skipped()
+
+        return result_rename_list + result_folder_rename
+
+    # TAG: tv_rename_id
+    @HandleException.catch_main_exceptions
+    def tv_rename_id(
+        self,
+        tv_id: str,
+        folder_path: str,
+        folder_password=None,
+        first_number: str = "1-",
+    ) -> bool:
+        """
+        根据TMDB剧集id获取剧集标题,并批量将Alist指定文件夹中的视频文件及字幕文件重命名为剧集标题.
+
+        :param tv_id: 剧集id
+        :param folder_path: 文件夹路径, 如/abc/test/
+        :param folder_password: 文件夹访问密码
+        :param first_number: 从集数开始命名, 如first_name=5-, 则从第5集开始按顺序重命名
+        :return: 重命名请求结果
+        """
+
+        # 确保路径以 / 开头并以 / 结尾
+        folder_path = Tools.ensure_slash(folder_path)
+        # 确保 tv_id 为字符串
+        tv_id = str(tv_id)
+
+        ### ------------------------ 获取文件列表 ------------------------ ####
+        with self._stage("list"), console.status("获取文件列表..."):
+            media = self._list_folder(folder_path, folder_password)
+
+        ### ------------------------ 获取 TMDB 剧集/季度信息 ------------------------ ####
+        # TODO: 修改电影输出信息
+        # Step 3: 根据剧集 id 查找 TMDB 剧集信息
+        with self._stage("lookup"), console.status("查找指定剧集..."):
+            result_tv_info: ApiResponseModel = self.tmdb.tv_info(
+                tv_id, self.config.tmdb.language
+            )
+
+        # Step 4: 根据查找信息选择季度
+        with self._stage("select"):
+            season_number = Output.select_number(result_tv_info.data["seasons"])
+        season_number = result_tv_info.data["seasons"][season_number]["season_number"]
+
+        # Step 5: 获取剧集对应季每集信息
+        with self._stage("lookup"), console.status("获取季度信息..."):
+            result_tv_season_info: ApiResponseModel = self.tmdb.tv_season_info(
+                tv_id, season_number, self.config.tmdb.language
+            )
+
+        ### ------------------------ 匹配剧集信息-文件列表 -------------------- ###
+        # Step 5: 匹配剧集信息-文件列表
+        with self._stage("plan"):
+            video_rename_list, subtitle_rename_list, tv_folder_target_name = (
+                self._tv_plan(
+                    tv_id,
+                    result_tv_info.data,
+                    result_tv_season_info.data,
+                    media,
+                    folder_path,
+                    first_number,
+                )
+            )
+            folder_rename_list = self._folder_rename_list(
+                folder_path, tv_folder_target_name
+            )
+
+        ### ------------------------ 4. 进行重命名操作 -------------------- ###
+
+        # Step 6: 输出重命名文件信息
+        with self._stage("render"):
+            Output.print_rename_info(
+                video_rename_list,
+                subtitle_rename_list,
+                self.config.amr.media_folder_rename,
+                tv_folder_target_name,
+                folder_path,
+            )
+
+        # Step 7: 等待用户确认
+        with self._stage("confirm"):
+            Output.require_confirmation()
+
+        # Step 8: 进行文件重命名操作
+        with self._stage("apply"):
+            results = self._apply(
+                video_rename_list, subtitle_rename_list, folder_rename_list
+            )
+
+        # Step 9: 输出重命名结果
+        # TODO: 使用装饰器输出重命名结果
+        with self._stage("summary"):
+            Output.print_rename_result(
+                results,
+                len(video_rename_list),
+                len(subtitle_rename_list),
+                len(folder_rename_list),
+                self.retry_count,
+                self.journal_job,
+            )
+
+        return True
+
+    # TAG: tv_rename_keyword
+    @HandleException.catch_main_exceptions
+    def tv_rename_keyword(
+        self,
+        keyword: str,
+        folder_path: str,
+        folder_password=None,
+        first_number: str = "1-",
+    ) -> bool:
+        """
+        根据TMDB剧集关键词获取剧集标题,并批量将Alist指定文件夹中的视频文件及字幕文件重命名为剧集标题.
+
+        :param keyword: 剧集关键词
+        :param folder_path: 文件夹路径, 结尾必须加'/', 如/abc/test/
+        :param folder_password: 文件夹访问密码
+        :param first_number: 从指定集数开始命名, 如first_name=5, 则从第5集开始按顺序重命名
+        :return: 重命名请求结果
+        """
+
+        ### ------------------------ 1. 查找 TMDB 剧集信息 ------------------------ ####
+        # Step 1: 使用关键词查找剧集
+        with self._stage("lookup"), console.status("查找指定剧集..."):
+            result_search_tv: ApiResponseModel = self.tmdb.search_tv(
+                keyword, self.config.tmdb.language
+            )
+
+        ### ------------------------ 2. 获取剧集 TMDB ID ------------------------------ ###
+        # Step 2: 选择剧集
+        with self._stage("select"):
+            selected_number = Output.select_number(result_search_tv.data["results"])
+        tv_id = result_search_tv.data["results"][selected_number]["id"]
+
+        # Step 3: 根据获取到的id调用 tv_rename_id 函数进行重命名
+        self.tv_rename_id(tv_id, folder_path, folder_password, first_number)
+
+        return True
+
+    # TAG: movie_rename_id
+    @HandleException.catch_main_exceptions
+    def movie_rename_id(
+        self, movie_id: str, folder_path: str, folder_password=None
+    ) -> bool:
+        """
+        根据TMDB电影id获取电影标题,并将Alist指定文件夹中的视频文件及字幕文件重命名为电影标题.
+
+        :param movie_id: 电影id
+        :param folder_path: 文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 重命名请求结果
+        """
+
+        # 确保路径以 / 开头并以 / 结尾
+        folder_path = Tools.ensure_slash(folder_path)
+        # 确保 movie_id 为字符串
+        movie_id = str(movie_id)
+
+        ### ------------------------ 1. 获取文件列表 -------------------- ###
+        with self._stage("list"), console.status("获取文件列表..."):
+            media = self._list_folder(folder_path, folder_password)
+
+        ### ------------------------ 2. 查找 TMDB 电影信息 ------------------------ ####
+        # Step 1: 根据电影 id 查找 TMDB 电影信息
+        with self._stage("lookup"), console.status("查找指定电影..."):
+            result_movie_info: ApiResponseModel = self.tmdb.movie_info(
+                movie_id, self.config.tmdb.language
+            )
+
+        ### ------------------------ 3. 匹配电影信息/文件列表 -------------------- ###
+        # Step 3: 匹配电影信息/文件列表
+        with self._stage("plan"):
+            video_rename_list, subtitle_rename_list, movie_folder_target_name = (
+                self._movie_plan(movie_id, result_movie_info.data, media, folder_path)
+            )
+            folder_rename_list = self._folder_rename_list(
+                folder_path, movie_folder_target_name
+            )
+
+        ### ------------------------ 4. 进行重命名操作 -------------------- ###
+        # Step 4: 输出重命名文件信息
+        with self._stage("render"):
+            Output.print_rename_info(
+                video_rename_list,
+                subtitle_rename_list,
+                self.config.amr.media_folder_rename,
+                movie_folder_target_name,
+                folder_path,
+            )
+
+        # Step 5: 等待用户确认
+        with self._stage("confirm"):
+            Output.require_confirmation()
+
+        # Step 6: 进行文件重命名操作
+        with self._stage("apply"):
+            results = self._apply(
+                video_rename_list, subtitle_rename_list, folder_rename_list
+            )
+
+        # Step 7: 输出重命名结果
+        with self._stage("summary"):
+            Output.print_rename_result(
+                results,
+                len(video_rename_list),
+                len(subtitle_rename_list),
+                len(folder_rename_list),
+                self.retry_count,
+                self.journal_job,
+            )
+
+        return True
+
+    # TAG: movie_rename_keyword
+    @HandleException.catch_main_exceptions
+    def movie_rename_keyword(
+        self, keyword: str, folder_path: str, folder_password=None
+    ) -> bool:
+        """
+        根据TMDB电影关键字获取电影标题,并批量将Alist指定文件夹中的视频文件及字幕文件重命名为电影标题.
+
+        :param keyword: 电影关键词
+        :param folder_path: 文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 重命名请求结果
+        """
+
+        ### ------------------------ 1. 查找 TMDB 电影信息 ------------------------ ####
+        # Step 1: 使用关键词查找电影
+        with self._stage("lookup"), console.status("查找指定电影..."):
+            result_search_movie: ApiResponseModel = self.tmdb.search_movie(
+                keyword, self.config.tmdb.language
+            )
+
+        ### ------------------------ 2. 获取剧集 TMDB ID ------------------------------ ###
+        # Step 2: 选择电影
+        with self._stage("select"):
+            selected_number = Output.select_number(result_search_movie.data["results"])
+        movie_id = result_search_movie.data["results"][selected_number]["id"]
+
+        # Step 3: 根据获取到的id调用 movie_rename_id 函数进行重命名
+        self.movie_rename_id(movie_id, folder_path, folder_password)
+
+        return True
+
+
+class AsyncAmr(Amr):
+    """
+    Amr 异步版本, 重命名函数均为协程, 可在已有事件循环中使用
+    获取文件列表与查找 TMDB 信息同时进行, 等待用户输入时不阻塞其他请求
+    """
+
+    alist_class = AsyncAlistApi
+    tmdb_class = AsyncTMDBApi
+
+    alist: AsyncAlistApi
+    tmdb: AsyncTMDBApi
+
+    async def aclose(self):
+        """关闭HTTP客户端及缓存, 并写入运行指标文件"""
+
+        await self.clients.aclose()
+        logger.flush()
+        if self.journal:
+            self.journal.close()
+        self._write_metrics()
+        if self.tmdb_cache:
+            self.tmdb_cache.close()
+        if self.folder_state:
+            self.folder_state.close()
+
+    async def __aenter__(self):
+        # 在调用方的事件循环中预先建立异步客户端的连接
+        if self.config.amr.connection_warmup:
+            await self.clients.awarmup()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def _read_folder_async(
+        self, folder_path: str, folder_password, refresh: bool
+    ) -> tuple[list[str], str]:
+        """
+        分页获取文件夹文件名列表
+
+        :return: 文件名列表, 文件列表指纹
+        """
+
+        items = [
+            item
+            async for item in self.alist.iter_file_list_async(
+                folder_path,
+                folder_password,
+                refresh,
+                self.config.alist.list_per_page,
+                self.config.alist.list_page_concurrency,
+            )
+        ]
+        return [item["name"] for item in items], FolderStateStore.fingerprint(items)
+
+    async def _list_folder_async(
+        self, folder_path: str, folder_password=None
+    ) -> dict[str, list[str]]:
+        """
+        获取文件夹文件列表, 并筛选视频文件和字幕文件.
+        根据刷新策略决定是否强制刷新, 获取失败时刷新父文件夹后重试
+
+        :param folder_path: 文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 各类别文件名列表
+        """
+
+        return (await self._scan_folder_async(folder_path, folder_password))[0]
+
+    async def _scan_folder_async(
+        self, folder_path: str, folder_password=None
+    ) -> tuple[dict[str, list[str]], str]:
+        """
+        获取文件夹文件列表及文件列表指纹, 参数参考 _list_folder_async
+
+        :return: 各类别文件名列表, 文件列表指纹
+        """
+
+        refresh = self._refresh_first(folder_path)
+        try:
+            names, fingerprint = await self._read_folder_async(
+                folder_path, folder_password, refresh
+            )
+        except ApiResponseError:
+            if self.config.amr.refresh_policy == "never":
+                Message.error(f"获取文件列表失败: {folder_path}")
+                raise
+            # 刷新文件夹所在父文件夹，防止Alist未及时刷新，导致无法获取文件列表
+            await self.alist.file_list(
+                Tools.get_parent_path(folder_path), folder_password, True, per_page=1
+            )
+            refresh = True
+            try:
+                names, fingerprint = await self._read_folder_async(
+                    folder_path, folder_password, refresh
+                )
+            except ApiResponseError:
+                Message.error(f"获取文件列表失败: {folder_path}")
+                raise
+
+        # 文件列表有变化时强制刷新, 获取网盘最新文件
+        if self._check_state(folder_path, refresh, fingerprint):
+            names, fingerprint = await self._read_folder_async(
+                folder_path, folder_password, True
+            )
+            self._check_state(folder_path, True, fingerprint)
+
+        return self._classify(names), fingerprint
+
+    async def _list_subfolders_async(
+        self, folder_path: str, folder_password=None
+    ) -> list[str]:
+        """
+        获取文件夹中的子文件夹名称
+
+        :param folder_path: 文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 子文件夹名称列表
+        """
+
+        return [
+            item["name"]
+            async for item in self.alist.iter_file_list_async(
+                folder_path,
+                folder_password,
+                self._refresh_first(folder_path),
+                self.config.alist.list_per_page,
+                self.config.alist.list_page_concurrency,
+            )
+            if item.get("is_dir")
+        ]
+
+    async def _rename_async(
+        self,
+        video_rename_list: list[RenameItem],
+        subtitle_rename_list: list[RenameItem],
+        folder_rename_list: list[RenameItem],
+    ) -> list[ApiResponseModel]:
+        """
+        进行重命名操作, 先重命名文件, 再重命名父文件夹
+
+        :return: 文件及父文件夹重命名请求结果
+        """
+
+        # 重命名文件
+        rename_list = video_rename_list + subtitle_rename_list
+        result_rename_list = await self.alist.rename_list(
+            rename_list,
+            async_mode=self.config.amr.rename_by_async,
+            callback=self._journal_callback(rename_list),
+        )
+
+        # 重命名父文件夹
+        if folder_rename_list:
+            result_folder_rename = await self.alist.rename_list(
+                folder_rename_list,
+                async_mode=False,
+                callback=self._journal_callback(folder_rename_list, True),
+            )
+        else:
+            result_folder_rename = self._folder_skipped()
+
+        return result_rename_list + result_folder_rename
+
+    async def _apply_async(
+        self,
+        video_rename_list: list[RenameItem],
+        subtitle_rename_list: list[RenameItem],
+        folder_rename_list: list[RenameItem],
+    ) -> list[ApiResponseModel]:
+        """
+        进行重命名操作, 并显示进度
+
+        :return: 文件及父文件夹重命名请求结果
+        """
+
+        with console.status("正在重命名文件..."):
+            return await self._rename_async(
+                video_rename_list, subtitle_rename_list, folder_rename_list
+            )
+
+    async def _entry_id(self, entry: BatchEntry) -> str:
+        """
+        获取批量任务对应的 TMDB ID, 未指定 ID 时使用关键词查找结果中的指定项
+
+        :param entry: 重命名任务
+        :return: TMDB ID
+        """
+
+        if entry.tmdb_id:
+            return entry.tmdb_id
+
+        if entry.type == "movie":
+            result_search = await self.tmdb.search_movie(
+                entry.keyword, self.config.tmdb.language
+            )
+        else:
+            result_search = await self.tmdb.search_tv(
+                entry.keyword, self.config.tmdb.language
+            )
+        results = result_search.data["results"]
+        if not 0 <= entry.select < len(results):
+            raise ValueError(
+                f"未找到关键词第 {entry.select} 项查找结果: {entry.keyword}"
+            )
+        return str(results[entry.select]["id"])
+
+    async def rename_entry(self, entry: BatchEntry) -> BatchResult:
+        """
+        无需用户确认, 执行单项批量重命名任务.
+
+        :param entry: 重命名任务
+        :return: 重命名任务结果
+        """
+
+        # 统计当前任务的请求重试次数
+        counter = [0]
+        token = retry_counter.set(counter)
+        try:
+            result = await self._rename_entry(entry)
+        finally:
+            retry_counter.reset(token)
+        result.retry_count = counter[0]
+        return result
+
+    async def _rename_entry(self, entry: BatchEntry) -> BatchResult:
+        """执行单项批量重命名任务, 参数参考 rename_entry"""
+
+        result = BatchResult(entry=entry)
+        try:
+            plan = await self._plan_entry(entry)
+            results = await self._rename_async(plan.video, plan.subtitle, plan.folder)
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+        result.title = plan.title
+        return self._count_results(
+            result,
+            len(plan.video),
+            len(plan.subtitle),
+            bool(plan.folder),
+            results,
+        )
+
+    async def _plan_entry(self, entry: BatchEntry) -> FolderPlan:
+        """
+        获取文件列表及 TMDB 信息, 生成单项任务的重命名计划
+
+        :param entry: 重命名任务
+        :return: 重命名计划
+        """
+
+        folder_path = Tools.ensure_slash(entry.dir)
+        media_id = await self._entry_id(entry)
+
+        # 同时获取文件列表及 TMDB 信息
+        if entry.type == "movie":
+            (media, fingerprint), result_movie_info = await asyncio.gather(
+                self._scan_folder_async(folder_path, entry.password),
+                self.tmdb.movie_info(media_id, self.config.tmdb.language),
+            )
+            video_rename_list, subtitle_rename_list, title = self._movie_plan(
+                media_id,
+                result_movie_info.data,
+                media,
+                folder_path,
+            )
+        else:
+            # 剧集信息及季度信息在同一请求中获取
+            (media, fingerprint), result_tv_info = await asyncio.gather(
+                self._scan_folder_async(folder_path, entry.password),
+                self.tmdb.tv_seasons_info(
+                    media_id, [entry.season], self.config.tmdb.language
+                ),
+            )
+            season_info = result_tv_info.data["seasons"].get(entry.season)
+            if season_info is None:
+                raise ApiResponseError(f"未查找到第 {entry.season} 季信息")
+            video_rename_list, subtitle_rename_list, title = self._tv_plan(
+                media_id,
+                result_tv_info.data["tv"],
+                season_info,
+                media,
+                folder_path,
+                entry.number,
+            )
+
+        return FolderPlan.model_construct(
+            entry=entry,
+            fingerprint=fingerprint,
+            title=title,
+            video=video_rename_list,
+            subtitle=subtitle_rename_list,
+            folder=self._folder_rename_list(folder_path, title),
+            error="",
+        )
+
+    async def plan_entry(self, entry: BatchEntry) -> FolderPlan:
+        """
+        生成单项任务的重命名计划, 不进行重命名.
+
+        :param entry: 重命名任务
+        :return: 重命名计划, 生成失败时记录错误信息
+        """
+
+        try:
+            return await self._plan_entry(entry)
+        except Exception as e:
+            return FolderPlan(entry=entry, error=str(e))
+
+    async def apply_plan(
+        self, plan: FolderPlan, password: Optional[str] = None
+    ) -> BatchResult:
+        """
+        执行重命名计划, 无需查询 TMDB 信息.
+        执行前重新获取文件列表, 文件列表指纹与生成计划时不一致则不进行重命名
+
+        :param plan: 重命名计划
+        :param password: 文件夹访问密码, 计划文件中不保存密码, 计划任务未设置时使用
+        :return: 重命名任务结果
+        """
+
+        counter = [0]
+        token = retry_counter.set(counter)
+        try:
+            result = await self._apply_plan(plan, password)
+        finally:
+            retry_counter.reset(token)
+        result.retry_count = counter[0]
+        return result
+
+    async def _apply_plan(
+        self, plan: FolderPlan, password: Optional[str] = None
+    ) -> BatchResult:
+        """执行重命名计划, 参数参考 apply_plan"""
+
+        result = BatchResult(entry=plan.entry, title=plan.title)
+        try:
+            folder_path = Tools.ensure_slash(plan.entry.dir)
+            _, fingerprint = await self._scan_folder_async(
+                folder_path, plan.entry.password or password
+            )
+            if fingerprint != plan.fingerprint:
+                raise ApiResponseError("文件列表已变化, 请重新生成重命名计划")
+            results = await self._rename_async(plan.video, plan.subtitle, plan.folder)
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+        return self._count_results(
+            result,
+            len(plan.video),
+            len(plan.subtitle),
+            bool(plan.folder),
+            results,
+        )
+
+    @staticmethod
+    def _count_results(
+        result: BatchResult,
+        video_count: int,
+        subtitle_count: int,
+        folder_renamed: bool,
+        results: list[ApiResponseModel],
+    ) -> BatchResult:
+        """
+        统计重命名结果
+
+        :param result: 重命名任务结果
+        :param video_count: 视频重命名任务数量
+        :param subtitle_count: 字幕重命名任务数量
+        :param folder_renamed: 是否重命名父文件夹
+        :param results: 文件及父文件夹重命名请求结果
+        """
+
+        video_end = video_count
+        subtitle_end = video_end + subtitle_count
+        result.video_count = sum(r.success for r in results[:video_end])
+        result.subtitle_count = sum(r.success for r in results[video_end:subtitle_end])
+        if folder_renamed:
+            result.folder_count = sum(r.success for r in results[subtitle_end:])
+        result.error_count = sum(not r.success for r in results)
+        result.error = next((r.error for r in results if not r.success), "")
+        result.success = result.error_count == 0
+        return result
+
+    async def batch(
+        self, entries: list[BatchEntry], max_concurrency: Optional[int] = None
+    ) -> list[BatchResult]:
+        """
+        在同一会话中执行批量重命名任务, 无需用户选择及确认.
+        同时处理的任务数受 max_concurrency 限制, 所有任务的重命名请求共用同一并发控制器.
+
+        :param entries: 重命名任务列表
+        :param max_concurrency: 同时处理的任务数, 默认使用配置参数
+        :return: 重命名任务结果, 顺序与任务列表一致
+        """
+
+        return await self._gather(self.rename_entry, entries, max_concurrency)
+
+    async def plan(
+        self, entries: list[BatchEntry], max_concurrency: Optional[int] = None
+    ) -> list[FolderPlan]:
+        """
+        在同一会话中生成批量重命名计划, 不进行重命名, 可保存后使用 apply 执行.
+
+        :param entries: 重命名任务列表
+        :param max_concurrency: 同时处理的任务数, 默认使用配置参数
+        :return: 重命名计划, 顺序与任务列表一致
+        """
+
+        return await self._gather(self.plan_entry, entries, max_concurrency)
+
+    async def apply(
+        self,
+        plans: list[FolderPlan],
+        max_concurrency: Optional[int] = None,
+        password: Optional[str] = None,
+    ) -> list[BatchResult]:
+        """
+        在同一会话中执行重命名计划, 所有计划的重命名请求共用同一并发控制器.
+
+        :param plans: 重命名计划列表
+        :param max_concurrency: 同时处理的计划数, 默认使用配置参数
+        :param password: 文件夹访问密码, 计划任务未设置时使用
+        :return: 重命名任务结果, 顺序与计划列表一致
+        """
+
+        return await self._gather(
+            lambda plan: self.apply_plan(plan, password), plans, max_concurrency
+        )
+
+    async def resume(
+        self, job: str, password: Optional[str] = None
+    ) -> tuple[list[ApiResponseModel], list[ApiResponseModel]]:
+        """
+        根据重命名记录继续未完成的重命名, 无需重新获取文件列表及 TMDB 信息, 已完成的重命名不再进行.
+        父文件夹已重命名的, 其中文件的路径按新的文件夹名称处理
+
+        :param job: 重命名记录任务名称
+        :param password: 文件夹访问密码, 核对文件列表时使用, 重命名记录中不保存密码
+        :return: 文件重命名请求结果, 父文件夹重命名请求结果
+        """
+
+        items = self._journal_items(job)
+        # 继续记录到原任务
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = RenameJournal(self.journal_dir, job, self.alist.url)
+
+        # 已重命名的父文件夹: (原路径, 新路径)
+        renamed = [self._folder_paths(j.item) for j in items if j.is_dir and j.done]
+        files = [j for j in items if not j.done and not j.is_dir]
+        folders = [j for j in items if not j.done and j.is_dir]
+
+        file_list = [self._remap(j.item, renamed) for j in files]
+        file_results = await self.alist.rename_list(
+            file_list,
+            async_mode=self.config.amr.rename_by_async,
+            callback=self.journal.callback([j.id for j in files]),
+        )
+        file_results = await self._confirm_renamed(
+            files, file_list, file_results, password
+        )
+
+        # 父文件夹逐个重命名, 路径按已重命名的上级文件夹处理
+        folder_results = []
+        for j in folders:
+            item = self._remap(j.item, renamed)
+            result = (
+                await self.alist.rename_list(
+                    [item], False, self.journal.callback([j.id])
+                )
+            )[0]
+            if result.success:
+                renamed.append(self._folder_paths(item))
+            folder_results.append(result)
+
+        return file_results, folder_results
+
+    def _journal_items(self, job: str) -> list[JournalItem]:
+        """读取重命名记录"""
+
+        if not self.journal_dir:
+            raise ValueError("未设置重命名记录文件夹 journal_dir")
+        if self.journal is not None:
+            self.journal.flush()
+        journal = RenameJournal(self.journal_dir, job, self.alist.url)
+        if not os.path.exists(journal.filepath):
+            raise ValueError(f"重命名记录不存在: {job}")
+        return journal.items()
+
+    @staticmethod
+    def _folder_paths(item: RenameItem) -> tuple[str, str]:
+        """父文件夹重命名前后的路径"""
+
+        target_name = Tools.replace_illegal_char(item.target_name)
+        return (
+            f"{item.folder_path}{item.original_name}/",
+            f"{item.folder_path}{target_name}/",
+        )
+
+    @staticmethod
+    def _remap(item: RenameItem, renamed: list[tuple[str, str]]) -> RenameItem:
+        """按已重命名的文件夹更新重命名任务的文件夹路径"""
+
+        folder_path = item.folder_path
+        for old, new in renamed:
+            if folder_path.startswith(old):
+                folder_path = new + folder_path[len(old) :]
+        return item._replace(folder_path=folder_path)
+
+    async def _confirm_renamed(
+        self,
+        journal_items: list[JournalItem],
+        rename_list: list[RenameItem],
+        results: list[ApiResponseModel],
+        password: Optional[str] = None,
+    ) -> list[ApiResponseModel]:
+        """
+        中断前最后一批重命名结果可能未写入记录, 继续时这些文件的重命名会失败.
+        仅获取有重命名失败的文件夹的文件列表, 源文件不存在且目标文件已存在的视为已重命名
+
+        :return: 更新后的重命名请求结果
+        """
+
+        failed: dict[str, list[int]] = {}
+        for i, result in enumerate(results):
+            if not result.success:
+                failed.setdefault(rename_list[i].folder_path, []).append(i)
+
+        results = list(results)
+        for folder_path, indexes in failed.items():
+            names = await self._folder_names(folder_path, password)
+            if names is None:
+                continue
+            for i in indexes:
+                item = rename_list[i]
+                target_name = Tools.replace_illegal_char(item.target_name)
+                if item.original_name not in names and target_name in names:
+                    self.journal.record(journal_items[i].id, True)  # type: ignore[union-attr]
+                    results[i] = results[i].model_copy(
+                        update={"success": True, "error": ""}
+                    )
+        return results
+
+    def undo_items(self, job: str) -> tuple[list[JournalItem], list[JournalItem]]:
+        """
+        重命名记录中已完成的重命名
+
+        :param job: 重命名记录任务名称
+        :return: 文件重命名记录, 父文件夹重命名记录(按重命名的相反顺序)
+        """
+
+        done = [j for j in self._journal_items(job) if j.done]
+        return (
+            [j for j in done if not j.is_dir],
+            [j for j in reversed(done) if j.is_dir],
+        )
+
+    async def undo(
+        self, job: str, password: Optional[str] = None
+    ) -> tuple[list[ApiResponseModel], list[ApiResponseModel]]:
+        """
+        撤销重命名记录中已完成的重命名: 先按相反顺序逐个恢复父文件夹名称, 再同时恢复文件名称.
+        撤销前获取相关文件夹的文件列表, 当前文件不存在或原文件名已被占用时跳过该项, 以失败结果表示.
+        撤销操作同样写入新的重命名记录
+
+        :param job: 重命名记录任务名称
+        :param password: 文件夹访问密码, 核对文件列表时使用, 重命名记录中不保存密码
+        :return: 文件撤销请求结果, 父文件夹撤销请求结果
+        """
+
+        files, folders = self.undo_items(job)
+        # 撤销操作记录到新任务
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+        # 仍为重命名后名称的父文件夹: (原路径, 新路径), 按重命名顺序排列
+        renamed = {j.id: self._folder_paths(j.item) for j in reversed(folders)}
+        folder_results = []
+        for j in folders:
+            paths = renamed.pop(j.id)
+            item = self._remap(j.item, list(renamed.values()))
+            result = (await self._undo_list([self._reverse(item)], True, password))[0]
+            if not result.success:
+                renamed[j.id] = paths
+                renamed = dict(sorted(renamed.items()))
+            folder_results.append(result)
+
+        file_list = [
+            self._reverse(self._remap(j.item, list(renamed.values()))) for j in files
+        ]
+        file_results = await self._undo_list(file_list, False, password)
+        return file_results, folder_results
+
+    @staticmethod
+    def _reverse(item: RenameItem) -> RenameItem:
+        """撤销重命名的任务"""
+
+        return RenameItem(
+            Tools.replace_illegal_char(item.target_name),
+            item.original_name,
+            item.folder_path,
+        )
+
+    async def _undo_list(
+        self,
+        rename_list: list[RenameItem],
+        is_dir: bool,
+        password: Optional[str] = None,
+    ) -> list[ApiResponseModel]:
+        """
+        检查冲突后撤销重命名, 文件同时重命名, 并发数由重命名并发控制器限制
+
+        :param rename_list: 撤销重命名的任务
+        :param is_dir: 是否为父文件夹
+        :param password: 文件夹访问密码
+        :return: 撤销重命名请求结果, 顺序与任务一致
+        """
+
+        conflicts = await self._undo_conflicts(rename_list, password)
+        todo = [item for i, item in enumerate(rename_list) if i not in conflicts]
+        results = iter(
+            await self.alist.rename_list(
+                todo,
+                async_mode=self.config.amr.rename_by_async and not is_dir,
+                callback=self._journal_callback(todo, is_dir),
+            )
+            if todo
+            else []
+        )
+        return [
+            (
+                ApiResponseModel(
+                    success=False,
+                    status_code=409,
+                    error=conflicts[i],
+                    data={},
+                    function="undo",
+                    args=(item.target_name, item.folder_path + item.original_name),
+                    kwargs={},
+                )
+                if i in conflicts
+                else next(results)
+            )
+            for i, item in enumerate(rename_list)
+        ]
+
+    async def _undo_conflicts(
+        self, rename_list: list[RenameItem], password: Optional[str] = None
+    ) -> dict[int, str]:
+        """
+        检查撤销重命名的冲突, 每个文件夹只获取一次文件列表
+
+        :param rename_list: 撤销重命名的任务
+        :param password: 文件夹访问密码
+        :return: 任务序号 -> 冲突原因
+        """
+
+        folders: dict[str, list[int]] = {}
+        for i, item in enumerate(rename_list):
+            folders.setdefault(item.folder_path, []).append(i)
+        folder_names = await asyncio.gather(
+            *[self._folder_names(f, password) for f in folders]
+        )
+
+        conflicts: dict[int, str] = {}
+        for names, indexes in zip(folder_names, folders.values()):
+            targets: set[str] = set()
+            for i in indexes:
+                item = rename_list[i]
+                if names is None:
+                    conflicts[i] = "获取文件列表失败"
+                elif item.original_name not in names:
+                    conflicts[i] = "文件不存在, 可能已被移动或重命名"
+                elif item.target_name in names or item.target_name in targets:
+                    conflicts[i] = "原文件名已被占用"
+                elif Tools.replace_illegal_char(item.target_name) != item.target_name:
+                    conflicts[i] = "原文件名包含不支持的字符"
+                targets.add(item.target_name)
+        return conflicts
+
+    async def _folder_names(
+        self, folder_path: str, password: Optional[str] = None
+    ) -> Optional[set[str]]:
+        """
+        强制刷新后获取文件夹中的文件名, 用于核对重命名记录与当前文件, 获取失败时返回 None
+
+        :param folder_path: 文件夹路径
+        :param password: 文件夹访问密码
+        """
+
+        try:
+            return {
+                entry["name"]
+                async for entry in self.alist.iter_file_list_async(
+                    folder_path,
+                    password,
+                    True,
+                    self.config.alist.list_per_page,
+                    self.config.alist.list_page_concurrency,
+                )
+            }
+        except ApiResponseError:
+            return None
+
+    async def _gather(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: list[T],
+        max_concurrency: Optional[int] = None,
+    ) -> list[R]:
+        """同时处理多项任务, 同时处理的任务数受 max_concurrency 限制"""
+
+        semaphore = asyncio.Semaphore(
+            max(1, max_concurrency or self.config.amr.batch_max_concurrency)
+        )
+
+        async def run(item: T) -> R:
+            async with semaphore:
+                return await func(item)
+
+        return list(await asyncio.gather(*[run(item) for item in items]))
+
+    def watcher(
+        self, entries: list[BatchEntry], interval: Optional[float] = None
+    ) -> "Watcher":
+        """
+        创建文件夹监视器, 在同一会话中定时检查文件夹并重命名新增文件, 参数参考 Watcher
+
+        用例: await amr.watcher(entries).run()
+        """
+
+        return Watcher(self, entries, interval)
+
+    # TAG: tv_rename_id
+    @HandleException.catch_main_exceptions
+    async def tv_rename_id(  # type: ignore[override]
+        self,
+        tv_id: str,
+        folder_path: str,
+        folder_password=None,
+        first_number: str = "1-",
+    ) -> bool:
+        """
+        根据TMDB剧集id获取剧集标题,并批量将Alist指定文件夹中的视频文件及字幕文件重命名为剧集标题.
+
+        :param tv_id: 剧集id
+        :param folder_path: 文件夹路径, 如/abc/test/
+        :param folder_password: 文件夹访问密码
+        :param first_number: 从集数开始命名, 如first_name=5-, 则从第5集开始按顺序重命名
+        :return: 重命名请求结果
+        """
+
+        # 确保路径以 / 开头并以 / 结尾
+        folder_path = Tools.ensure_slash(folder_path)
+        # 确保 tv_id 为字符串
+        tv_id = str(tv_id)
+
+        # Step 1: 后台获取文件列表, 同时查找 TMDB 剧集信息
+        task_file_list = asyncio.ensure_future(
+            self._list_folder_async(folder_path, folder_password)
+        )
+        try:
+            with self._stage("fetch"), console.status("查找指定剧集..."):
+                result_tv_info: ApiResponseModel = await self.tmdb.tv_info(
+                    tv_id, self.config.tmdb.language
+                )
+
+            # Step 2: 根据查找信息选择季度, 等待输入时文件列表请求继续进行
+            with self._stage("select"):
+                season_number = await asyncio.to_thread(
+                    Output.select_number, result_tv_info.data["seasons"]
+                )
+            season_number = result_tv_info.data["seasons"][season_number][
+                "season_number"
+            ]
+
+            # Step 3: 获取剧集对应季每集信息
+            with self._stage("fetch"), console.status("获取季度信息..."):
+                result_tv_season_info: ApiResponseModel = (
+                    await self.tmdb.tv_season_info(
+                        tv_id, season_number, self.config.tmdb.language
+                    )
+                )
+                media = await task_file_list
+        finally:
+            # 查找失败或用户退出时取消获取文件列表
+            task_file_list.cancel()
+
+        # Step 4: 匹配剧集信息-文件列表
+        with self._stage("plan"):
+            video_rename_list, subtitle_rename_list, tv_folder_target_name = (
+                self._tv_plan(
+                    tv_id,
+                    result_tv_info.data,
+                    result_tv_season_info.data,
+                    media,
+                    folder_path,
+                    first_number,
+                )
+            )
+            folder_rename_list = self._folder_rename_list(
+                folder_path, tv_folder_target_name
+            )
+
+        # Step 5: 输出重命名文件信息, 等待用户确认
+        with self._stage("render"):
+            Output.print_rename_info(
+                video_rename_list,
+                subtitle_rename_list,
+                self.config.amr.media_folder_rename,
+                tv_folder_target_name,
+                folder_path,
+            )
+        with self._stage("confirm"):
+            await asyncio.to_thread(Output.require_confirmation)
+
+        # Step 6: 进行文件重命名操作
+        with self._stage("apply"):
+            results = await self._apply_async(
+                video_rename_list, subtitle_rename_list, folder_rename_list
+            )
+
+        # Step 7: 输出重命名结果
+        with self._stage("summary"):
+            Output.print_rename_result(
+                results,
+                len(video_rename_list),
+                len(subtitle_rename_list),
+                len(folder_rename_list),
+                self.retry_count,
+                self.journal_job,
+            )
+
+        return True
+
+    # TAG: tv_rename_keyword
+    @HandleException.catch_main_exceptions
+    async def tv_rename_keyword(  # type: ignore[override]
+        self,
+        keyword: str,
+        folder_path: str,
+        folder_password=None,
+        first_number: str = "1-",
+    ) -> bool:
+        """
+        根据TMDB剧集关键词获取剧集标题,并批量将Alist指定文件夹中的视频文件及字幕文件重命名为剧集标题.
+
+        :param keyword: 剧集关键词
+        :param folder_path: 文件夹路径, 如/abc/test/
+        :param folder_password: 文件夹访问密码
+        :param first_number: 从指定集数开始命名, 如first_name=5, 则从第5集开始按顺序重命名
+        :return: 重命名请求结果
+        """
+
+        # Step 1: 使用关键词查找剧集
+        with console.status("查找指定剧集..."):
+            result_search_tv: ApiResponseModel = await self.tmdb.search_tv(
+                keyword, self.config.tmdb.language
+            )
+
+        # Step 2: 选择剧集
+        selected_number = await asyncio.to_thread(
+            Output.select_number, result_search_tv.data["results"]
+        )
+        tv_id = result_search_tv.data["results"][selected_number]["id"]
+
+        # Step 3: 根据获取到的id调用 tv_rename_id 函数进行重命名
+        await self.tv_rename_id(tv_id, folder_path, folder_password, first_number)
+
+        return True
+
+    # TAG: movie_rename_id
+    @HandleException.catch_main_exceptions
+    async def movie_rename_id(  # type: ignore[override]
+        self, movie_id: str, folder_path: str, folder_password=None
+    ) -> bool:
+        """
+        根据TMDB电影id获取电影标题,并将Alist指定文件夹中的视频文件及字幕文件重命名为电影标题.
+
+        :param movie_id: 电影id
+        :param folder_path: 文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 重命名请求结果
+        """
+
+        # 确保路径以 / 开头并以 / 结尾
+        folder_path = Tools.ensure_slash(folder_path)
+        # 确保 movie_id 为字符串
+        movie_id = str(movie_id)
+
+        # Step 1: 同时获取文件列表及 TMDB 电影信息
+        with self._stage("fetch"), console.status("查找指定电影..."):
+            media, result_movie_info = await asyncio.gather(
+                self._list_folder_async(folder_path, folder_password),
+                self.tmdb.movie_info(movie_id, self.config.tmdb.language),
+            )
+
+        # Step 2: 匹配电影信息/文件列表
+        with self._stage("plan"):
+            video_rename_list, subtitle_rename_list, movie_folder_target_name = (
+                self._movie_plan(movie_id, result_movie_info.data, media, folder_path)
+            )
+            folder_rename_list = self._folder_rename_list(
+                folder_path, movie_folder_target_name
+            )
+
+        # Step 3: 输出重命名文件信息, 等待用户确认
+        with self._stage("render"):
+            Output.print_rename_info(
+                video_rename_list,
+                subtitle_rename_list,
+                self.config.amr.media_folder_rename,
+                movie_folder_target_name,
+                folder_path,
+            )
+        with self._stage("confirm"):
+            await asyncio.to_thread(Output.require_confirmation)
+
+        # Step 4: 进行文件重命名操作
+        with self._stage("apply"):
+            results = await self._apply_async(
+                video_rename_list, subtitle_rename_list, folder_rename_list
+            )
+
+        # Step 5: 输出重命名结果
+        with self._stage("summary"):
+            Output.print_rename_result(
+                results,
+                len(video_rename_list),
+                len(subtitle_rename_list),
+                len(folder_rename_list),
+                self.retry_count,
+                self.journal_job,
+            )
+
+        return True
+
+    # TAG: movie_rename_keyword
+    @HandleException.catch_main_exceptions
+    async def movie_rename_keyword(  # type: ignore[override]
+        self, keyword: str, folder_path: str, folder_password=None
+    ) -> bool:
+        """
+        根据TMDB电影关键字获取电影标题,并批量将Alist指定文件夹中的视频文件及字幕文件重命名为电影标题.
+
+        :param keyword: 电影关键词
+        :param folder_path: 文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 重命名请求结果
+        """
+
+        # Step 1: 使用关键词查找电影
+        with console.status("查找指定电影..."):
+            result_search_movie: ApiResponseModel = await self.tmdb.search_movie(
+                keyword, self.config.tmdb.language
+            )
+
+        # Step 2: 选择电影
+        selected_number = await asyncio.to_thread(
+            Output.select_number, result_search_movie.data["results"]
+        )
+        movie_id = result_search_movie.data["results"][selected_number]["id"]
+
+        # Step 3: 根据获取到的id调用 movie_rename_id 函数进行重命名
+        await self.movie_rename_id(movie_id, folder_path, folder_password)
+
+        return True
+
+    async def _show_plans(
+        self,
+        tv_id: str,
+        seasons: list[tuple[int, str]],
+        tv_info: dict,
+        folder_path: str,
+        folder_password=None,
+    ) -> list[SeasonPlan]:
+        """
+        同时获取各季度文件列表及季度信息, 各季度信息获取后立即匹配
+
+        :param tv_id: 剧集id
+        :param seasons: 季度及对应文件夹名称
+        :param tv_info: 剧集信息
+        :param folder_path: 剧集文件夹路径
+        :param folder_password: 文件夹访问密码
+        :return: 各季度重命名计划, 按季度排序
+        """
+
+        task_seasons = asyncio.ensure_future(
+            self.tmdb.tv_seasons_info(
+                tv_id, [number for number, _ in seasons], self.config.tmdb.language
+            )
+        )
+
+        async def season_plan(number: int, name: str) -> SeasonPlan:
+            season_path = folder_path + name + "/"
+            media = await self._list_folder_async(season_path, folder_password)
+            result_seasons_info = await task_seasons
+            video_rename_list, subtitle_rename_list, title = self._tv_plan(
+                tv_id,
+                tv_info,
+                result_seasons_info.data["seasons"][number],
+                media,
+                season_path,
+                "1-",
+            )
+            return SeasonPlan(
+                number, season_path, video_rename_list, subtitle_rename_list, title
+            )
+
+        try:
+            return list(
+                await asyncio.gather(
+                    *[season_plan(number, name) for number, name in seasons]
+                )
+            )
+        finally:
+            task_seasons.cancel()
+
+    # TAG: show_rename_id
+    @HandleException.catch_main_exceptions
+    async def show_rename_id(
+        self, tv_id: str, folder_path: str, folder_password=None
+    ) -> bool:
+        """
+        根据TMDB剧集id重命名整部剧集, 剧集文件夹中的季度文件夹(如 Season 1, S02, 第3季)自动对应TMDB季度,
+        文件夹名称无法识别季度时按文件夹顺序对应. 各季度同时获取及匹配, 统一确认后共用同一并发控制器重命名.
+
+        :param tv_id: 剧集id
+        :param folder_path: 剧集文件夹路径, 如/abc/test/
+        :param folder_password: 文件夹访问密码
+        :return: 重命名请求结果
+        """
+
+        # 确保路径以 / 开头并以 / 结尾
+        folder_path = Tools.ensure_slash(folder_path)
+        # 确保 tv_id 为字符串
+        tv_id = str(tv_id)
+
+        # Step 1: 同时获取季度文件夹及 TMDB 剧集信息
+        with console.status("查找指定剧集..."):
+            folders, result_tv_info = await asyncio.gather(
+                self._list_subfolders_async(folder_path, folder_password),
+                self.tmdb.tv_info(tv_id, self.config.tmdb.language),
+            )
+
+        # Step 2: 匹配季度文件夹
+        seasons = Tools.map_season_folders(
+            folders,
+            [season["season_number"] for season in result_tv_info.data["seasons"]],
+        )
+        if not seasons:
+            Message.error(f"未找到与 TMDB 季度对应的季度文件夹: {folder_path}")
+            raise ApiResponseError("未找到季度文件夹")
+
+        # Step 3: 同时获取各季度文件列表及季度信息, 并匹配剧集信息-文件列表
+        with console.status(f"获取 {len(seasons)} 季文件列表及季度信息..."):
+            plans = await self._show_plans(
+                tv_id, seasons, result_tv_info.data, folder_path, folder_password
+            )
+        video_rename_list = [item for plan in plans for item in plan.video]
+        subtitle_rename_list = [item for plan in plans for item in plan.subtitle]
+        tv_folder_target_name = plans[0].title
+        folder_rename_list = self._folder_rename_list(
+            folder_path, tv_folder_target_name
+        )
+
+        # Step 4: 输出所有季度的重命名文件信息, 等待用户确认
+        Output.print_show_rename_info(
+            plans,
+            self.config.amr.media_folder_rename,
+            tv_folder_target_name,
+            folder_path,
+        )
+        await asyncio.to_thread(Output.require_confirmation)
+
+        # Step 5: 所有季度的文件一同重命名, 最后重命名剧集文件夹
+        results = await self._apply_async(
+            video_rename_list, subtitle_rename_list, folder_rename_list
+        )
+
+        # Step 6: 输出重命名结果
+        Output.print_rename_result(
+            results,
+            len(video_rename_list),
+            len(subtitle_rename_list),
+            len(folder_rename_list),
+            self.retry_count,
+            self.journal_job,
+        )
+
+        return True
+
+    # TAG: show_rename_keyword
+    @HandleException.catch_main_exceptions
+    async def show_rename_keyword(
+        self, keyword: str, folder_path: str, folder_password=None
+    ) -> bool:
+        """
+        根据TMDB剧集关键词重命名整部剧集, 参考 show_rename_id
+
+        :param keyword: 剧集关键词
+        :param folder_path: 剧集文件夹路径, 如/abc/test/
+        :param folder_password: 文件夹访问密码
+        :return: 重命名请求结果
+        """
+
+        # Step 1: 使用关键词查找剧集
+        with console.status("查找指定剧集..."):
+            result_search_tv: ApiResponseModel = await self.tmdb.search_tv(
+                keyword, self.config.tmdb.language
+            )
+
+        # Step 2: 选择剧集
+        selected_number = await asyncio.to_thread(
+            Output.select_number, result_search_tv.data["results"]
+        )
+        tv_id = result_search_tv.data["results"][selected_number]["id"]
+
+        # Step 3: 根据获取到的id调用 show_rename_id 函数进行重命名
+        await self.show_rename_id(tv_id, folder_path, folder_password)
+
+        return True
@@ -0,0 +1,271 @@
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from .models import ApiResponseModel, JournalItem, RenameCallback, RenameItem
+
+
+class RenameJournal:
+    """
+    重命名记录(预写日志)
+    每次运行为一个任务, 记录保存为 JSONL 文件. 重命名前写入重命名任务并同步到磁盘,
+    每项重命名完成后记录结果, 结果记录累计一定数量或间隔一定时间后批量写入并同步到磁盘.
+    程序中断后根据记录继续未完成的重命名, 无需重新获取文件列表及 TMDB 信息
+    """
+
+    # 结果记录累计条数达到该值时写入磁盘
+    flush_size = 256
+    # 距上次写入超过该时间(秒)时写入磁盘
+    flush_interval = 1.0
+
+    def __init__(self, dirpath: str, job: Optional[str] = None, url: str = ""):
+        """
+        初始化参数
+
+        :param dirpath: 重命名记录文件夹
+        :param job: 任务名称, 为空时根据当前时间生成新任务
+        :param url: Alist 主页链接, 继续任务时校验是否一致
+        """
+
+        if job is not None:
+            self.check_job(job)
+        else:
+            # 同一进程同一秒内创建多个任务时添加序号
+            job = base = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+            n = 1
+            while os.path.exists(os.path.join(dirpath, f"{job}.jsonl")):
+                n += 1
+                job = f"{base}-{n}"
+        self.job = job
+        self.filepath = os.path.join(dirpath, f"{self.job}.jsonl")
+        self.url = url
+        self._lock = threading.Lock()
+        self._file = None
+        self._next_id = 0
+        self._buffer: list[str] = []
+        self._flushed = time.monotonic()
+
+    def _open(self):
+        """打开记录文件, 新任务写入任务信息"""
+
+        if self._file is not None:
+            return
+        if os.path.exists(self.filepath):
+            self._next_id = len(self.load(self.filepath)[1])
+            self._file = self._append()
+            # 中断时最后一行可能未写入完整, 另起一行继续记录
+            if self._file.tell() > 0:
+                with open(self.filepath, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._buffer.append("")
+            return
+        os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+        self._file = self._append()
+        self._buffer.append(
+            json.dumps({"op": "begin", "url": self.url, "time": time.time()})
+        )
+
+    def _append(self):
+        """以追加方式打开记录文件, 记录中包含文件路径, 新建文件仅所有者可读写"""
+
+        fd = os.open(self.filepath, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        return os.fdopen(fd, "a", encoding="utf-8")
+
+    def _flush(self):
+        """写入缓存的记录并同步到磁盘"""
+
+        if self._file is None:
+            return
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._flushed = time.monotonic()
+
+    def intend(self, items: list[RenameItem], is_dir: bool = False) -> RenameCallback:
+        """
+        记录即将进行的重命名任务, 立即同步到磁盘
+
+        :param items: 重命名任务
+        :param is_dir: 是否为父文件夹重命名
+        :return: 记录重命名结果的回调函数
+        """
+
+        with self._lock:
+            self._open()
+            start = self._next_id
+            self._next_id += len(items)
+            for i, item in enumerate(items, start):
+                record = {"op": "intent", "id": i, "item": item, "dir": is_dir}
+                self._buffer.append(json.dumps(record, ensure_ascii=False))
+            self._flush()
+        return self.callback(list(range(start, start + len(items))))
+
+    def callback(self, ids: list[int]) -> RenameCallback:
+        """
+        创建记录重命名结果的回调函数
+
+        :param ids: 重命名任务序号, 与回调函数参数中的序号一一对应
+        """
+
+        def record(i: int, result: ApiResponseModel):
+            self.record(ids[i], result.success, result.error)
+
+        return record
+
+    def record(self, id: int, success: bool, error: str = ""):
+        """
+        记录重命名结果, 累计一定数量或间隔一定时间后写入磁盘
+
+        :param id: 重命名任务序号
+        :param success: 是否重命名成功
+        :param error: 错误信息
+        """
+
+        line = {"op": "done", "id": id} if success else {"op": "fail", "id": id}
+        if not success:
+            line["error"] = error
+        with self._lock:
+            self._open()
+            self._buffer.append(json.dumps(line, ensure_ascii=False))
+            if (
+                len(self._buffer) >= self.flush_size
+                or time.monotonic() - self._flushed >= self.flush_interval
+            ):
+                self._flush()
+
+    def flush(self):
+        """写入缓存的记录并同步到磁盘"""
+
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """写入缓存的记录并关闭文件"""
+
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def items(self) -> list[JournalItem]:
+        """读取当前任务的重命名记录, 校验 Alist 主页链接"""
+
+        self.flush()
+        header, items = self.load(self.filepath)
+        if self.url and header.get("url") and header["url"] != self.url:
+            raise ValueError(
+                f"重命名记录 {self.job} 的 Alist 地址与当前配置不一致: {header['url']}"
+            )
+        return items
+
+    @staticmethod
+    def check_job(job: str):
+        """
+        校验任务名称, 任务名称作为文件名使用, 不能包含路径分隔符或 ..
+
+        :param job: 任务名称
+        """
+
+        if (
+            not job
+            or ".." in job
+            or any(sep in job for sep in ("/", "\\", os.sep, os.altsep) if sep)
+        ):
+            raise ValueError(f"重命名记录任务名称无效: {job}")
+
+    @staticmethod
+    def load(filepath: str) -> tuple[dict, list[JournalItem]]:
+        """
+        读取重命名记录, 忽略中断时未写入完整的最后一行
+
+        :param filepath: 记录文件路径
+        :return: 任务信息, 按记录顺序排列的重命名任务
+        """
+
+        header: dict = {}
+        items: dict[int, JournalItem] = {}
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                op = record.get("op")
+                if op == "begin":
+                    header = record
+                elif op == "intent":
+                    items[record["id"]] = JournalItem(
+                        record["id"],
+                        RenameItem(*record["item"]),
+                        record["dir"],
+                        False,
+                        "",
+                    )
+                elif op in ("done", "fail") and record["id"] in items:
+                    items[record["id"]] = items[record["id"]]._replace(
+                        done=op == "done", error=record.get("error", "")
+                    )
+        return header, list(items.values())
+
+    @staticmethod
+    def jobs(dirpath: str) -> list[str]:
+        """
+        重命名记录文件夹中的任务名称, 按创建时间排序
+
+        :param dirpath: 重命名记录文件夹
+        """
+
+        if not os.path.isdir(dirpath):
+            return []
+        return sorted(
+            name[: -len(".jsonl")]
+            for name in os.listdir(dirpath)
+            if name.endswith(".jsonl")
+        )
+
+    @staticmethod
+    def latest_unfinished(dirpath: str) -> Optional[str]:
+        """
+        最近一次有未完成重命名的任务名称, 不存在时返回 None
+
+        :param dirpath: 重命名记录文件夹
+        """
+
+        for job in reversed(RenameJournal.jobs(dirpath)):
+            _, items = RenameJournal.load(os.path.join(dirpath, f"{job}.jsonl"))
+            if any(not item.done for item in items):
+                return job
+        return None
+
+    @staticmethod
+    def prune(dirpath: str, keep: int, current: str = "") -> list[str]:
+        """
+        删除超出保留数量的最早的任务记录, 有未完成重命名的任务保留以便继续
+
+        :param dirpath: 重命名记录文件夹
+        :param keep: 保留的任务数量, 0 为全部保留
+        :param current: 当前任务名称, 不删除
+        :return: 已删除的任务名称
+        """
+
+        if keep <= 0:
+            return []
+        jobs = [job for job in RenameJournal.jobs(dirpath) if job != current]
+        removed = []
+        for job in jobs[: max(0, len(jobs) - (keep - 1 if current else keep))]:
+            filepath = os.path.join(dirpath, f"{job}.jsonl")
+            try:
+                _, items = RenameJournal.load(filepath)
+                if any(not item.done for item in items):
+                    continue
+                os.remove(filepath)
+            except OSError:
+                continue
+            removed.append(job)
+        return removed
@@ -1,27 +1,190 @@
 import asyncio
+import atexit
+import inspect
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
 from functools import wraps
-from typing import Callable
-from .models import ApiResponseModel
+from typing import Callable, Optional
+from .metrics import metrics
+from .models import ApiResponseModel, LogRecord
 from .output import console, UserExit
 
 
+class LogSink:
+    """
+    请求日志文件
+    以 JSONL 格式追加写入, 写入在后台线程中进行, 不阻塞请求
+    """
+
+    def __init__(self, filepath: str):
+        """
+        初始化参数
+
+        :param filepath: 日志文件路径, 文件夹不存在时自动创建
+        """
+
+        self.filepath = filepath
+        dirpath = os.path.dirname(filepath)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        self._file = open(filepath, "a", encoding="utf-8")
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="amr-log", daemon=True)
+        self._thread.start()
+
+    def write(self, record: LogRecord):
+        """提交日志记录"""
+
+        self._queue.put(record)
+
+    def flush(self, timeout: float = 5):
+        """等待已提交的日志记录写入文件"""
+
+        event = threading.Event()
+        self._queue.put(event)
+        event.wait(timeout)
+
+    def close(self):
+        """写入剩余日志记录并关闭文件"""
+
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        """后台写入线程, 队列为空时才刷新文件缓冲区"""
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                self._file.flush()
+                item.set()
+                continue
+            self._file.write(
+                json.dumps(item._asdict(), ensure_ascii=False, default=str) + "\n"
+            )
+            if self._queue.empty():
+                self._file.flush()
+        self._file.close()
+
+
 class Logger:
     _instance = None
     debug_mode = False
     verbose_mode = False
-    log: list[ApiResponseModel] = []
+    # 内存中仅保留最近的请求日志, 超出容量时丢弃最早的记录
+    log: deque[LogRecord] = deque(maxlen=1000)
+    sink: Optional[LogSink] = None
+    _lock = threading.Lock()
+
+    # 需要隐藏的参数名称
+    sensitive_params = {"password", "passwd", "totp", "token", "api_key"}
+    # 错误信息中需要隐藏的参数, 如请求链接中的 api_key
+    _sensitive_query = re.compile(r"((?:api_key|token|password)=)[^&\s'\"]+")
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Logger, cls).__new__(cls)
         return cls._instance
 
+    def configure(self, capacity: int = 1000, filepath: str = ""):
+        """
+        设置日志容量及日志文件
+
+        :param capacity: 内存中保留的最大日志条数, 0 为不保留
+        :param filepath: JSONL 日志文件路径, 为空时不写入文件
+        """
+
+        with self._lock:
+            if capacity != self.log.maxlen:
+                Logger.log = deque(self.log, maxlen=capacity)
+            if (self.sink.filepath if self.sink else "") != filepath:
+                sink = Logger.sink
+                Logger.sink = LogSink(filepath) if filepath else None
+                if sink:
+                    sink.close()
+
+    def record(self, result: ApiResponseModel, params: dict) -> LogRecord:
+        """
+        记录请求结果
+
+        :param result: 请求结果
+        :param params: 脱敏后的请求参数
+        :return: 日志记录
+        """
+
+        record = LogRecord(
+            time.time(),
+            result.function,
+            result.success,
+            result.status_code,
+            self._sensitive_query.sub(r"\1***", result.error),
+            params,
+        )
+        self.log.append(record)
+        sink = self.sink
+        if sink:
+            sink.write(record)
+        return record
+
+    @classmethod
+    def params(cls, names: list[str], args: tuple, kwargs: dict) -> dict:
+        """
+        提取请求参数, 仅保留基本类型, 隐藏敏感参数, 容器类型仅记录长度
+
+        :param names: 函数参数名称
+        :param args: 位置参数
+        :param kwargs: 关键字参数
+        :return: 请求参数
+        """
+
+        params: dict = {}
+        for name, value in [*zip(names, args), *kwargs.items()]:
+            if name in cls.sensitive_params:
+                params[name] = "***" if value else value
+            elif isinstance(value, str):
+                params[name] = value if len(value) <= 200 else value[:200] + "..."
+            elif value is None or isinstance(value, (bool, int, float)):
+                params[name] = value
+            elif isinstance(value, (list, tuple, set, dict)):
+                params[name] = f"<{type(value).__name__} {len(value)}>"
+        return params
+
+    def flush(self):
+        """等待日志写入文件"""
+
+        sink = self.sink
+        if sink:
+            sink.flush()
+
+    def close(self):
+        """关闭日志文件"""
+
+        with self._lock:
+            sink, Logger.sink = Logger.sink, None
+        if sink:
+            sink.close()
+
 
 logger = Logger()
+atexit.register(logger.close)
 
 
 class ApiResponseError(Exception):
-    pass
+    def __init__(self, message: str = "", result: Optional[ApiResponseModel] = None):
+        """
+        :param message: 错误信息
+        :param result: 失败的请求结果
+        """
+
+        super().__init__(message)
+        self.result = result
 
 
 # 处理异常
@@ -34,6 +197,14 @@ class HandleException:
     def raise_error(func) -> Callable[..., ApiResponseModel]:
         """在错误时停止"""
 
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs) -> ApiResponseModel:
+            result: ApiResponseModel = await func(*args, **kwargs)
+            if not result.success:
+                console.print(result.model_dump()) if not logger.verbose_mode else None
+                raise ApiResponseError(result.error)
+            return result
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> ApiResponseModel:
             result: ApiResponseModel = func(*args, **kwargs)
@@ -42,26 +213,35 @@ class HandleException:
                 raise ApiResponseError(result.error)
             return result
 
-        return wrapper
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper  # type: ignore
+        else:
+            return wrapper
 
     @staticmethod
     def catch_api_exceptions(func) -> Callable[..., ApiResponseModel]:
         """
-        捕获函数异常
+        捕获函数异常, 并记录请求日志及请求指标
         """
 
+        names = list(inspect.signature(func).parameters)
+        endpoint = metrics.endpoint(func.__name__)
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs) -> ApiResponseModel:
             # 捕获错误
+            start = time.perf_counter()
             try:
                 result = await func(*args, **kwargs)
+                metrics.observe(endpoint, result.success, time.perf_counter() - start)
                 if logger.verbose_mode:
                     console.print(result.model_dump())
-                logger.log.append(result)
+                logger.record(result, Logger.params(names, args, kwargs))
                 return result
             except Exception as e:
                 if logger.debug_mode:
                     raise e
+                metrics.observe(endpoint, False, time.perf_counter() - start)
                 result = ApiResponseModel(
                     success=False,
                     status_code=-1,
@@ -71,7 +251,7 @@ class HandleException:
                     args=args,
                     kwargs=kwargs,
                 )
-                logger.log.append(result)
+                logger.record(result, Logger.params(names, args, kwargs))
                 if logger.verbose_mode:
                     console.print(result.model_dump())
                 return result
@@ -79,16 +259,18 @@ class HandleException:
         @wraps(func)
         def sync_wrapper(*args, **kwargs) -> ApiResponseModel:
             # 捕获错误
-
+            start = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
+                metrics.observe(endpoint, result.success, time.perf_counter() - start)
                 if logger.verbose_mode:
                     console.print(result.model_dump())
-                logger.log.append(result)
+                logger.record(result, Logger.params(names, args, kwargs))
                 return result
             except Exception as e:
                 if logger.debug_mode:
                     raise e
+                metrics.observe(endpoint, False, time.perf_counter() - start)
                 result = ApiResponseModel(
                     success=False,
                     status_code=-1,
@@ -98,7 +280,7 @@ class HandleException:
                     args=args,
                     kwargs=kwargs,
                 )
-                logger.log.append(result)
+                logger.record(result, Logger.params(names, args, kwargs))
                 if logger.verbose_mode:
                     console.print(result.model_dump())
                 return result
@@ -115,6 +297,22 @@ class HandleException:
         捕获函数异常
         """
 
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            # 捕获错误
+
+            try:
+                return await func(*args, **kwargs)
+            except ApiResponseError as e:
+                if logger.debug_mode:
+                    raise e
+            except UserExit:
+                pass
+            except Exception as e:
+                if logger.debug_mode:
+                    raise e
+                raise e
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # 捕获错误
@@ -131,4 +329,7 @@ class HandleException:
                     raise e
                 raise e
 
-        return wrapper
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
+        else:
+            return wrapper
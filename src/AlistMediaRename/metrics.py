@@ -0,0 +1,283 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class Metrics:
+    """
+    运行指标, 由 HandleException.catch_api_exceptions 记录各接口请求数、错误数及耗时,
+    可输出为 Prometheus/OpenMetrics 文本格式, 写入 node_exporter textfile 文件或通过本地 HTTP 接口提供
+    """
+
+    # 请求耗时直方图区间(秒)
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    # 指标名称: (类型, 说明)
+    families = {
+        "amr_requests": ("counter", "Alist/TMDB 接口请求数"),
+        "amr_request_errors": ("counter", "Alist/TMDB 接口请求失败数"),
+        "amr_request_duration_seconds": ("histogram", "Alist/TMDB 接口请求耗时"),
+        "amr_retries": ("counter", "请求重试次数"),
+        "amr_tmdb_cache_lookups": ("counter", "TMDB 缓存查询次数"),
+        "amr_tmdb_cache_hit_ratio": ("gauge", "TMDB 缓存命中率"),
+        "amr_renamed": ("counter", "重命名成功的文件及文件夹数"),
+        "amr_rename_files_per_second": ("gauge", "重命名速度(个/秒)"),
+        "amr_last_update_timestamp_seconds": ("gauge", "指标最后更新时间"),
+    }
+
+    # 请求函数名称 -> 接口名称
+    endpoints = {
+        "login": "auth/login",
+        "file_list": "fs/list",
+        "file_list_async": "fs/list",
+        "rename": "fs/rename",
+        "rename_async": "fs/rename",
+        "move": "fs/move",
+        "mkdir": "fs/mkdir",
+        "remove": "fs/remove",
+        "tv_info": "tv/{id}",
+        "search_tv": "search/tv",
+        "tv_season_info": "tv/{id}/season/{number}",
+        "tv_seasons_info": "tv/{id}?append_to_response",
+        "movie_info": "movie/{id}",
+        "search_movie": "search/movie",
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清空指标"""
+
+        with self._lock:
+            # (指标名称, 标签) -> 值
+            self._values: dict[tuple[str, tuple], float] = {}
+            # 标签 -> [各区间计数, 总耗时, 总次数]
+            self._histograms: dict[tuple, list] = {}
+            # 首次及最近一次重命名的时间, 用于计算重命名速度
+            self._rename_first: Optional[float] = None
+            self._rename_last: Optional[float] = None
+            self._updated = time.time()
+
+    @classmethod
+    def endpoint(cls, function: str) -> str:
+        """根据请求函数名称获取接口名称"""
+
+        return cls.endpoints.get(function, function)
+
+    def inc(self, name: str, value: float = 1, **labels: str):
+        """
+        增加计数
+
+        :param name: 指标名称
+        :param value: 增加值
+        :param labels: 标签
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+            self._updated = time.time()
+
+    def observe(self, endpoint: str, success: bool, latency: float):
+        """
+        记录接口请求结果
+
+        :param endpoint: 接口名称
+        :param success: 请求是否成功
+        :param latency: 请求耗时(秒)
+        """
+
+        labels = (("endpoint", endpoint),)
+        now = time.time()
+        with self._lock:
+            self._values[("amr_requests", labels)] = (
+                self._values.get(("amr_requests", labels), 0) + 1
+            )
+            if not success:
+                key = ("amr_request_errors", labels)
+                self._values[key] = self._values.get(key, 0) + 1
+
+            histogram = self._histograms.setdefault(
+                labels, [[0] * len(self.buckets), 0.0, 0]
+            )
+            for i, bound in enumerate(self.buckets):
+                if latency <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += latency
+            histogram[2] += 1
+
+            if endpoint == "fs/rename" and success:
+                key = ("amr_renamed", ())
+                self._values[key] = self._values.get(key, 0) + 1
+                if self._rename_first is None:
+                    self._rename_first = now - latency
+                self._rename_last = now
+            self._updated = now
+
+    def value(self, name: str, **labels: str) -> float:
+        """获取计数"""
+
+        with self._lock:
+            return self._values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def _gauges(self) -> dict[tuple[str, tuple], float]:
+        """根据计数计算的指标"""
+
+        gauges: dict[tuple[str, tuple], float] = {}
+        hits = self._values.get(("amr_tmdb_cache_lookups", (("result", "hit"),)), 0)
+        misses = self._values.get(("amr_tmdb_cache_lookups", (("result", "miss"),)), 0)
+        if hits + misses:
+            gauges[("amr_tmdb_cache_hit_ratio", ())] = hits / (hits + misses)
+        renamed = self._values.get(("amr_renamed", ()), 0)
+        if renamed and self._rename_first is not None and self._rename_last:
+            duration = self._rename_last - self._rename_first
+            if duration > 0:
+                gauges[("amr_rename_files_per_second", ())] = renamed / duration
+        gauges[("amr_last_update_timestamp_seconds", ())] = self._updated
+        return gauges
+
+    @staticmethod
+    def _labels(labels: tuple, extra: tuple = ()) -> str:
+        """格式化标签, 转义标签值中的特殊字符"""
+
+        items = [*labels, *extra]
+        if not items:
+            return ""
+        text = ",".join(
+            '{}="{}"'.format(
+                name,
+                str(value)
+                .replace("\\", "\\\\")
+                .replace('"', '\\"')
+                .replace("\n", "\\n"),
+            )
+            for name, value in items
+        )
+        return "{" + text + "}"
+
+    @staticmethod
+    def _number(value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def render(self, openmetrics: bool = False) -> str:
+        """
+        输出指标文本
+
+        :param openmetrics: 使用 OpenMetrics 格式, 否则使用 Prometheus 文本格式(node_exporter textfile 使用)
+        :return: 指标文本
+        """
+
+        with self._lock:
+            values = {**self._values, **self._gauges()}
+            histograms = {
+                labels: (list(buckets), total, count)
+                for labels, (buckets, total, count) in self._histograms.items()
+            }
+
+        lines = []
+        for family, (kind, help_text) in self.families.items():
+            if kind == "histogram":
+                if not histograms:
+                    continue
+                lines.append(f"# HELP {family} {help_text}")
+                lines.append(f"# TYPE {family} histogram")
+                for labels, (buckets, total, count) in sorted(histograms.items()):
+                    for bound, bucket in zip(self.buckets, buckets):
+                        extra = (("le", repr(bound)),)
+                        lines.append(
+                            f"{family}_bucket{self._labels(labels, extra)} {bucket}"
+                        )
+                    extra = (("le", "+Inf"),)
+                    lines.append(
+                        f"{family}_bucket{self._labels(labels, extra)} {count}"
+                    )
+                    lines.append(f"{family}_sum{self._labels(labels)} {total!r}")
+                    lines.append(f"{family}_count{self._labels(labels)} {count}")
+                continue
+
+            samples = sorted(
+                (labels, value)
+                for (name, labels), value in values.items()
+                if name == family
+            )
+            if not samples:
+                continue
+            # 计数指标的样本名称以 _total 结尾, OpenMetrics 的 TYPE 使用不带后缀的名称
+            sample_name = f"{family}_total" if kind == "counter" else family
+            type_name = family if openmetrics or kind != "counter" else sample_name
+            lines.append(f"# HELP {type_name} {help_text}")
+            lines.append(f"# TYPE {type_name} {kind}")
+            for labels, value in samples:
+                lines.append(
+                    f"{sample_name}{self._labels(labels)} {self._number(value)}"
+                )
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """
+        写入 node_exporter textfile 文件, 先写入临时文件再替换, 避免读取到不完整的内容
+
+        :param path: 文件路径, 通常以 .prom 结尾
+        """
+
+        dirpath = os.path.dirname(path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        在后台线程中提供 /metrics HTTP 接口, 根据 Accept 请求头返回 OpenMetrics 或 Prometheus 文本格式
+
+        :param port: 端口, 0 为随机端口
+        :param host: 监听地址, 默认仅本机访问
+        :return: HTTP 服务, 使用 shutdown() 停止
+        """
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get(
+                    "Accept", ""
+                )
+                body = metrics.render(openmetrics).encode("utf-8")
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type",
+                    (
+                        "application/openmetrics-text; version=1.0.0; charset=utf-8"
+                        if openmetrics
+                        else "text/plain; version=0.0.4; charset=utf-8"
+                    ),
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(
+            target=server.serve_forever, name="amr-metrics", daemon=True
+        )
+        thread.start()
+        return server
+
+
+metrics = Metrics()
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Callable, Literal, NamedTuple, Optional, Union
+
+from pydantic import BaseModel, ConfigDict
 
 
 class AlistConfig(BaseModel):
@@ -14,6 +16,12 @@ class AlistConfig(BaseModel):
     password: str = ""
     # Alist 2FA 验证码
     totp: str = ""
+    # 是否保存登录 Token, 多次运行时无需重复登录
+    save_token: bool = True
+    # 获取文件列表时每页文件数量, 0 为一次获取全部
+    list_per_page: int = 1000
+    # 分页获取文件列表时同时请求的最大页面数
+    list_page_concurrency: int = 4
 
 
 class TmdbConfig(BaseModel):
@@ -25,6 +33,16 @@ class TmdbConfig(BaseModel):
     api_key: str = ""
     # TMDB 搜索语言
     language: str = "zh-CN"
+    # 是否缓存 TMDB 请求结果
+    cache_enable: bool = True
+    # 缓存有效时间(秒)
+    cache_ttl: int = 86400
+    # 最大缓存条数
+    cache_max_size: int = 2000
+    # 每秒最大请求数, 0 为不限制
+    rate_limit: float = 20.0
+    # 最大突发请求数
+    rate_burst: int = 20
 
 
 class AmrConfig(BaseModel):
@@ -34,6 +52,48 @@ class AmrConfig(BaseModel):
     exclude_renamed: bool = True
     # 使用异步方式加快重命名操作
     rename_by_async: bool = True
+    # 异步重命名最大并发数
+    rename_max_concurrency: int = 8
+    # 根据请求结果自动调整异步重命名并发数
+    rename_adaptive: bool = True
+    # 是否启用 HTTP/2
+    http2: bool = False
+    # 最大连接数
+    max_connections: int = 20
+    # 最大保持连接数
+    max_keepalive_connections: int = 10
+    # 是否预先建立连接
+    connection_warmup: bool = True
+    # 获取文件列表、TMDB 信息等幂等请求的最大重试次数
+    read_retries: int = 3
+    # 重命名等修改文件请求的最大重试次数
+    write_retries: int = 2
+    # 首次重试等待时间(秒), 之后每次翻倍
+    retry_backoff: float = 0.5
+    # 重试最大等待时间(秒)
+    retry_max_backoff: float = 30.0
+    # 批量重命名时同时处理的任务数
+    batch_max_concurrency: int = 4
+    # 遍历文件夹时同时获取文件列表的最大请求数
+    walk_max_concurrency: int = 8
+    # 强制刷新文件夹策略: always 每次刷新, never 从不刷新, if-stale 文件夹可能有变化时刷新
+    refresh_policy: Literal["always", "never", "if-stale"] = "if-stale"
+    # if-stale 策略下, 距上次刷新超过该时间(秒)后再次刷新
+    refresh_interval: int = 3600
+    # 监视模式下检查文件夹的间隔(秒)
+    watch_interval: int = 300
+    # 内存中保留的最大请求日志条数
+    log_capacity: int = 1000
+    # 请求日志文件(JSONL), 为空时不写入文件
+    log_file: str = ""
+    # 运行指标文件(node_exporter textfile), 运行结束时写入, 为空时不写入
+    metrics_file: str = ""
+    # 批量重命名等长时间运行时提供 /metrics 接口的本机端口, 0 为不开启
+    metrics_port: int = 0
+    # 重命名记录文件夹, 记录每次运行的重命名任务及结果, 用于中断后继续及撤销, 为空时不记录
+    journal_dir: str = "journal"
+    # 保留最近的重命名记录任务数量, 超出时删除最早的记录, 0 为全部保留
+    journal_keep: int = 50
     # 是否重命名父文件夹
     media_folder_rename: bool = True
     # 电影文件命名格式
@@ -48,6 +108,9 @@ class AmrConfig(BaseModel):
     video_regex_pattern: str = r"(?i).*\.(avi|flv|wmv|mov|mp4|mkv|rm|rmvb)$"
     # 字幕文件匹配正则表达式
     subtitle_regex_pattern: str = r"(?i).*\.(ass|srt|ssa|sub)$"
+    # 其他附属文件类别及匹配正则表达式, 与字幕文件一同按剧集重命名
+    # 各类别互斥, 按视频、字幕、其他类别的顺序匹配, 文件只归入第一个匹配的类别
+    media_categories: dict[str, str] = {}
 
 
 class Settings(BaseModel):
@@ -56,7 +119,7 @@ class Settings(BaseModel):
     alist: AlistConfig = AlistConfig()
     tmdb: TmdbConfig = TmdbConfig()
     amr: AmrConfig = AmrConfig()
-    version: int = 1
+    version: int = 2
 
 
 class Formated_Variables:
@@ -105,6 +168,70 @@ class RenameTask(BaseModel):
     folder_path: str = ""  # 文件夹路径
 
 
+class RenameItem(NamedTuple):
+    """
+    重命名任务, 匹配及重命名过程中使用的轻量表示, 无需校验字段
+    对外接口使用 RenameTask, 可通过 to_task/from_task 相互转换
+    """
+
+    original_name: str  # 原始文件名
+    target_name: str  # 目标文件名
+    folder_path: str  # 文件夹路径
+
+    def to_task(self) -> RenameTask:
+        return RenameTask(
+            original_name=self.original_name,
+            target_name=self.target_name,
+            folder_path=self.folder_path,
+        )
+
+    @classmethod
+    def from_task(cls, task: Union[RenameTask, "RenameItem"]) -> "RenameItem":
+        if isinstance(task, RenameItem):
+            return task
+        return cls(task.original_name, task.target_name, task.folder_path)
+
+
+# 重命名接口同时接受两种表示
+RenameLike = Union[RenameTask, RenameItem]
+
+
+class SeasonPlan(NamedTuple):
+    """整部剧集重命名时单个季度的重命名计划"""
+
+    season: int  # 季度
+    folder_path: str  # 季度文件夹路径
+    video: list[RenameItem]  # 视频重命名列表
+    subtitle: list[RenameItem]  # 字幕及附属文件重命名列表
+    title: str  # 父文件夹重命名标题
+
+
+class AlistEntry(BaseModel):
+    """Alist 文件信息"""
+
+    folder_path: str  # 所在文件夹路径
+    name: str  # 文件名
+    is_dir: bool = False  # 是否为文件夹
+    size: int = 0  # 文件大小
+    modified: str = ""  # 修改时间
+    depth: int = 1  # 相对遍历起始文件夹的层级
+
+    @property
+    def path(self) -> str:
+        """文件完整路径"""
+        return self.folder_path + self.name
+
+
+class JournalItem(NamedTuple):
+    """重命名记录中的单项重命名任务"""
+
+    id: int  # 任务序号
+    item: RenameItem  # 重命名任务
+    is_dir: bool  # 是否为父文件夹重命名
+    done: bool  # 是否已重命名成功
+    error: str  # 最近一次重命名失败的错误信息
+
+
 class ApiResponseModel(BaseModel):
     success: bool
     status_code: int
@@ -113,3 +240,84 @@ class ApiResponseModel(BaseModel):
     function: str
     args: tuple
     kwargs: dict
+
+
+# 单项重命名完成后的回调函数, 参数为任务序号及请求结果
+RenameCallback = Callable[[int, ApiResponseModel], None]
+
+
+class LogRecord(NamedTuple):
+    """请求日志记录, 仅保留请求结果摘要及脱敏后的参数, 不引用响应数据及调用对象"""
+
+    time: float  # 请求完成时间戳
+    function: str  # 请求函数
+    success: bool  # 是否成功
+    status_code: int  # 状态码
+    error: str  # 错误信息
+    params: dict  # 请求参数
+
+
+class StageStat(NamedTuple):
+    """性能分析中单个阶段的统计结果, 同名阶段多次执行时累计"""
+
+    name: str  # 阶段名称
+    calls: int  # 执行次数
+    wall: float  # 耗时(秒)
+    cpu: float  # CPU 时间(秒)
+    peak_memory: int  # 相对阶段开始时的内存峰值增量(字节), 未记录时为 0
+
+
+class BatchEntry(BaseModel):
+    """批量重命名任务"""
+
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    keyword: str = ""  # 搜索关键词
+    tmdb_id: str = ""  # TMDB ID, 设置后忽略关键词
+    dir: str  # Alist 文件夹路径
+    type: Literal["tv", "movie"] = "tv"  # 媒体类型
+    season: int = 1  # 剧集季度
+    number: str = "1-"  # 从指定集数开始命名
+    password: Optional[str] = None  # 文件夹访问密码
+    select: int = 0  # 关键词查找结果序号
+
+
+class BatchResult(BaseModel):
+    """批量重命名任务结果"""
+
+    entry: BatchEntry  # 重命名任务
+    success: bool = False  # 是否全部重命名成功
+    title: str = ""  # 父文件夹重命名标题
+    video_count: int = 0  # 视频文件重命名成功数量
+    subtitle_count: int = 0  # 字幕文件重命名成功数量
+    folder_count: int = 0  # 父文件夹重命名成功数量
+    error_count: int = 0  # 重命名失败数量
+    retry_count: int = 0  # 请求重试次数
+    error: str = ""  # 错误信息
+
+
+class FolderPlan(BaseModel):
+    """
+    单个文件夹的重命名计划, 重命名计划文件(JSONL)中每行对应一个文件夹
+    重命名任务以 [原始文件名, 目标文件名, 文件夹路径] 数组保存
+    """
+
+    entry: BatchEntry  # 生成计划的重命名任务
+    fingerprint: str = ""  # 生成计划时的文件列表指纹, 执行前校验文件列表是否变化
+    title: str = ""  # 父文件夹重命名标题
+    video: list[RenameItem] = []  # 视频重命名列表
+    subtitle: list[RenameItem] = []  # 字幕及附属文件重命名列表
+    folder: list[RenameItem] = []  # 父文件夹重命名任务, 无需重命名时为空
+    error: str = ""  # 生成计划失败时的错误信息
+
+
+class WatchState(BaseModel):
+    """监视模式下文件夹的状态, 保存上次检查的文件列表及已获取的 TMDB 信息"""
+
+    entry: BatchEntry  # 重命名任务
+    folder_path: str  # 当前文件夹路径, 父文件夹重命名后更新
+    media_id: str = ""  # TMDB ID
+    info: dict = {}  # 剧集/电影信息
+    season_info: dict = {}  # 季度信息
+    names: set[str] = set()  # 上次检查的媒体文件名
+    renamed: int = 0  # 已重命名文件数量
@@ -1,3 +1,4 @@
+import asyncio
 from functools import wraps
 from typing import Any, Union, Callable
 from rich import box
@@ -5,10 +6,15 @@ from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 from rich.text import Text
-from .models import ApiResponseModel, RenameTask
+from .models import (
+    ApiResponseModel,
+    BatchResult,
+    FolderPlan,
+    RenameLike,
+    SeasonPlan,
+)
 from .utils import Tools
 
-
 console = Console()
 
 
@@ -106,33 +112,54 @@ class Output:
     """打印消息类"""
 
     @staticmethod
-    def output_alist_login(func) -> Callable[..., ApiResponseModel]:
+    def _wrap(
+        func, show: Callable[[ApiResponseModel, tuple, dict], None]
+    ) -> Callable[..., ApiResponseModel]:
         """
-        输出登录状态信息
+        生成输出请求结果的装饰器, 同时支持同步及异步函数
+
+        :param func: 被装饰的请求函数
+        :param show: 输出函数, 参数为请求结果及请求参数
         """
 
         @wraps(func)
-        def wrapper(self, *args, **kwargs) -> ApiResponseModel:
-            login_result: ApiResponseModel = func(self, *args, **kwargs)
+        async def async_wrapper(*args, **kwargs) -> ApiResponseModel:
+            return_data: ApiResponseModel = await func(*args, **kwargs)
+            show(return_data, args, kwargs)
+            return return_data
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs) -> ApiResponseModel:
+            return_data: ApiResponseModel = func(*args, **kwargs)
+            show(return_data, args, kwargs)
+            return return_data
+
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper  # type: ignore
+        else:
+            return sync_wrapper
 
+    @staticmethod
+    def output_alist_login(func) -> Callable[..., ApiResponseModel]:
+        """
+        输出登录状态信息
+        """
+
+        def show(login_result: ApiResponseModel, args: tuple, kwargs: dict):
             # 输出获取Token结果
             if login_result.success:
-                Message.success(f"主页: {self.url}")
+                Message.success(f"主页: {args[0].url}")
             else:
                 # Message.error(f"登录失败\t{login_result.error}")
-                Message.error(f"登录失败: {self.url}")
-            return login_result
+                Message.error(f"登录失败: {args[0].url}")
 
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_alist_file_list(func) -> Callable[..., ApiResponseModel]:
         """输出文件信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> ApiResponseModel:
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 输出结果
             if not return_data.success:
                 Message.error(
@@ -142,10 +169,7 @@ class Output:
                 #     f"获取文件列表失败: {Tools.get_argument(1, 'path', args, kwargs)}\n   {return_data.error}"
                 # )
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_alist_rename(func):
@@ -174,10 +198,7 @@ class Output:
     def output_alist_move(func) -> Callable[..., ApiResponseModel]:
         """输出文件移动信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> ApiResponseModel:
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 输出移动结果
             if not return_data.success:
                 # Message.error(
@@ -191,19 +212,13 @@ class Output:
                     f"移动路径: {Tools.get_argument(2, 'src_dir', args, kwargs)} -> {Tools.get_argument(3, 'dst_dir', args, kwargs)}"
                 )
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_alist_mkdir(func) -> Callable[..., ApiResponseModel]:
         """输出新建文件/文件夹信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> ApiResponseModel:
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 输出新建文件夹请求结果
             if not return_data.success:
                 # Message.error(
@@ -217,19 +232,13 @@ class Output:
                     f"文件夹创建路径: {Tools.get_argument(1, 'path', args, kwargs)}"
                 )
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_alist_remove(func) -> Callable[..., ApiResponseModel]:
         """输出文件/文件夹删除信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> ApiResponseModel:
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 输出删除文件/文件夹请求结果
             if not return_data.success:
                 # Message.error(
@@ -244,26 +253,20 @@ class Output:
                         f"删除路径: {Tools.get_argument(1, 'path', args, kwargs)}/{name}"
                     )
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_tmdb_tv_info(func) -> Callable[..., ApiResponseModel]:
         """输出剧集信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> ApiResponseModel:
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 请求失败则输出失败信息
             if not return_data.success:
                 # Message.error(
                 #     f"tv_id: {Tools.get_argument(1, 'tv_id', args, kwargs)}\n   {return_data.error}"
                 # )
                 Message.error(f"tv_id: {Tools.get_argument(1, 'tv_id', args, kwargs)}")
-                return return_data
+                return
 
             # 格式化输出请求结果
             first_air_year = return_data.data["first_air_date"][:4]
@@ -274,7 +277,7 @@ class Output:
             table = Table(box=box.SIMPLE)
             table.add_column("开播时间", justify="center", style="cyan")
             table.add_column("集数", justify="center", style="magenta")
-            table.add_column("序号", justify="center", style="green")
+            table.add_column("序号", justify="center", style="green", no_wrap=True)
             table.add_column("剧名", justify="left", no_wrap=True)
             # table.add_column(footer="共计: " + str(len(seasons)), style="grey53")
             for i, season in enumerate(seasons):
@@ -286,19 +289,13 @@ class Output:
                 )
             console.print(table)
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_tmdb_search_tv(func):
         """输出查找剧集信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 请求失败则输出失败信息
             if not return_data.success:
                 # Message.error(
@@ -307,12 +304,12 @@ class Output:
                 Message.error(
                     f"关键词: {Tools.get_argument(1, 'keyword', args, kwargs)}"
                 )
-                return return_data
+                return
 
             Message.success(f"关键词: {Tools.get_argument(1, 'keyword', args, kwargs)}")
             table = Table(box=box.SIMPLE)
             table.add_column("开播时间", justify="center", style="cyan")
-            table.add_column("序号", justify="center", style="green")
+            table.add_column("序号", justify="center", style="green", no_wrap=True)
             table.add_column("剧名", justify="left", no_wrap=True)
             # table.add_column(
             #     footer="共计: " + str(len(return_data["results"])), style="grey53"
@@ -321,19 +318,13 @@ class Output:
                 table.add_row(r["first_air_date"], str(i), r["name"])
             console.print(table)
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_tmdb_tv_season_info(func):
         """输出剧集季度信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 请求失败则输出失败信息
             if not return_data.success:
                 # Message.error(
@@ -343,18 +334,13 @@ class Output:
                     f"剧集id: {Tools.get_argument(1, 'tv_id', args, kwargs)}\t第 {Tools.get_argument(2, 'season_number', args, kwargs)} 季"
                 )
 
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_tmdb_movie_info(func):
         """输出电影信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 请求失败则输出失败信息
             if not return_data.success:
                 # Message.error(
@@ -363,7 +349,7 @@ class Output:
                 Message.error(
                     f"tv_id: {Tools.get_argument(1, 'movie_id', args, kwargs)}"
                 )
-                return return_data
+                return
 
             # 格式化输出请求结果
             Message.success(
@@ -374,19 +360,13 @@ class Output:
 
             console.print(f"[剧集简介] {return_data.data['overview']}")
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def output_tmdb_search_movie(func):
         """输出查找电影信息"""
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return_data: ApiResponseModel = func(*args, **kwargs)
-
+        def show(return_data: ApiResponseModel, args: tuple, kwargs: dict):
             # 请求失败则输出失败信息
             if not return_data.success:
                 # Message.error(
@@ -395,13 +375,13 @@ class Output:
                 Message.error(
                     f"Keyword: {Tools.get_argument(1, 'keyword', args, kwargs)}"
                 )
-                return return_data
+                return
 
             Message.success(f"关键词: {Tools.get_argument(1, 'keyword', args, kwargs)}")
 
             table = Table(box=box.SIMPLE)
             table.add_column("首播时间", justify="center", style="cyan")
-            table.add_column("序号", justify="center", style="green")
+            table.add_column("序号", justify="center", style="green", no_wrap=True)
             table.add_column("电影标题", justify="left", no_wrap=True)
             # table.add_column(
             #     footer="共计: " + str(len(return_data["results"])), style="grey53"
@@ -410,15 +390,12 @@ class Output:
                 table.add_row(r["release_date"], str(i), r["title"])
             console.print(table)
 
-            # 返回请求结果
-            return return_data
-
-        return wrapper
+        return Output._wrap(func, show)
 
     @staticmethod
     def print_rename_info(
-        video_rename_list: list[RenameTask],
-        subtitle_rename_list: list[RenameTask],
+        video_rename_list: list[RenameLike],
+        subtitle_rename_list: list[RenameLike],
         folder_rename: bool,
         renamed_folder_title: Union[str, None],
         folder_path: str,
@@ -455,6 +432,42 @@ class Output:
                 f"文件夹重命名: [grey53]{folder_path.split('/')[-2]}[/grey53] [grey70]->[/grey70] {renamed_folder_title}"
             )
 
+    @staticmethod
+    def print_show_rename_info(
+        plans: list[SeasonPlan],
+        folder_rename: bool,
+        renamed_folder_title: Union[str, None],
+        folder_path: str,
+    ):
+        """打印整部剧集重命名信息"""
+
+        video_count = sum(len(plan.video) for plan in plans)
+        subtitle_count = sum(len(plan.subtitle) for plan in plans)
+        Message.info(
+            f"以下文件将会重命名: 共 {len(plans)} 季, 视频 {video_count}, 字幕 {subtitle_count}"
+        )
+        table = Table(box=box.SIMPLE)
+        table.add_column("季度", justify="center", style="green", no_wrap=True)
+        table.add_column("文件夹", justify="left", style="grey53", no_wrap=True)
+        table.add_column("原文件名", justify="left", style="grey53", no_wrap=True)
+        table.add_column(" ", justify="left", style="grey70")
+        table.add_column("目标文件名", justify="left", no_wrap=True)
+        for plan in plans:
+            folder_name = plan.folder_path.split("/")[-2]
+            for item in plan.video + plan.subtitle:
+                table.add_row(
+                    f"S{plan.season:0>2}",
+                    folder_name,
+                    Message.text_regex(item.original_name),
+                    "->",
+                    Message.text_regex(item.target_name),
+                )
+        console.print(table)
+        if folder_rename:
+            Message.info(
+                f"文件夹重命名: [grey53]{folder_path.split('/')[-2]}[/grey53] [grey70]->[/grey70] {renamed_folder_title}"
+            )
+
     @staticmethod
     def require_confirmation() -> bool:
         """确认操作"""
@@ -497,8 +510,10 @@ class Output:
         video_count: int,
         subtitle_count: int,
         folder_count: int,
+        retry_count: int = 0,
+        job: str = "",
     ):
-        """打印重命名结果"""
+        """打印重命名结果, job 为重命名记录任务名称"""
 
         video_error_count = 0
         subtitle_error_count = 0
@@ -558,5 +573,133 @@ class Output:
         elif folder_error_count == 0 and folder_count > 0:
             Message.success(f"父文件夹: 成功 [green]{folder_count}[/green]")
 
+        if retry_count > 0:
+            Message.info(f"请求重试: [yellow]{retry_count}[/yellow] 次")
+        if job:
+            Message.info(f"重命名记录: [cyan]{job}[/cyan]")
+
         # 程序运行结束
         Message.congratulation("重命名完成")
+
+    @staticmethod
+    def print_batch_summary(results: list[BatchResult]):
+        """打印批量重命名结果"""
+
+        table = Table(box=box.SIMPLE, title="批量重命名结果")
+        table.add_column("序号", justify="center", style="green", no_wrap=True)
+        table.add_column("类型", justify="center", no_wrap=True)
+        table.add_column("关键词/ID", justify="left", no_wrap=True)
+        table.add_column("文件夹", justify="left", style="grey53", no_wrap=True)
+        table.add_column("标题", justify="left", no_wrap=True)
+        table.add_column("视频", justify="right", style="cyan", no_wrap=True)
+        table.add_column("字幕", justify="right", style="cyan", no_wrap=True)
+        table.add_column("失败", justify="right", style="red", no_wrap=True)
+        table.add_column("重试", justify="right", style="yellow", no_wrap=True)
+        table.add_column("错误信息", justify="left")
+        for i, result in enumerate(results, 1):
+            entry = result.entry
+            table.add_row(
+                str(i),
+                "电影" if entry.type == "movie" else f"剧集 S{entry.season:0>2}",
+                entry.tmdb_id or entry.keyword,
+                entry.dir,
+                result.title,
+                str(result.video_count),
+                str(result.subtitle_count),
+                str(result.error_count),
+                str(result.retry_count),
+                result.error,
+            )
+        console.print(table)
+
+        failed = sum(not result.success for result in results)
+        retry_count = sum(result.retry_count for result in results)
+        if retry_count > 0:
+            Message.info(f"请求重试: [yellow]{retry_count}[/yellow] 次")
+        if failed > 0:
+            Message.error(
+                f"任务: 成功 [green]{len(results) - failed}[/green], 失败 [red]{failed}[/red]"
+            )
+        else:
+            Message.success(f"任务: 成功 [green]{len(results)}[/green]")
+            Message.congratulation("批量重命名完成")
+
+    @staticmethod
+    def print_plan_summary(plans: list[FolderPlan]):
+        """打印重命名计划"""
+
+        table = Table(box=box.SIMPLE, title="重命名计划")
+        table.add_column("序号", justify="center", style="green", no_wrap=True)
+        table.add_column("类型", justify="center", no_wrap=True)
+        table.add_column("关键词/ID", justify="left", no_wrap=True)
+        table.add_column("文件夹", justify="left", style="grey53", no_wrap=True)
+        table.add_column("标题", justify="left", no_wrap=True)
+        table.add_column("视频", justify="right", style="cyan", no_wrap=True)
+        table.add_column("字幕", justify="right", style="cyan", no_wrap=True)
+        table.add_column("错误信息", justify="left", style="red")
+        for i, plan in enumerate(plans, 1):
+            entry = plan.entry
+            table.add_row(
+                str(i),
+                "电影" if entry.type == "movie" else f"剧集 S{entry.season:0>2}",
+                entry.tmdb_id or entry.keyword,
+                entry.dir,
+                plan.title + (" (重命名)" if plan.folder else ""),
+                str(len(plan.video)),
+                str(len(plan.subtitle)),
+                plan.error,
+            )
+        console.print(table)
+
+        failed = sum(bool(plan.error) for plan in plans)
+        count = sum(
+            len(plan.video) + len(plan.subtitle) + len(plan.folder) for plan in plans
+        )
+        Message.info(f"重命名任务: [cyan]{count}[/cyan] 项")
+        if failed > 0:
+            Message.error(
+                f"计划: 成功 [green]{len(plans) - failed}[/green], 失败 [red]{failed}[/red]"
+            )
+        else:
+            Message.success(f"计划: 成功 [green]{len(plans)}[/green]")
+
+    @staticmethod
+    def print_profile(report: dict):
+        """打印性能分析结果"""
+
+        wall = report["wall"] or 1
+        table = Table(box=box.SIMPLE, title="性能分析")
+        table.add_column("阶段", justify="left", style="green", no_wrap=True)
+        table.add_column("次数", justify="right", no_wrap=True)
+        table.add_column("耗时", justify="right", style="cyan", no_wrap=True)
+        table.add_column("占比", justify="right", no_wrap=True)
+        table.add_column("CPU", justify="right", no_wrap=True)
+        table.add_column("内存峰值", justify="right", style="yellow", no_wrap=True)
+        for stage in report["stages"]:
+            table.add_row(
+                stage["name"],
+                str(stage["calls"]),
+                f"{stage['wall'] * 1000:.1f}ms",
+                f"{stage['wall'] / wall:.0%}",
+                f"{stage['cpu'] * 1000:.1f}ms",
+                f"{stage['peak_memory'] / 2**20:.2f}MB",
+            )
+        console.print(table)
+        Message.info(
+            f"总耗时: [cyan]{report['wall']:.3f}[/cyan] 秒, 内存峰值: [yellow]{report['peak_memory'] / 2**20:.2f}[/yellow] MB"
+        )
+
+        if report["functions"]:
+            table = Table(box=box.SIMPLE, title="累计耗时最长的函数")
+            table.add_column("函数", justify="left", overflow="fold")
+            table.add_column("调用", justify="right", no_wrap=True)
+            table.add_column("自身耗时", justify="right", no_wrap=True)
+            table.add_column("累计耗时", justify="right", style="cyan", no_wrap=True)
+            for row in report["functions"]:
+                table.add_row(
+                    row["function"],
+                    str(row["calls"]),
+                    f"{row['tottime'] * 1000:.1f}ms",
+                    f"{row['cumtime'] * 1000:.1f}ms",
+                )
+            console.print(table)
@@ -0,0 +1,57 @@
+import os
+
+from pydantic import ValidationError
+
+from .models import FolderPlan
+
+
+class PlanFile:
+    """
+    重命名计划文件
+    JSONL 格式, 每行为一个文件夹的重命名计划, 包含重命名任务、父文件夹重命名任务及文件列表指纹
+    """
+
+    @staticmethod
+    def dump(filepath: str, plans: list[FolderPlan]):
+        """
+        保存重命名计划, 先写入临时文件再替换, 生成失败的计划不保存.
+        文件夹访问密码不写入计划文件, 执行时由调用方提供
+
+        :param filepath: 重命名计划文件路径
+        :param plans: 重命名计划列表
+        """
+
+        dirpath = os.path.dirname(filepath)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for plan in plans:
+                if not plan.error:
+                    f.write(
+                        plan.model_dump_json(
+                            exclude_defaults=True, exclude={"entry": {"password"}}
+                        )
+                        + "\n"
+                    )
+        os.replace(tmp_path, filepath)
+
+    @staticmethod
+    def load(filepath: str) -> list[FolderPlan]:
+        """
+        读取重命名计划.
+
+        :param filepath: 重命名计划文件路径
+        :return: 重命名计划列表
+        """
+
+        plans = []
+        with open(filepath, "r", encoding="utf-8") as f:
+            for i, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    plans.append(FolderPlan.model_validate_json(line))
+                except ValidationError as e:
+                    raise ValueError(f"重命名计划第 {i} 行格式错误: {e}") from e
+        return plans
@@ -0,0 +1,164 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .models import StageStat
+
+
+class Profiler:
+    """
+    重命名流程性能分析
+    按阶段(获取文件列表, 查找 TMDB 信息, 匹配, 输出预览, 重命名等)记录耗时、CPU 时间及内存峰值,
+    可选使用 cProfile 记录函数调用耗时. 阶段可以嵌套, 内层阶段的内存峰值同时计入外层阶段
+    """
+
+    def __init__(self, memory: bool = True, cpu_profile: bool = False):
+        """
+        初始化参数
+
+        :param memory: 是否使用 tracemalloc 记录内存峰值, 会使程序运行变慢
+        :param cpu_profile: 是否使用 cProfile 记录函数调用耗时
+        """
+
+        self.memory = memory
+        self.stages: dict[str, StageStat] = {}
+        self.cprofile = cProfile.Profile() if cpu_profile else None
+
+        self._start: Optional[float] = None
+        self._wall = 0.0
+        self._peak = 0
+        # 进行中的阶段内存峰值, 内层阶段重置峰值前先计入外层阶段
+        self._frames: list[list[int]] = []
+        self._tracing = False
+
+    def start(self):
+        """开始记录"""
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        if self.cprofile:
+            self.cprofile.enable()
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """停止记录"""
+
+        if self._start is not None:
+            self._wall += time.perf_counter() - self._start
+            self._start = None
+        if self.cprofile:
+            self.cprofile.disable()
+        if tracemalloc.is_tracing():
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        记录阶段耗时及内存峰值
+
+        :param name: 阶段名称, 同名阶段累计
+        """
+
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            for frame in self._frames:
+                frame[1] = max(frame[1], peak)
+            self._peak = max(self._peak, peak)
+            tracemalloc.reset_peak()
+            frame = [current, current]
+            self._frames.append(frame)
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            peak_memory = 0
+            if tracing:
+                self._frames.pop()
+                peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                for outer in self._frames:
+                    outer[1] = max(outer[1], peak)
+                self._peak = max(self._peak, peak)
+                peak_memory = peak - frame[0]
+
+            stat = self.stages.get(name)
+            if stat is None:
+                self.stages[name] = StageStat(name, 1, wall, cpu, peak_memory)
+            else:
+                self.stages[name] = stat._replace(
+                    calls=stat.calls + 1,
+                    wall=stat.wall + wall,
+                    cpu=stat.cpu + cpu,
+                    peak_memory=max(stat.peak_memory, peak_memory),
+                )
+
+    def functions(self, limit: int = 20) -> list[dict]:
+        """
+        cProfile 记录中累计耗时最长的函数
+
+        :param limit: 返回数量
+        """
+
+        if not self.cprofile:
+            return []
+        stats = pstats.Stats(self.cprofile, stream=io.StringIO())
+        rows = []
+        for (file, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():  # type: ignore[attr-defined]
+            rows.append(
+                {
+                    "function": f"{file}:{line}({func})",
+                    "calls": calls,
+                    "tottime": tottime,
+                    "cumtime": cumtime,
+                }
+            )
+        rows.sort(key=lambda row: row["cumtime"], reverse=True)
+        return rows[:limit]
+
+    def report(self) -> dict:
+        """
+        性能分析结果
+
+        :return: 总耗时、内存峰值、各阶段统计及耗时最长的函数
+        """
+
+        wall = self._wall
+        if self._start is not None:
+            wall += time.perf_counter() - self._start
+        return {
+            "wall": wall,
+            "peak_memory": self._peak,
+            "stages": [stat._asdict() for stat in self.stages.values()],
+            "functions": self.functions(),
+        }
+
+    def dump(self, path: str):
+        """
+        以 JSON 格式保存性能分析结果, 使用 cProfile 时同时保存 pstats 文件(路径加 .prof 后缀)
+
+        :param path: 文件路径
+        """
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        if self.cprofile:
+            self.cprofile.dump_stats(path + ".prof")
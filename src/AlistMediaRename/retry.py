@@ -0,0 +1,187 @@
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from .metrics import metrics
+
+# 当前任务的请求重试次数, 设置后同一上下文中的重试均计入该计数
+retry_counter: ContextVar[Optional[list[int]]] = ContextVar(
+    "retry_counter", default=None
+)
+
+
+class RetryPolicy:
+    """
+    请求重试策略
+    请求出现网络错误或返回可重试的状态码时, 按指数退避并加入随机抖动后重试,
+    响应包含 Retry-After 时按其指定时间等待.
+    非幂等请求(如重命名)仅在请求未发出(连接失败)或服务端明确拒绝(429/503)时重试, 避免重复执行.
+    Alist 后端出错时 HTTP 状态码仍为 200, 错误码在响应体 code 字段中,
+    幂等请求可选择同时按响应体错误码判断是否重试
+    """
+
+    # 幂等请求可重试的状态码
+    retry_status = {408, 425, 429, 500, 502, 503, 504}
+    # 非幂等请求可重试的状态码, 服务端未处理请求
+    retry_status_write = {429, 503}
+    # 响应体错误信息包含以下内容时为确定的错误, 重试无效
+    permanent_messages = ("not found",)
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        idempotent: bool = True,
+    ):
+        """
+        初始化参数
+
+        :param max_retries: 最大重试次数, 0 为不重试
+        :param backoff: 首次重试等待时间(秒), 之后每次翻倍
+        :param max_backoff: 最大等待时间(秒), 同时限制 Retry-After 等待时间
+        :param idempotent: 请求是否幂等, 可重复执行
+        """
+
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idempotent = idempotent
+        # 已重试次数
+        self.retries = 0
+
+    def retryable(
+        self,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+        body_code: bool = False,
+    ) -> bool:
+        """
+        判断请求是否可以重试
+
+        :param response: 请求响应
+        :param error: 请求异常
+        :param body_code: 是否按响应体中的错误码判断, 仅对幂等请求生效
+        :return: 是否可以重试
+        """
+
+        if error is not None:
+            if self.idempotent:
+                return isinstance(error, httpx.TransportError)
+            # 非幂等请求仅在请求未发出时重试
+            return isinstance(
+                error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+            )
+        if response is None:
+            return False
+        status = self.retry_status if self.idempotent else self.retry_status_write
+        if response.status_code in status:
+            return True
+        if not (body_code and self.idempotent and response.status_code == 200):
+            return False
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+        if not isinstance(data, dict) or data.get("code") not in self.retry_status:
+            return False
+        message = str(data.get("message", "")).lower()
+        return not any(m in message for m in self.permanent_messages)
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        计算第 attempt 次重试前的等待时间
+
+        :param attempt: 重试次数, 从 0 开始
+        :param response: 请求响应, 包含 Retry-After 时优先使用
+        :return: 等待时间(秒)
+        """
+
+        retry_after = self.retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(self.max_backoff, retry_after)
+        # 等待时间在 [backoff/2, backoff] 之间随机, 避免并发请求同时重试
+        backoff = min(self.max_backoff, self.backoff * 2**attempt)
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    @staticmethod
+    def retry_after(response: httpx.Response) -> Optional[float]:
+        """解析 Retry-After 响应头, 支持秒数及 HTTP 日期格式"""
+
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _record(self):
+        """记录重试次数"""
+
+        self.retries += 1
+        metrics.inc("amr_retries", kind="read" if self.idempotent else "write")
+        counter = retry_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+    def send(
+        self, request: Callable[[], httpx.Response], body_code: bool = False
+    ) -> httpx.Response:
+        """
+        发送请求, 失败时按策略重试
+
+        :param request: 发送请求的函数
+        :param body_code: 是否按响应体中的错误码判断是否重试, 用于 Alist 幂等请求
+        :return: 请求响应, 重试次数用尽时返回最后一次响应或抛出最后一次异常
+        """
+
+        attempt = 0
+        while True:
+            try:
+                response = request()
+            except Exception as e:
+                if attempt >= self.max_retries or not self.retryable(error=e):
+                    raise
+                time.sleep(self.delay(attempt))
+            else:
+                if attempt >= self.max_retries or not self.retryable(
+                    response, body_code=body_code
+                ):
+                    return response
+                time.sleep(self.delay(attempt, response))
+            attempt += 1
+            self._record()
+
+    async def send_async(
+        self, request: Callable[[], Awaitable[httpx.Response]], body_code: bool = False
+    ) -> httpx.Response:
+        """
+        异步发送请求, 失败时按策略重试, 参数参考 send
+        """
+
+        attempt = 0
+        while True:
+            try:
+                response = await request()
+            except Exception as e:
+                if attempt >= self.max_retries or not self.retryable(error=e):
+                    raise
+                await asyncio.sleep(self.delay(attempt))
+            else:
+                if attempt >= self.max_retries or not self.retryable(
+                    response, body_code=body_code
+                ):
+                    return response
+                await asyncio.sleep(self.delay(attempt, response))
+            attempt += 1
+            self._record()
@@ -0,0 +1,217 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, ClassVar, Optional
+
+from .models import ApiResponseModel
+
+
+class AdaptiveLimiter:
+    """
+    异步请求并发控制器
+    限制同时进行的请求数量; 自适应模式下采用 AIMD 策略,
+    请求成功且延迟正常时逐步增加并发数, 出现错误或延迟突增时并发数减半
+    """
+
+    # 延迟超过平均延迟的倍数时视为延迟突增
+    spike_factor = 3.0
+    # 平均延迟的平滑系数
+    ewma_alpha = 0.2
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        adaptive: bool = True,
+        min_concurrency: int = 1,
+    ):
+        """
+        初始化参数
+
+        :param max_concurrency: 最大并发数
+        :param adaptive: 是否根据请求结果自动调整并发数
+        :param min_concurrency: 自适应模式下的最小并发数
+        """
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.adaptive = adaptive
+        # 当前并发上限, 自适应模式下从最大并发数的一半开始
+        self.limit: float = (
+            max(self.min_concurrency, self.max_concurrency / 2)
+            if adaptive
+            else self.max_concurrency
+        )
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+
+        self._last_decrease = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _condition(self) -> asyncio.Condition:
+        """获取当前事件循环对应的条件变量"""
+
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._cond
+
+    def _available(self) -> int:
+        return int(self.limit) - self.in_flight
+
+    def _update(self, success: bool, latency: float):
+        """根据请求结果调整并发上限"""
+
+        spike = self.latency is not None and latency > self.latency * self.spike_factor
+        self.latency = (
+            latency
+            if self.latency is None
+            else self.latency * (1 - self.ewma_alpha) + latency * self.ewma_alpha
+        )
+        if not self.adaptive:
+            return
+
+        now = time.monotonic()
+        if not success or spike:
+            # 同一批并发请求中只减小一次并发数
+            if now - self._last_decrease > self.latency:
+                self._last_decrease = now
+                self.limit = max(self.min_concurrency, self.limit / 2)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    async def acquire(self):
+        """等待可用的请求名额"""
+
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._available() > 0)
+            self.in_flight += 1
+
+    async def release(self, success: bool = True, latency: float = 0.0):
+        """释放请求名额, 并记录请求结果"""
+
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            self._update(success, latency)
+            cond.notify(max(0, self._available()))
+
+    async def run(
+        self, func: Callable[..., Awaitable[ApiResponseModel]], *args: Any, **kwargs: Any
+    ) -> ApiResponseModel:
+        """
+        在并发限制下执行异步请求.
+
+        :param func: 返回 ApiResponseModel 的异步函数
+        :return: 请求结果
+        """
+
+        await self.acquire()
+        start = time.monotonic()
+        success = False
+        try:
+            result = await func(*args, **kwargs)
+            success = result.success
+            return result
+        finally:
+            await self.release(success, time.monotonic() - start)
+
+
+class RateLimiter:
+    """
+    令牌桶请求速率控制器
+    每秒补充 rate 个令牌, 最多积累 burst 个, 每个请求消耗一个令牌, 令牌不足时等待.
+    请求在线程锁内预约令牌并按预约顺序等待, 同一进程中的多个线程及事件循环可共享同一实例
+    """
+
+    # 进程内共享的速率控制器
+    _shared: ClassVar[dict[str, "RateLimiter"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, rate: float = 0, burst: int = 1):
+        """
+        初始化参数
+
+        :param rate: 每秒请求数, 0 为不限制
+        :param burst: 最大突发请求数
+        """
+
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens: float = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.requests = 0
+        self.wait_count = 0
+        self.wait_time = 0.0
+
+    @classmethod
+    def shared(cls, key: str, rate: float = 0, burst: int = 1) -> "RateLimiter":
+        """
+        获取进程内共享的速率控制器, 参数变化时更新速率及突发请求数
+
+        :param key: 共享名称, 如 API 地址
+        :param rate: 每秒请求数, 0 为不限制
+        :param burst: 最大突发请求数
+        :return: 速率控制器
+        """
+
+        with cls._shared_lock:
+            limiter = cls._shared.get(key)
+            if limiter is None:
+                limiter = cls._shared[key] = cls(rate, burst)
+            else:
+                with limiter._lock:
+                    limiter.rate = rate
+                    limiter.burst = max(1, burst)
+            return limiter
+
+    def _reserve(self) -> float:
+        """预约一个令牌, 返回需要等待的时间(秒)"""
+
+        with self._lock:
+            self.requests += 1
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # 令牌不足时预支, 之后的请求按顺序等待更长时间
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.rate
+            self.wait_count += 1
+            self.wait_time += delay
+            return delay
+
+    def acquire(self):
+        """等待可用令牌"""
+
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """在事件循环中等待可用令牌, 不阻塞其他任务"""
+
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        """请求数、等待次数及等待总时间(秒)"""
+
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "wait_count": self.wait_count,
+                "wait_time": self.wait_time,
+            }
@@ -0,0 +1,85 @@
+import base64
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+class TokenStore:
+    """
+    Alist 登录 Token 本地存储
+    按 Alist 地址及用户名区分保存, 记录过期时间, 文件仅当前用户可读写
+    """
+
+    # Token 无法解析过期时间时的默认有效期(秒), 与 Alist 默认配置一致
+    default_expires_in = 48 * 3600
+    # 提前判定过期的时间(秒), 避免使用即将过期的 Token
+    expires_margin = 300
+
+    def __init__(self, filepath: str):
+        """
+        初始化参数
+
+        :param filepath: Token 保存文件路径
+        """
+
+        self.filepath = filepath
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, user: str) -> str:
+        return f"{url.rstrip('/')}|{user}"
+
+    @staticmethod
+    def token_expires(token: str) -> float:
+        """解析 JWT Token 中的过期时间, 解析失败则返回默认有效期"""
+
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+        except Exception:
+            return time.time() + TokenStore.default_expires_in
+
+    def _read(self) -> dict:
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: dict):
+        tmp_path = self.filepath + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.filepath)
+
+    def get(self, url: str, user: str) -> Optional[str]:
+        """获取未过期的 Token, 不存在或已过期返回 None"""
+
+        with self._lock:
+            record = self._read().get(self._key(url, user))
+        if not record or record["expires"] - self.expires_margin < time.time():
+            return None
+        return record["token"]
+
+    def set(self, url: str, user: str, token: str):
+        """保存 Token"""
+
+        with self._lock:
+            data = self._read()
+            data[self._key(url, user)] = {
+                "token": token,
+                "expires": self.token_expires(token),
+            }
+            self._write(data)
+
+    def remove(self, url: str, user: str):
+        """删除 Token"""
+
+        with self._lock:
+            data = self._read()
+            if data.pop(self._key(url, user), None) is not None:
+                self._write(data)
@@ -1,7 +1,8 @@
 import re
-from typing import Union
+from collections import deque
+from typing import Optional, Union
 from natsort import natsorted
-from .models import RenameTask
+from .models import RenameItem, RenameTask
 
 
 class Tools:
@@ -77,55 +78,162 @@ class Tools:
         exclude_renamed: bool,
         first_number: str = "1",
     ) -> list[RenameTask]:
-        """匹配文件"""
+        """匹配文件, 参数参考 match_episode_items"""
+
+        return [
+            item.to_task()
+            for item in Tools.match_episode_items(
+                original_list, target_list, folder_path, exclude_renamed, first_number
+            )
+        ]
+
+    @staticmethod
+    def match_episode_items(
+        original_list: list[str],
+        target_list: list[str],
+        folder_path: str,
+        exclude_renamed: bool,
+        first_number: str = "1",
+    ) -> list[RenameItem]:
+        """
+        匹配文件, 优先匹配已重命名的文件, 其余文件按顺序匹配指定集数
+
+        :param original_list: 原始文件名列表
+        :param target_list: 目标文件名列表(不含后缀)
+        :param folder_path: 文件夹路径
+        :param exclude_renamed: 是否排除已重命名的文件
+        :param first_number: 需要重命名的集数, 如 1-, 1,3-5
+        :return: 重命名任务列表
+        """
 
         # 创建重命名列表
-        rename_list_no_filter: list[RenameTask] = []
+        rename_list_no_filter: list[RenameItem] = []
         # 创建排除已重命名的列表
-        rename_list_filter: list[RenameTask] = []
+        rename_list_filter: list[RenameItem] = []
 
         # 创建hash表和队列
-        rename_list: list[RenameTask] = [RenameTask()] * len(target_list)
+        renamed: list[Optional[RenameItem]] = [None] * len(target_list)
         target_dict: dict[str, int] = {item: i for i, item in enumerate(target_list)}
-        queue = []
+        queue: deque[str] = deque()
 
         # 优先匹配已重命名的文件
-        for i, item in enumerate(original_list):
-            if item.rsplit(".", 1)[0] in target_list:
-                rename_list[target_dict[item.rsplit(".", 1)[0]]] = RenameTask(
-                    original_name=item, target_name=item, folder_path=folder_path
-                )
+        for item in original_list:
+            index = target_dict.get(item.rsplit(".", 1)[0])
+            if index is not None:
+                renamed[index] = RenameItem(item, item, folder_path)
             else:
                 queue.append(item)
 
-        # 匹配未重命名的文件
-        for i in range(len(target_list)):
-            if rename_list[i] != RenameTask():
-                rename_list_no_filter.append(rename_list[i])
-            if (
-                rename_list[i] == RenameTask()
-                and len(queue) > 0
-                and i + 1 in Tools.parse_page_ranges(first_number, len(target_list))
-            ):
-                original_name: str = queue.pop(0)
-                target_name = target_list[i] + "." + original_name.rsplit(".", 1)[1]
-                rename_list_no_filter.append(
-                    RenameTask(
-                        original_name=original_name,
-                        target_name=target_name,
-                        folder_path=folder_path,
-                    )
-                )
-                rename_list_filter.append(
-                    RenameTask(
-                        original_name=original_name,
-                        target_name=target_name,
-                        folder_path=folder_path,
-                    )
+        # 匹配未重命名的文件, 需要重命名的集数仅在使用时解析一次
+        numbers: Optional[set[int]] = None
+        for i, task in enumerate(renamed):
+            if task is not None:
+                rename_list_no_filter.append(task)
+                continue
+            if not queue:
+                continue
+            if numbers is None:
+                numbers = set(Tools.parse_page_ranges(first_number, len(target_list)))
+            if i + 1 in numbers:
+                original_name: str = queue.popleft()
+                task = RenameItem(
+                    original_name,
+                    target_list[i] + "." + original_name.rsplit(".", 1)[1],
+                    folder_path,
                 )
+                rename_list_no_filter.append(task)
+                rename_list_filter.append(task)
 
         return rename_list_filter if exclude_renamed else rename_list_no_filter
 
+    # 季度文件夹名称, 如 Season 1, S01, 第1季, 第一季
+    _season_patterns = [
+        re.compile(r"(?i)\b(?:season|s)[\s._-]*(\d{1,3})\b"),
+        re.compile(r"第\s*([0-9一二三四五六七八九十]+)\s*[季部]"),
+    ]
+    # 特别篇文件夹名称, 对应 TMDB 第 0 季
+    _specials_pattern = re.compile(r"(?i)^(?:specials?|sp|特别篇)$")
+
+    # 文件名中的集数, 按顺序匹配: S01E02, 第2集, EP02, " - 02"
+    _episode_patterns = [
+        re.compile(r"(?i)\bs\d{1,3}[\s._-]*e(\d{1,4})\b"),
+        re.compile(r"第\s*(\d{1,4})\s*[集话話]"),
+        re.compile(r"(?i)\b(?:ep?|episode)[\s._-]*(\d{1,4})\b"),
+        re.compile(r"\s-\s(\d{1,6})(?:v\d)?(?=[\s.\[(]|$)"),
+    ]
+
+    @staticmethod
+    def parse_episode_number(filename: str) -> Optional[int]:
+        """
+        从文件名中解析集数
+
+        :param filename: 文件名, 如 Show S01E02.mkv, [Group] Show - 02 [1080p].mkv
+        :return: 集数, 无法解析(如预告片、特典)时返回 None
+        """
+
+        for pattern in Tools._episode_patterns:
+            match = pattern.search(filename)
+            if match is not None:
+                return int(match.group(1))
+        return None
+
+    @staticmethod
+    def parse_season_number(folder_name: str) -> Optional[int]:
+        """
+        从季度文件夹名称中解析季度
+
+        :param folder_name: 文件夹名称, 如 Season 1, S01, 第1季, 第一季, Specials
+        :return: 季度, 无法解析时返回 None
+        """
+
+        if Tools._specials_pattern.match(folder_name.strip()):
+            return 0
+        for pattern in Tools._season_patterns:
+            match = pattern.search(folder_name)
+            if match is None:
+                continue
+            number = match.group(1)
+            if number.isdigit():
+                return int(number)
+            # 中文数字, 支持 一 至 九十九
+            digits = "一二三四五六七八九"
+            tens, _, ones = number.rpartition("十")
+            if "十" not in number:
+                tens, ones = "", number
+            elif not tens:
+                tens = "一"
+            if len(tens) > 1 or len(ones) > 1:
+                return None
+            return (digits.index(tens) + 1 if tens else 0) * 10 + (
+                digits.index(ones) + 1 if ones else 0
+            )
+        return None
+
+    @staticmethod
+    def map_season_folders(
+        folders: list[str], season_numbers: list[int]
+    ) -> list[tuple[int, str]]:
+        """
+        匹配季度文件夹与 TMDB 季度.
+        优先按文件夹名称匹配, 所有文件夹名称均无法解析时, 按文件夹顺序(自然排序)依次对应第 1 季起的季度
+
+        :param folders: 季度文件夹名称列表
+        :param season_numbers: TMDB 季度列表
+        :return: 季度及对应文件夹名称, 按季度排序, 不包含 TMDB 不存在的季度
+        """
+
+        parsed = {name: Tools.parse_season_number(name) for name in folders}
+        if any(number is not None for number in parsed.values()):
+            mapping: dict[int, str] = {}
+            for name in natsorted(folders):
+                number = parsed[name]
+                if number in season_numbers and number not in mapping:
+                    mapping[number] = name
+            return sorted(mapping.items())
+
+        regular = sorted(number for number in season_numbers if number > 0)
+        return list(zip(regular, natsorted(folders)))
+
     @staticmethod
     def get_argument(
         arg_index: int, kwarg_name: str, args: Union[list, tuple], kwargs: dict
@@ -0,0 +1,173 @@
+import asyncio
+import fnmatch
+from typing import AsyncIterator, Iterator, Optional
+
+from .api import AlistApi
+from .log import ApiResponseError
+from .models import AlistEntry, ApiResponseModel
+from .utils import Tools
+
+
+class AlistWalker:
+    """
+    Alist 文件夹遍历
+    按广度优先顺序遍历文件夹, 同时进行多个获取文件列表请求, 获取到的文件信息逐项返回
+    """
+
+    def __init__(
+        self,
+        alist: AlistApi,
+        max_concurrency: int = 8,
+        max_depth: Optional[int] = None,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        passwords: Optional[dict[str, str]] = None,
+        refresh: bool = False,
+        per_page: int = 1000,
+        page_concurrency: int = 4,
+    ):
+        """
+        初始化参数
+
+        :param alist: AlistApi
+        :param max_concurrency: 同时获取文件列表的最大请求数
+        :param max_depth: 最大遍历层级, 1 为只获取起始文件夹, 默认不限制
+        :param include: 文件匹配规则(glob), 只返回匹配文件名或路径的文件, 不影响文件夹
+        :param exclude: 排除规则(glob), 匹配的文件及文件夹均不返回, 且不遍历匹配的文件夹
+        :param passwords: 文件夹访问密码, 键为文件夹路径, 子文件夹使用最近上级文件夹的密码
+        :param refresh: 是否强制刷新文件夹
+        :param per_page: 获取文件列表时每页文件数量, 为0时一次获取全部
+        :param page_concurrency: 单个文件夹同时请求的最大页面数
+        """
+
+        self.alist = alist
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_depth = max_depth
+        self.include = include or []
+        self.exclude = exclude or []
+        self.passwords = {
+            Tools.ensure_slash(path): password
+            for path, password in (passwords or {}).items()
+        }
+        self.refresh = refresh
+        self.per_page = per_page
+        self.page_concurrency = page_concurrency
+        # 获取失败的文件夹请求结果
+        self.errors: list[ApiResponseModel] = []
+
+    @staticmethod
+    def _match(entry: AlistEntry, patterns: list[str]) -> bool:
+        """文件名或完整路径是否匹配任一规则"""
+
+        return any(
+            fnmatch.fnmatchcase(entry.name, pattern)
+            or fnmatch.fnmatchcase(entry.path, pattern)
+            for pattern in patterns
+        )
+
+    def password(self, folder_path: str) -> Optional[str]:
+        """获取文件夹访问密码, 未设置时使用最近上级文件夹的密码"""
+
+        path = folder_path
+        while True:
+            if path in self.passwords:
+                return self.passwords[path]
+            if path == "/":
+                return None
+            path = Tools.get_parent_path(path)
+
+    async def _list(self, folder_path: str, depth: int) -> list[AlistEntry]:
+        """
+        分页获取单个文件夹的文件信息, 获取失败时记录错误, 返回已获取到的文件信息
+        """
+
+        entries = []
+        try:
+            async for item in self.alist.iter_file_list_async(
+                folder_path,
+                self.password(folder_path),
+                self.refresh,
+                self.per_page,
+                self.page_concurrency,
+            ):
+                entries.append(
+                    AlistEntry(
+                        folder_path=folder_path,
+                        name=item["name"],
+                        is_dir=item.get("is_dir", False),
+                        size=item.get("size") or 0,
+                        modified=item.get("modified") or "",
+                        depth=depth,
+                    )
+                )
+        except ApiResponseError as e:
+            if e.result is None:
+                raise
+            self.errors.append(e.result)
+        return entries
+
+    async def walk_async(self, root: str = "/") -> AsyncIterator[AlistEntry]:
+        """
+        异步遍历文件夹, 获取到文件列表后立即返回其中的文件及文件夹.
+
+        :param root: 起始文件夹路径
+        :return: 文件信息异步迭代器
+        """
+
+        root = Tools.ensure_slash(root)
+        folders: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+        entries: asyncio.Queue[Optional[AlistEntry]] = asyncio.Queue(
+            maxsize=self.max_concurrency * 1000
+        )
+        folders.put_nowait((root, 1))
+
+        async def worker():
+            while True:
+                folder_path, depth = await folders.get()
+                try:
+                    for entry in await self._list(folder_path, depth):
+                        if self._match(entry, self.exclude):
+                            continue
+                        if entry.is_dir:
+                            if self.max_depth is None or depth < self.max_depth:
+                                folders.put_nowait((entry.path + "/", depth + 1))
+                        elif self.include and not self._match(entry, self.include):
+                            continue
+                        await entries.put(entry)
+                finally:
+                    folders.task_done()
+
+        async def finish():
+            await folders.join()
+            await entries.put(None)
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrency)]
+        tasks.append(asyncio.ensure_future(finish()))
+        try:
+            while True:
+                entry = await entries.get()
+                if entry is None:
+                    break
+                yield entry
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def walk(self, root: str = "/") -> Iterator[AlistEntry]:
+        """
+        遍历文件夹, 在会话事件循环中运行异步遍历.
+
+        :param root: 起始文件夹路径
+        :return: 文件信息迭代器
+        """
+
+        walker = self.walk_async(root)
+        try:
+            while True:
+                try:
+                    yield self.alist.clients.run(walker.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.alist.clients.run(walker.aclose())
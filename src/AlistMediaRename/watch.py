@@ -0,0 +1,239 @@
+import asyncio
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .log import ApiResponseError
+from .models import BatchEntry, BatchResult, RenameItem, WatchState
+from .retry import retry_counter
+from .utils import Tools
+
+if TYPE_CHECKING:
+    from .core import AsyncAmr
+
+
+class Watcher:
+    """
+    文件夹监视器
+    在同一会话中定时检查文件夹, 仅对新增的未重命名文件进行重命名, 无需用户选择及确认.
+    检查时按刷新策略获取文件列表(通常不强制刷新), 文件列表无变化时跳过匹配;
+    TMDB 信息首次获取后保存在内存中, 新增文件的集数超出已知集数时才忽略缓存重新获取
+    """
+
+    def __init__(
+        self,
+        amr: "AsyncAmr",
+        entries: list[BatchEntry],
+        interval: Optional[float] = None,
+    ):
+        """
+        初始化参数
+
+        :param amr: AsyncAmr
+        :param entries: 监视的文件夹及对应的重命名任务
+        :param interval: 检查间隔(秒), 默认使用配置参数
+        """
+
+        self.amr = amr
+        self.interval = (
+            interval if interval is not None else amr.config.amr.watch_interval
+        )
+        self.states = [
+            WatchState(entry=entry, folder_path=Tools.ensure_slash(entry.dir))
+            for entry in entries
+        ]
+
+    async def poll(self) -> list[BatchResult]:
+        """
+        检查所有文件夹一次, 同时检查的文件夹数受 batch_max_concurrency 限制
+
+        :return: 有文件重命名或出现错误的文件夹的重命名结果
+        """
+
+        semaphore = asyncio.Semaphore(max(1, self.amr.config.amr.batch_max_concurrency))
+
+        async def run(state: WatchState) -> Optional[BatchResult]:
+            async with semaphore:
+                return await self.poll_folder(state)
+
+        results = await asyncio.gather(*[run(state) for state in self.states])
+        self.amr._write_metrics()
+        return [result for result in results if result is not None]
+
+    async def run(
+        self,
+        iterations: Optional[int] = None,
+        callback: Optional[Callable[[list[BatchResult]], None]] = None,
+    ):
+        """
+        定时检查文件夹
+
+        :param iterations: 检查次数, 默认一直运行
+        :param callback: 每次检查后调用, 参数为本次检查的重命名结果
+        """
+
+        count = 0
+        while True:
+            results = await self.poll()
+            if callback:
+                callback(results)
+            count += 1
+            if iterations is not None and count >= iterations:
+                return
+            await asyncio.sleep(self.interval)
+
+    async def poll_folder(self, state: WatchState) -> Optional[BatchResult]:
+        """
+        检查单个文件夹, 重命名新增文件
+
+        :param state: 文件夹状态
+        :return: 重命名结果, 文件列表无变化或无需重命名时返回 None
+        """
+
+        # 统计当前文件夹的请求重试次数
+        counter = [0]
+        token = retry_counter.set(counter)
+        try:
+            result = await self._poll_folder(state)
+        finally:
+            retry_counter.reset(token)
+        if result is not None:
+            result.retry_count = counter[0]
+        return result
+
+    async def _poll_folder(self, state: WatchState) -> Optional[BatchResult]:
+        """检查单个文件夹, 参数参考 poll_folder"""
+
+        amr = self.amr
+        entry = state.entry.model_copy(update={"dir": state.folder_path})
+        result = BatchResult(entry=entry)
+        try:
+            media = await amr._list_folder_async(state.folder_path, entry.password)
+            names = {name for file_list in media.values() for name in file_list}
+            if names == state.names:
+                return None
+
+            # 匹配结果包含已重命名的文件, 用于判断是否有未匹配的文件
+            video_rename_list, subtitle_rename_list, title = await self._plan(
+                state, media
+            )
+            # 未匹配的视频文件集数超出已知集数(如新一集的信息尚未获取)时, 重新获取季度信息
+            pending: set[str] = set()
+            if entry.type == "tv" and self._unknown_episodes(
+                state, media, video_rename_list
+            ):
+                video_rename_list, subtitle_rename_list, title = await self._plan(
+                    state, media, refresh=True
+                )
+                # TMDB 仍未更新的文件不记录, 下次检查重新获取
+                pending = self._unknown_episodes(state, media, video_rename_list)
+
+            video_rename_list = self._new_items(video_rename_list)
+            subtitle_rename_list = self._new_items(subtitle_rename_list)
+            if not video_rename_list and not subtitle_rename_list:
+                state.names = names - pending
+                return None
+
+            folder_rename_list = amr._folder_rename_list(state.folder_path, title)
+            results = await amr._rename_async(
+                video_rename_list, subtitle_rename_list, folder_rename_list
+            )
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+        result.title = title
+        amr._count_results(
+            result,
+            len(video_rename_list),
+            len(subtitle_rename_list),
+            bool(folder_rename_list),
+            results,
+        )
+        state.renamed += result.video_count + result.subtitle_count
+        # 父文件夹重命名后, 之后检查新的文件夹路径
+        if result.folder_count:
+            state.folder_path = Tools.ensure_slash(
+                folder_rename_list[0].folder_path + title
+            )
+        # 记录重命名后的文件列表, 重命名失败时下次检查重试
+        if result.success:
+            items = video_rename_list + subtitle_rename_list
+            state.names = (names - pending - {item.original_name for item in items}) | {
+                item.target_name for item in items
+            }
+        return result
+
+    async def _plan(
+        self, state: WatchState, media: dict[str, list[str]], refresh: bool = False
+    ) -> tuple[list[RenameItem], list[RenameItem], str]:
+        """
+        使用已获取的 TMDB 信息匹配文件列表, 首次检查时获取 TMDB 信息
+
+        :param refresh: 是否忽略已获取及已缓存的季度信息, 重新请求 TMDB
+        :return: 视频重命名列表, 字幕重命名列表, 父文件夹重命名标题
+        """
+
+        amr = self.amr
+        entry = state.entry
+        if not state.media_id:
+            state.media_id = await amr._entry_id(entry)
+
+        if entry.type == "movie":
+            if not state.info:
+                state.info = (
+                    await amr.tmdb.movie_info(state.media_id, amr.config.tmdb.language)
+                ).data
+            return amr._movie_plan(
+                state.media_id, state.info, media, state.folder_path, False
+            )
+
+        if not state.info or refresh:
+            result_tv_info = await amr.tmdb.tv_seasons_info(
+                state.media_id, [entry.season], amr.config.tmdb.language, refresh
+            )
+            season_info = result_tv_info.data["seasons"].get(entry.season)
+            if season_info is None:
+                raise ApiResponseError(f"未查找到第 {entry.season} 季信息")
+            state.info, state.season_info = result_tv_info.data["tv"], season_info
+        return amr._tv_plan(
+            state.media_id,
+            state.info,
+            state.season_info,
+            media,
+            state.folder_path,
+            entry.number,
+            False,
+        )
+
+    @staticmethod
+    def _unknown_episodes(
+        state: WatchState, media: dict[str, list[str]], items: list[RenameItem]
+    ) -> set[str]:
+        """
+        获取未匹配且集数超出已知集数的视频文件,
+        无法解析集数的文件(如预告片、特典)不视为新的一集
+
+        :param state: 文件夹状态
+        :param media: 各类别文件名列表
+        :param items: 视频重命名列表
+        :return: 文件名集合
+        """
+
+        matched = {item.original_name for item in items}
+        known = max(
+            (episode["episode_number"] for episode in state.season_info["episodes"]),
+            default=0,
+        )
+        unknown = set()
+        for name in media["video"]:
+            if name in matched:
+                continue
+            number = Tools.parse_episode_number(name)
+            if number is not None and number > known:
+                unknown.add(name)
+        return unknown
+
+    @staticmethod
+    def _new_items(items: list[RenameItem]) -> list[RenameItem]:
+        """排除已重命名的文件"""
+
+        return [item for item in items if item.original_name != item.target_name]
@@ -0,0 +1,13 @@
+import pytest
+
+from benchmark.bench import make_amr as build_amr
+
+
+@pytest.fixture
+def make_amr():
+    """
+    创建连接模拟 Alist 及 TMDB 的 Amr 的函数, 参数参考 benchmark.bench.make_amr,
+    返回 (Amr, 模拟服务)
+    """
+
+    return build_amr
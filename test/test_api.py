@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+
+from AlistMediaRename.api import AsyncAlistApi
+from AlistMediaRename.client import HttpClients
+from AlistMediaRename.models import RenameItem
+
+
+def make_async_alist() -> AsyncAlistApi:
+    """模拟 Alist 登录及重命名接口"""
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        data = {"token": "token"} if request.url.path == "/api/auth/login" else None
+        return httpx.Response(
+            200, json={"code": 200, "message": "success", "data": data}
+        )
+
+    clients = HttpClients(async_transport=httpx.MockTransport(handle))
+    return AsyncAlistApi("http://alist", "user", "password", clients=clients)
+
+
+def test_async_alist_sync_methods():
+    """
+    测试异步接口继承的同步方法调用时直接抛出 TypeError, 异步方法正常使用
+    """
+
+    alist = make_async_alist()
+    files = [RenameItem("1.mkv", "E1.mkv", "/show/")]
+    with pytest.raises(TypeError, match="ensure_login"):
+        alist.ensure_login()
+    with pytest.raises(TypeError, match="iter_file_list_async"):
+        alist.iter_file_list("/show/")
+    with pytest.raises(TypeError, match="rename_list_async"):
+        alist.rename_list_async(files)
+    with pytest.raises(TypeError, match="rename_list_sync"):
+        alist.rename_list_sync(files)
+
+    async def main():
+        results = await alist.rename_list(files)
+        await alist.clients.aclose()
+        return results
+
+    assert asyncio.run(main())[0].success
@@ -0,0 +1,66 @@
+import pytest
+
+from AlistMediaRename.batch import Manifest
+
+
+def test_manifest_formats(tmp_path):
+    """
+    测试读取 yaml/csv/jsonl 格式任务清单, 忽略空字段并使用默认参数
+    """
+
+    yaml_file = tmp_path / "manifest.yaml"
+    yaml_file.write_text(
+        "entries:\n"
+        "  - keyword: 刀剑神域\n"
+        "    dir: /动漫/SAO\n"
+        "    season: 2\n"
+        "  - tmdb_id: 413594\n"
+        "    dir: /电影/SAO\n"
+        "    type: movie\n",
+        encoding="utf-8",
+    )
+    csv_file = tmp_path / "manifest.csv"
+    csv_file.write_text(
+        "keyword,tmdb_id,dir,type,season,number\n"
+        "刀剑神域,,/动漫/SAO,tv,2,\n"
+        ",413594,/电影/SAO,movie,,\n",
+        encoding="utf-8",
+    )
+    jsonl_file = tmp_path / "manifest.jsonl"
+    jsonl_file.write_text(
+        '{"keyword": "刀剑神域", "dir": "/动漫/SAO", "season": 2}\n'
+        "\n"
+        '{"tmdb_id": 413594, "dir": "/电影/SAO", "type": "movie"}\n',
+        encoding="utf-8",
+    )
+
+    for filepath in (yaml_file, csv_file, jsonl_file):
+        tv, movie = Manifest.load(str(filepath))
+        assert (tv.keyword, tv.dir, tv.type, tv.season, tv.number) == (
+            "刀剑神域",
+            "/动漫/SAO",
+            "tv",
+            2,
+            "1-",
+        )
+        assert (movie.tmdb_id, movie.type, movie.season) == ("413594", "movie", 1)
+
+
+def test_manifest_errors(tmp_path):
+    """
+    测试任务清单格式错误时提示对应任务序号
+    """
+
+    filepath = tmp_path / "manifest.jsonl"
+    filepath.write_text(
+        '{"keyword": "刀剑神域", "dir": "/a"}\n{"dir": "/b"}\n', encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="第 2 项"):
+        Manifest.load(str(filepath))
+
+    filepath.write_text('{"keyword": "刀剑神域", "dir": "/a", "type": "music"}\n')
+    with pytest.raises(ValueError, match="第 1 项"):
+        Manifest.load(str(filepath))
+
+    with pytest.raises(ValueError, match="不支持"):
+        Manifest.load(str(tmp_path / "manifest.txt"))
@@ -0,0 +1,22 @@
+from benchmark import STAGES, compare, run_benchmark
+
+
+def test_benchmark_renames_all_files():
+    result = run_benchmark(50, error_rate=0.05, throttle=4, seed=1)
+    # 50 个视频, 5 个字幕及父文件夹
+    assert result["renamed"] == 56
+    assert result["failed"] == 0
+    assert result["retries"] > 0
+    assert set(result["stages"]) == set(STAGES)
+    assert set(result["stage_memory"]) == set(STAGES)
+    assert result["peak_memory"] > 0
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": [{"files": 10, "total": 1.0, "peak_memory": 100}]}
+    ok = {"files": 10, "total": 1.2, "peak_memory": 120}
+    slow = {"files": 10, "total": 3.0, "peak_memory": 400}
+    assert compare([ok], baseline) == []
+    assert len(compare([slow], baseline)) == 2
+    # 基准中不存在的文件数量不参与比较
+    assert compare([{"files": 20, "total": 9.0}], baseline) == []
@@ -0,0 +1,60 @@
+import time
+
+from AlistMediaRename.cache import TMDBCache
+
+
+def test_cache_key_ignores_api_key():
+    """
+    测试缓存键不包含 api_key, 且与参数顺序无关
+    """
+
+    key1 = TMDBCache.make_key("/tv/1", {"api_key": "a", "language": "zh-CN"})
+    key2 = TMDBCache.make_key("/tv/1", {"language": "zh-CN", "api_key": "b"})
+
+    assert key1 == key2 == "/tv/1?language=zh-CN"
+
+
+def test_cache_ttl_and_refresh(tmp_path):
+    """
+    测试缓存过期及强制刷新
+    预期结果: 过期或刷新模式下不返回缓存
+    """
+
+    cache = TMDBCache(str(tmp_path / "cache.db"), ttl=60)
+    cache.set("/tv/1?", {"name": "test"})
+    assert cache.get("/tv/1?") == {"name": "test"}
+
+    cache.refresh = True
+    assert cache.get("/tv/1?") is None
+
+    cache.refresh = False
+    cache.ttl = -1
+    cache.set("/tv/2?", {"name": "expired"})
+    assert cache.get("/tv/2?") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+
+def test_cache_lru_eviction(tmp_path):
+    """
+    测试超出容量时淘汰最久未访问的记录
+    """
+
+    cache = TMDBCache(str(tmp_path / "cache.db"), max_size=2)
+    cache.set("a", {"v": 1})
+    time.sleep(0.01)
+    cache.set("b", {"v": 2})
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", {"v": 3})
+
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("b") is None
+    assert cache.get("c") == {"v": 3}
+
+    # 重新打开数据库, 缓存仍然存在
+    cache.close()
+    cache = TMDBCache(str(tmp_path / "cache.db"), max_size=2)
+    assert cache.get("c") == {"v": 3}
+    cache.close()
@@ -0,0 +1,94 @@
+import random
+import re
+import time
+
+from natsort import natsorted
+
+from AlistMediaRename.classifier import MediaClassifier
+from AlistMediaRename.models import AmrConfig
+
+
+def make_names(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    extensions = ["mkv", "MKV", "Mp4", "ass", "srt", "jpg", "nfo", "mka", "txt", "ſrt"]
+    names = [f"[Group] Show - {i:0>3}.{rng.choice(extensions)}" for i in range(count)]
+    return names + ["mkv", ".mp4", "a.mkv.txt", "a.xmkv", "a.mkv\n", "ep 10.ass"]
+
+
+def reference_classify(
+    names: list[str], patterns: dict[str, str]
+) -> dict[str, list[str]]:
+    """逐个正则匹配, 文件归入第一个匹配的类别"""
+
+    media: dict[str, list[str]] = {category: [] for category in patterns}
+    for name in names:
+        for category, pattern in patterns.items():
+            if re.match(pattern, name):
+                media[category].append(name)
+                break
+    return {category: natsorted(files) for category, files in media.items()}
+
+
+def test_classifier_same_as_regex():
+    """
+    测试分类结果与逐个正则匹配(第一个匹配的类别)并自然排序的结果一致, 包括非后缀规则
+    """
+
+    config = AmrConfig()
+    patterns = {
+        "video": config.video_regex_pattern,
+        "subtitle": config.subtitle_regex_pattern,
+        "audio": r".*\.(mka|flac)$",
+        "sample": r"(?i).*sample.*",
+    }
+    names = make_names(2000) + ["Show.Sample.mkv", "show.mka", "show.MKA"]
+    random.Random(1).shuffle(names)
+
+    media = MediaClassifier(patterns).classify(iter(names))
+
+    assert list(media) == list(patterns)
+    assert media == reference_classify(names, patterns)
+    assert "show.MKA" not in media["audio"]
+    # 同时匹配视频及 sample 规则的文件只归入视频
+    assert "Show.Sample.mkv" in media["video"]
+    assert "Show.Sample.mkv" not in media["sample"]
+
+
+def test_classifier_overlapping_categories():
+    """
+    测试类别互斥, 文件名同时匹配多个规则时归入第一个匹配的类别
+    """
+
+    patterns = {
+        "sample": r"(?i).*sample.*",
+        "video": r"(?i).*\.(mp4|mkv)$",
+        "subtitle": r"(?i).*\.(ass|srt)$",
+        "chinese": r"(?i).*\.(chs|cht)\.ass$",
+    }
+    names = ["Show.Sample.mkv", "Show.mkv", "Show.chs.ass", "Show.Sample.ass"]
+    media = MediaClassifier(patterns).classify(names)
+
+    assert media == {
+        "sample": ["Show.Sample.ass", "Show.Sample.mkv"],
+        "video": ["Show.mkv"],
+        "subtitle": ["Show.chs.ass"],
+        "chinese": [],
+    }
+    assert sum(len(files) for files in media.values()) == len(names)
+
+
+def test_classifier_benchmark():
+    """
+    测试 100k 文件分类耗时
+    """
+
+    config = AmrConfig()
+    classifier = MediaClassifier(
+        {"video": config.video_regex_pattern, "subtitle": config.subtitle_regex_pattern}
+    )
+    names = make_names(100_000)
+
+    start = time.perf_counter()
+    media = classifier.classify(names)
+    assert time.perf_counter() - start < 10
+    assert len(media["video"]) + len(media["subtitle"]) > 50_000
@@ -0,0 +1,169 @@
+import asyncio
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from AlistMediaRename.api import AlistApi
+from AlistMediaRename.client import HttpClients
+from AlistMediaRename.models import RenameItem
+
+
+class Handler(BaseHTTPRequestHandler):
+    """模拟 Alist 重命名接口, 记录每个连接的客户端端口"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, body: bytes):
+        self.server.ports.add(self.client_address[1])
+        self.server.methods.append(self.command)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._reply(b"")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._reply(
+            json.dumps({"code": 200, "message": "success", "data": None}).encode()
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.ports = set()
+    server.methods = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_connection_reuse_across_passes():
+    """
+    测试文件重命名与父文件夹重命名两批请求在会话事件循环中复用已建立的连接
+    """
+
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    clients = HttpClients(max_connections=4, max_keepalive_connections=4)
+    alist = AlistApi(url, clients=clients)
+    alist.token = "token"
+    try:
+        files = [RenameItem(f"{i}.mkv", f"E{i}.mkv", "/show/") for i in range(20)]
+        results = alist.rename_list(files)
+        assert all(result.success for result in results)
+        connections = len(server.ports)
+        assert 0 < connections <= 4
+
+        results = alist.rename_list([RenameItem("show", "Show (2020)", "/")])
+        assert results[0].success
+        assert len(server.ports) == connections
+    finally:
+        clients.close()
+        server.shutdown()
+
+
+def test_async_client_per_loop():
+    """
+    测试异步客户端绑定事件循环: 同步接口使用会话事件循环中的客户端, 其他事件循环使用各自的客户端
+    """
+
+    clients = HttpClients(
+        async_transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    )
+
+    async def current() -> httpx.AsyncClient:
+        await clients.async_client.get("http://alist/")
+        return clients.async_client
+
+    session = clients.run(current())
+    other = asyncio.run(current())
+    assert other is not session and clients.run(current()) is session
+
+    async def close_other():
+        client = await current()
+        await clients.aclose()
+        return client
+
+    closed = asyncio.run(close_other())
+    assert closed.is_closed and clients.sync.is_closed
+    assert not session.is_closed
+
+    clients.close()
+    assert session.is_closed
+
+
+def test_warmup_joined_on_close():
+    """
+    测试预先建立的连接在关闭客户端前完成, 空地址不连接
+    """
+
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    clients = HttpClients()
+    try:
+        clients.warmup([url, ""])
+        clients.close()
+        assert server.methods == ["HEAD"]
+        assert clients.sync.is_closed
+    finally:
+        server.shutdown()
+
+
+def test_warmup_async_client():
+    """
+    测试异步客户端在运行请求的事件循环中预先建立连接, 之后的请求复用该连接
+    """
+
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    clients = HttpClients()
+    clients.warmup([url])
+
+    async def request():
+        await asyncio.sleep(0.1)
+        await clients.async_client.post(url)
+
+    async def main():
+        await clients.awarmup()
+        await request()
+        await clients.aclose()
+
+    try:
+        # 会话事件循环: 同步客户端及会话事件循环中的异步客户端各连接一次
+        clients.run(request())
+        clients.close()
+        assert sorted(server.methods) == ["HEAD", "HEAD", "POST"]
+        assert len(server.ports) == 2
+
+        # 调用方的事件循环
+        server.methods.clear()
+        asyncio.run(main())
+        assert server.methods == ["HEAD", "POST"]
+        assert len(server.ports) == 3
+    finally:
+        server.shutdown()
+
+
+def test_http2_fallback(monkeypatch):
+    """
+    测试未安装 h2 时使用 HTTP/1.1
+    """
+
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name, *args: None if name == "h2" else find_spec(name, *args),
+    )
+    clients = HttpClients(http2=True)
+    assert clients.http2 is False
+    clients.close()
@@ -0,0 +1,105 @@
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+# 导入命令行模块的耗时上限(毫秒), 延迟导入前约 500 毫秒
+IMPORT_TIME_BUDGET = 150
+
+# 仅在执行命令时才需要的依赖
+HEAVY_MODULES = (
+    "AlistMediaRename.core",
+    "asyncio",
+    "httpx",
+    "natsort",
+    "pydantic",
+    "pyotp",
+    "rich",
+    "ruamel.yaml",
+)
+
+
+def import_cli() -> tuple[dict[str, int], list[str]]:
+    """
+    在新进程中使用 python -X importtime 导入命令行模块
+
+    :return: 各模块累计导入耗时(微秒), 已导入的依赖模块
+    """
+
+    code = (
+        "import sys, AlistMediaRename.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    r = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    loaded = r.stdout.strip()
+    return times, loaded.split(",") if loaded else []
+
+
+def test_cli_import_time():
+    """
+    测试导入命令行模块时不导入 rich, pydantic, httpx 等依赖, 且耗时不超过上限
+    """
+
+    times, loaded = import_cli()
+    assert loaded == []
+    # 取多次结果的最小值, 减少机器负载的影响
+    cumulative = min(
+        [times["AlistMediaRename.cli"]]
+        + [import_cli()[0]["AlistMediaRename.cli"] for _ in range(2)]
+    )
+    assert cumulative / 1000 < IMPORT_TIME_BUDGET
+
+
+def test_cli_help():
+    """
+    测试延迟导入后帮助及版本信息正常输出
+    """
+
+    from AlistMediaRename.cli import start
+
+    runner = CliRunner()
+    r = runner.invoke(start, ["-h"])
+    assert r.exit_code == 0
+    assert "batch" in r.output and "watch" in r.output
+    r = runner.invoke(start, ["watch", "-h"])
+    assert r.exit_code == 0 and "--once" in r.output
+    r = runner.invoke(start, ["-v"])
+    assert r.exit_code == 0 and "version" in r.output
+
+
+def test_package_exports():
+    """
+    测试延迟导入后原有的导出对象均可从包中导入
+    """
+
+    from AlistMediaRename import (  # noqa: F401
+        AlistApi,
+        Amr,
+        ApiResponseModel,
+        AsyncAmr,
+        Config,
+        Formated_Variables,
+        HandleException,
+        Output,
+        RenameTask,
+        TMDBApi,
+        Tools,
+        console,
+        logger,
+    )
+    import AlistMediaRename
+
+    for name in AlistMediaRename.__all__:
+        assert getattr(AlistMediaRename, name) is not None
+    assert "HandleException" in dir(AlistMediaRename)
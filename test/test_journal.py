@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import pytest
+
+from AlistMediaRename import AsyncAmr
+from AlistMediaRename.journal import RenameJournal
+from AlistMediaRename.models import BatchEntry
+
+
+def test_journal_resume(make_amr, tmp_path):
+    """
+    测试根据重命名记录继续中断的重命名:
+    已完成的不再重命名, 父文件夹已重命名时使用新路径, 未写入记录的已完成重命名视为成功
+    """
+
+    amr, services = make_amr(3, amr_class=AsyncAmr)
+    alist, tmdb = services.alist, services.tmdb
+    amr.journal_dir = str(tmp_path)
+    failing = "[Group] Show - 000003 [1080p].mkv"
+    rename = alist._rename
+
+    def fail_once(body: dict):
+        if body["path"].endswith(failing):
+            return alist._result(code=500, message="storage error")
+        return rename(body)
+
+    async def main():
+        async with amr:
+            # 第 3 集重命名失败, 父文件夹仍重命名
+            alist._rename = fail_once
+            results = await amr.batch([BatchEntry(tmdb_id="1", dir="/show")])
+            assert results[0].error_count == 1 and results[0].folder_count == 1
+            job = amr.journal_job
+            path = tmp_path / f"{job}.jsonl"
+            assert RenameJournal.latest_unfinished(str(tmp_path)) == job
+
+            # 模拟中断: 第 1 集的重命名结果未写入, 最后一行未写入完整
+            amr.journal.close()
+            lines = path.read_text(encoding="utf-8").splitlines()
+            lines.remove(json.dumps({"op": "done", "id": 0}))
+            path.write_text("\n".join(lines) + '\n{"op": "do', encoding="utf-8")
+
+            alist._rename = rename
+            tmdb_requests = tmdb.requests
+            file_results, folder_results = await amr.resume(job)
+            assert len(file_results) == 2 and folder_results == []
+            assert all(r.success for r in file_results)
+            assert tmdb.requests == tmdb_requests
+            assert sorted(alist.fs["/Show (2020)/"]) == [
+                "Show-S01E01.Episode 1.mkv",
+                "Show-S01E02.Episode 2.mkv",
+                "Show-S01E03.Episode 3.mkv",
+            ]
+
+    asyncio.run(main())
+    assert RenameJournal.latest_unfinished(str(tmp_path)) is None
+    _, items = RenameJournal.load(str(next(tmp_path.glob("*.jsonl"))))
+    assert len(items) == 4 and all(item.done for item in items)
+
+
+def test_journal_undo(make_amr, tmp_path):
+    """
+    测试根据重命名记录撤销重命名: 先恢复父文件夹名称, 原文件名已被占用的文件跳过
+    """
+
+    amr, services = make_amr(3, amr_class=AsyncAmr)
+    alist = services.alist
+    amr.journal_dir = str(tmp_path)
+    originals = sorted(alist.fs["/show/"])
+    list_folder = alist._list
+    list_params = []
+
+    def record_list(request):
+        list_params.append(dict(request.url.params))
+        return list_folder(request)
+
+    async def main():
+        async with amr:
+            results = await amr.batch(
+                [BatchEntry(tmdb_id="1", dir="/show", password="secret")]
+            )
+            assert results[0].success
+            job = amr.journal_job
+            files, folders = amr.undo_items(job)
+            assert len(files) == 3 and len(folders) == 1
+            # 重命名记录中不保存文件夹访问密码
+            path = tmp_path / f"{job}.jsonl"
+            assert "secret" not in path.read_text(encoding="utf-8")
+            # 记录中包含文件路径, 仅所有者可读写
+            assert path.stat().st_mode & 0o777 == 0o600
+
+            # 原文件名已被占用
+            alist.fs["/Show (2020)/"][originals[1]] = False
+            alist._list = record_list
+            file_results, folder_results = await amr.undo(job, "secret")
+            # 核对文件时使用文件夹访问密码并强制刷新
+            assert list_params and all(
+                p["password"] == "secret" and p["refresh"] == "true"
+                for p in list_params
+            )
+            assert folder_results[0].success
+            assert [r.success for r in file_results] == [True, False, True]
+            assert "已被占用" in file_results[1].error
+            assert amr.journal_job != job
+
+    asyncio.run(main())
+    assert "Show (2020)" not in alist.fs["/"]
+    assert sorted(alist.fs["/show/"]) == sorted(
+        [originals[0], originals[2], originals[1], "Show-S01E02.Episode 2.mkv"]
+    )
+    # 撤销操作写入新的重命名记录
+    assert len(RenameJournal.jobs(str(tmp_path))) == 2
+    assert RenameJournal.latest_unfinished(str(tmp_path)) is None
+
+
+def test_journal_prune(make_amr, tmp_path):
+    """
+    测试创建新任务时仅保留最近的任务记录, 有未完成重命名的任务不删除
+    """
+
+    unfinished = json.dumps(
+        {"op": "intent", "id": 0, "item": ["a.mkv", "b.mkv", "/show/"], "dir": False}
+    )
+    for i in range(5):
+        (tmp_path / f"20240101-00000{i}-1.jsonl").write_text(
+            unfinished + "\n" if i == 1 else "", encoding="utf-8"
+        )
+
+    amr, _ = make_amr(3, amr_class=AsyncAmr)
+    amr.journal_dir = str(tmp_path)
+    amr.config.amr.journal_keep = 3
+
+    async def main():
+        async with amr:
+            await amr.batch([BatchEntry(tmdb_id="1", dir="/show")])
+
+    asyncio.run(main())
+    assert RenameJournal.jobs(str(tmp_path)) == [
+        "20240101-000001-1",
+        "20240101-000003-1",
+        "20240101-000004-1",
+        amr.journal_job,
+    ]
+    assert RenameJournal.prune(str(tmp_path), 0) == []
+
+
+def test_journal_job_name(tmp_path):
+    """
+    测试任务名称包含路径分隔符或 .. 时拒绝使用
+    """
+
+    for job in ("", "../other", "a/b", "a\\b", ".."):
+        with pytest.raises(ValueError):
+            RenameJournal(str(tmp_path), job)
+    assert RenameJournal(str(tmp_path), "20240101-000000-1").job == "20240101-000000-1"
@@ -0,0 +1,68 @@
+import json
+import threading
+
+from AlistMediaRename.log import HandleException, logger
+from AlistMediaRename.models import ApiResponseModel
+
+
+class Api:
+    url = "http://alist"
+
+    @HandleException.catch_api_exceptions
+    def file_list(self, path: str, password: str = "", names: list = []):
+        if path == "/error/":
+            raise ValueError(f"{self.url}/list?api_key=secret&path={path}")
+        return ApiResponseModel(
+            success=True,
+            status_code=200,
+            error="",
+            data={"content": [{"name": str(i)} for i in range(100)]},
+            function="file_list",
+            args=(self, path, password, names),
+            kwargs={},
+        )
+
+
+def test_log_bounded_and_redacted(tmp_path):
+    """
+    测试内存日志容量限制, 日志记录不包含响应数据及调用对象, 并隐藏敏感信息
+    """
+
+    filepath = tmp_path / "log" / "amr_log.jsonl"
+    logger.configure(10, str(filepath))
+    try:
+        api = Api()
+        threads = [
+            threading.Thread(
+                target=lambda: [
+                    api.file_list(f"/{i}/", "123", ["a"]) for i in range(50)
+                ]
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        api.file_list("/error/", password="123")
+
+        assert len(logger.log) == 10
+        record = logger.log[-1]
+        assert not record.success
+        assert record.params == {"path": "/error/", "password": "***"}
+        assert "secret" not in record.error
+        assert logger.log[0].params == {
+            "path": logger.log[0].params["path"],
+            "password": "***",
+            "names": "<list 1>",
+        }
+
+        logger.flush()
+        lines = filepath.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 201
+        assert all(json.loads(line)["function"] for line in lines)
+        assert json.loads(lines[-1])["params"]["password"] == "***"
+        assert "secret" not in lines[-1]
+    finally:
+        logger.configure(1000, "")
+    assert logger.sink is None and logger.log.maxlen == 1000
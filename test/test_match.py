@@ -0,0 +1,133 @@
+import random
+import time
+
+from AlistMediaRename.models import RenameItem, RenameTask
+from AlistMediaRename.utils import Tools
+
+
+def reference_match(
+    original_list: list[str],
+    target_list: list[str],
+    folder_path: str,
+    exclude_renamed: bool,
+    first_number: str = "1",
+) -> list[RenameTask]:
+    """原匹配实现, 用于比较匹配结果"""
+
+    rename_list_no_filter: list[RenameTask] = []
+    rename_list_filter: list[RenameTask] = []
+    rename_list: list[RenameTask] = [RenameTask()] * len(target_list)
+    target_dict: dict[str, int] = {item: i for i, item in enumerate(target_list)}
+    queue = []
+
+    for item in original_list:
+        if item.rsplit(".", 1)[0] in target_list:
+            rename_list[target_dict[item.rsplit(".", 1)[0]]] = RenameTask(
+                original_name=item, target_name=item, folder_path=folder_path
+            )
+        else:
+            queue.append(item)
+
+    for i in range(len(target_list)):
+        if rename_list[i] != RenameTask():
+            rename_list_no_filter.append(rename_list[i])
+        if (
+            rename_list[i] == RenameTask()
+            and len(queue) > 0
+            and i + 1 in Tools.parse_page_ranges(first_number, len(target_list))
+        ):
+            original_name: str = queue.pop(0)
+            target_name = target_list[i] + "." + original_name.rsplit(".", 1)[1]
+            rename_list_no_filter.append(
+                RenameTask(
+                    original_name=original_name,
+                    target_name=target_name,
+                    folder_path=folder_path,
+                )
+            )
+            rename_list_filter.append(
+                RenameTask(
+                    original_name=original_name,
+                    target_name=target_name,
+                    folder_path=folder_path,
+                )
+            )
+
+    return rename_list_filter if exclude_renamed else rename_list_no_filter
+
+
+def make_episodes(count: int, renamed: float, seed: int = 0):
+    """生成剧集标题及文件名, 部分文件已重命名"""
+
+    rng = random.Random(seed)
+    target_list = [f"Show-S01E{i:0>4}.Episode {i}" for i in range(1, count + 1)]
+    original_list = []
+    for i, target in enumerate(target_list, 1):
+        if rng.random() < renamed:
+            original_list.append(f"{target}.mkv")
+        elif rng.random() < 0.9:
+            original_list.append(f"[Group] Show - {i:0>4} [1080p].mkv")
+    rng.shuffle(original_list)
+    return Tools.filter_file(original_list, r".*\.mkv$"), target_list
+
+
+def test_match_same_as_reference():
+    """
+    测试匹配结果与原实现一致
+    """
+
+    for seed, renamed in enumerate((0.0, 0.3, 1.0)):
+        original_list, target_list = make_episodes(300, renamed, seed)
+        for first_number in ("1-", "1", "5-20,40,100-", "2,3"):
+            for exclude_renamed in (True, False):
+                args = (original_list, target_list, "/a/", exclude_renamed)
+                assert Tools.match_episode_files(
+                    *args, first_number
+                ) == reference_match(*args, first_number)
+
+
+def test_match_benchmark():
+    """
+    测试 10k/100k 集匹配耗时, 耗时应与集数成线性关系
+    """
+
+    timings = {}
+    for count in (10_000, 100_000):
+        original_list, target_list = make_episodes(count, 0.3)
+        start = time.perf_counter()
+        result = Tools.match_episode_files(
+            original_list, target_list, "/a/", False, "1-"
+        )
+        timings[count] = time.perf_counter() - start
+        assert len(result) == len(original_list)
+
+    assert timings[100_000] < 10
+    assert timings[100_000] < timings[10_000] * 30
+
+
+def test_match_items():
+    """
+    测试内部使用的轻量重命名任务与 RenameTask 可相互转换且结果一致
+    """
+
+    original_list, target_list = make_episodes(300, 0.3)
+    args = (original_list, target_list, "/a/", False, "1-")
+    items = Tools.match_episode_items(*args)
+    tasks = Tools.match_episode_files(*args)
+
+    assert [item.to_task() for item in items] == tasks
+    assert [RenameItem.from_task(task) for task in tasks] == items
+    assert not hasattr(items[0], "__dict__")
+
+
+def test_parse_episode_number():
+    names = [
+        "[Group] Show - 04 [1080p].mkv",
+        "Show.S01E13.1080p.mkv",
+        "Show 第13集.mp4",
+        "Show EP13.mkv",
+        "[Group] Show - 13v2 [1080p].mkv",
+    ]
+    assert [Tools.parse_episode_number(name) for name in names] == [4, 13, 13, 13, 13]
+    assert Tools.parse_episode_number("[Group] Show - Trailer [1080p].mkv") is None
+    assert Tools.parse_episode_number("[Group] Show - NCOP1 [1080p].mkv") is None
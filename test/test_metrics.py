@@ -0,0 +1,67 @@
+from unittest import mock
+
+import httpx
+
+from AlistMediaRename.metrics import metrics
+
+
+def test_metrics_from_rename_run(make_amr, tmp_path):
+    """
+    测试重命名后记录各接口请求数、耗时及重试次数, 结束时写入 textfile 文件
+    """
+
+    metrics.reset()
+    amr, services = make_amr(20, error_rate=0.1, seed=3)
+    amr.metrics_file = str(tmp_path / "amr.prom")
+    with mock.patch("rich.prompt.Confirm.ask", return_value=True), amr:
+        assert amr.tv_rename_id("1", "/show/")
+
+    # 20 个视频, 2 个字幕及父文件夹
+    assert metrics.value("amr_renamed") == 23
+    assert metrics.value("amr_requests", endpoint="fs/rename") == 23
+    assert metrics.value("amr_requests", endpoint="tv/{id}") == 1
+    assert metrics.value("amr_retries", kind="read") + metrics.value(
+        "amr_retries", kind="write"
+    ) == (services.alist.errors + services.tmdb.errors)
+
+    text = (tmp_path / "amr.prom").read_text(encoding="utf-8")
+    assert "# TYPE amr_requests_total counter" in text
+    assert 'amr_requests_total{endpoint="fs/list"}' in text
+    assert (
+        'amr_request_duration_seconds_bucket{endpoint="fs/rename",le="+Inf"} 23' in text
+    )
+    assert "amr_rename_files_per_second " in text
+    assert "# EOF" not in text
+
+
+def test_metrics_http_endpoint():
+    """
+    测试 HTTP 接口根据 Accept 请求头返回 OpenMetrics 格式
+    """
+
+    metrics.reset()
+    metrics.observe("fs/list", False, 0.02)
+    metrics.inc("amr_tmdb_cache_lookups", result="hit")
+    metrics.inc("amr_tmdb_cache_lookups", result="miss")
+
+    server = metrics.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        r = httpx.get(url, headers={"Accept": "application/openmetrics-text"})
+        assert r.headers["Content-Type"].startswith("application/openmetrics-text")
+        assert r.text.endswith("# EOF\n")
+        assert "# TYPE amr_requests counter" in r.text
+        assert 'amr_request_errors_total{endpoint="fs/list"} 1' in r.text
+        assert (
+            'amr_request_duration_seconds_bucket{endpoint="fs/list",le="0.01"} 0'
+            in r.text
+        )
+        assert (
+            'amr_request_duration_seconds_bucket{endpoint="fs/list",le="0.025"} 1'
+            in r.text
+        )
+        assert "amr_tmdb_cache_hit_ratio 0.5" in r.text
+
+        assert httpx.get(url.replace("/metrics", "/other")).status_code == 404
+    finally:
+        server.shutdown()
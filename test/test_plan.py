@@ -0,0 +1,121 @@
+import asyncio
+
+from AlistMediaRename import AsyncAmr
+from AlistMediaRename.models import BatchEntry
+from AlistMediaRename.plan import PlanFile
+
+
+def test_plan_then_apply(make_amr, tmp_path):
+    """
+    测试保存重命名计划后执行, 执行时不再请求 TMDB, 生成失败的计划不保存
+    """
+
+    amr, services = make_amr(5, amr_class=AsyncAmr)
+    alist, tmdb = services.alist, services.tmdb
+    path = str(tmp_path / "plan.jsonl")
+
+    async def main():
+        async with amr:
+            plans = await amr.plan(
+                [
+                    BatchEntry(tmdb_id="1", dir="/show"),
+                    BatchEntry(tmdb_id="1", dir="/missing"),
+                ]
+            )
+            assert not plans[0].error and plans[1].error
+            assert len(plans[0].video) == 5
+            assert plans[0].folder[0].target_name == "Show (2020)"
+            # 生成计划时不进行重命名
+            assert "Show-S01E01.Episode 1.mkv" not in alist.fs["/show/"]
+            PlanFile.dump(path, plans)
+
+            loaded = PlanFile.load(path)
+            assert len(loaded) == 1
+            assert loaded[0] == plans[0]
+
+            tmdb_requests = tmdb.requests
+            results = await amr.apply(loaded)
+            assert results[0].success
+            assert results[0].video_count == 5 and results[0].folder_count == 1
+            assert tmdb.requests == tmdb_requests
+            assert "Show-S01E01.Episode 1.mkv" in alist.fs["/Show (2020)/"]
+
+    asyncio.run(main())
+
+
+def test_apply_skips_changed_folder(make_amr):
+    """
+    测试文件列表与生成计划时不一致时不进行重命名
+    """
+
+    amr, services = make_amr(3, amr_class=AsyncAmr)
+    alist = services.alist
+
+    async def main():
+        async with amr:
+            plans = await amr.plan([BatchEntry(tmdb_id="1", dir="/show")])
+            alist.fs["/show/"]["[Group] Show - 000004 [1080p].mkv"] = False
+
+            results = await amr.apply(plans)
+            assert not results[0].success
+            assert "文件列表已变化" in results[0].error
+            assert "/show/" in alist.fs
+            assert not any(name.startswith("Show-S01") for name in alist.fs["/show/"])
+
+    asyncio.run(main())
+
+
+def test_apply_detects_renamed_file(make_amr):
+    """
+    测试文件数量不变但文件名变化时不进行重命名
+    """
+
+    amr, services = make_amr(3, amr_class=AsyncAmr)
+    alist = services.alist
+
+    async def main():
+        async with amr:
+            plans = await amr.plan([BatchEntry(tmdb_id="1", dir="/show")])
+            files = alist.fs["/show/"]
+            files["[Group] Show - 000004 [1080p].mkv"] = files.pop(
+                "[Group] Show - 000003 [1080p].mkv"
+            )
+
+            results = await amr.apply(plans)
+            assert not results[0].success
+            assert "文件列表已变化" in results[0].error
+
+    asyncio.run(main())
+
+
+def test_plan_password_not_saved(make_amr, tmp_path):
+    """
+    测试计划文件中不保存文件夹访问密码, 执行时使用调用方提供的密码
+    """
+
+    amr, services = make_amr(3, amr_class=AsyncAmr)
+    alist = services.alist
+    path = tmp_path / "plan.jsonl"
+    list_folder = alist._list
+    passwords = []
+
+    def record_list(request):
+        passwords.append(request.url.params.get("password"))
+        return list_folder(request)
+
+    async def main():
+        async with amr:
+            plans = await amr.plan(
+                [BatchEntry(tmdb_id="1", dir="/show", password="secret")]
+            )
+            PlanFile.dump(str(path), plans)
+            assert "secret" not in path.read_text(encoding="utf-8")
+
+            loaded = PlanFile.load(str(path))
+            assert loaded[0].entry.password is None
+            alist._list = record_list
+            results = await amr.apply(loaded, password="secret")
+            assert results[0].success
+            assert passwords and all(p == "secret" for p in passwords)
+
+    asyncio.run(main())
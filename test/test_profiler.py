@@ -0,0 +1,58 @@
+import json
+from unittest import mock
+
+from AlistMediaRename.profiler import Profiler
+
+
+def test_profiler_nested_stages():
+    """
+    测试同名阶段累计, 内层阶段的内存峰值计入外层阶段
+    """
+
+    profiler = Profiler()
+    with profiler:
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                data = bytearray(4 * 2**20)
+            del data
+        with profiler.stage("inner"):
+            pass
+
+    stages = {stage["name"]: stage for stage in profiler.report()["stages"]}
+    assert stages["inner"]["calls"] == 2
+    assert stages["inner"]["peak_memory"] >= 4 * 2**20
+    assert stages["outer"]["peak_memory"] >= stages["inner"]["peak_memory"]
+    assert profiler.report()["peak_memory"] >= 4 * 2**20
+
+
+def test_tv_rename_id_profile(make_amr, tmp_path):
+    """
+    测试重命名流程按阶段记录性能分析结果, 并保存 JSON 及 cProfile 结果
+    """
+
+    profiler = Profiler(cpu_profile=True)
+    amr, _ = make_amr(30)
+    amr.profiler = profiler
+    with mock.patch("rich.prompt.Confirm.ask", return_value=True), amr, profiler:
+        assert amr.tv_rename_id("1", "/show/")
+
+    report = profiler.report()
+    names = [stage["name"] for stage in report["stages"]]
+    assert names == [
+        "list",
+        "lookup",
+        "select",
+        "plan",
+        "render",
+        "confirm",
+        "apply",
+        "summary",
+    ]
+    assert report["stages"][1]["calls"] == 2
+    assert sum(stage["wall"] for stage in report["stages"]) <= report["wall"]
+    assert report["functions"]
+
+    path = tmp_path / "profile.json"
+    profiler.dump(str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))["stages"][0]["name"] == "list"
+    assert (tmp_path / "profile.json.prof").exists()
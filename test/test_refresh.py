@@ -0,0 +1,87 @@
+from AlistMediaRename import Config
+
+
+def make_tree(alist, tree: dict[str, list[str]], calls: list):
+    """
+    设置模拟 Alist 的文件列表, 记录每次获取文件列表的路径及是否强制刷新
+    未强制刷新时, /new/ 文件夹在父文件夹刷新前不存在
+    """
+
+    hidden = {"/new/"}
+    list_folder = alist._list
+
+    def handle(request):
+        path = request.url.params["path"]
+        refresh = request.url.params["refresh"] == "true"
+        calls.append((path, refresh))
+        if path == "/" and refresh:
+            hidden.clear()
+        if path in hidden:
+            return alist._result(code=500, message="object not found")
+        # 按 tree 更新文件列表, 测试中修改 tree 后立即生效
+        alist.fs[path] = {name: path + name + "/" in tree for name in tree[path]}
+        return list_folder(request)
+
+    alist._list = handle
+
+
+def refresh_config(tmp_path, policy: str) -> Config:
+    config = Config()
+    config.filepath = str(tmp_path / "config.yaml")
+    config.amr.refresh_policy = policy
+    return config
+
+
+def test_refresh_if_stale(make_amr, tmp_path):
+    """
+    测试 if-stale 策略: 首次获取时刷新, 之后文件列表无变化时不刷新, 有变化时刷新
+    文件夹获取失败时刷新父文件夹后重试
+    """
+
+    tree = {"/": ["show", "new"], "/show/": ["1.mkv", "2.mkv"], "/new/": ["1.mkv"]}
+    calls: list = []
+
+    amr, services = make_amr(0, config=refresh_config(tmp_path, "if-stale"))
+    make_tree(services.alist, tree, calls)
+    with amr:
+        assert amr._list_folder("/show/")["video"] == ["1.mkv", "2.mkv"]
+        assert calls == [("/show/", True)]
+
+    calls.clear()
+    amr, services = make_amr(0, config=refresh_config(tmp_path, "if-stale"))
+    make_tree(services.alist, tree, calls)
+    with amr:
+        amr._list_folder("/show/")
+        assert calls == [("/show/", False)]
+
+        calls.clear()
+        tree["/show/"].append("3.mkv")
+        assert amr._list_folder("/show/")["video"] == ["1.mkv", "2.mkv", "3.mkv"]
+        assert calls == [("/show/", False), ("/show/", True)]
+
+        calls.clear()
+        assert amr._list_folder("/new/")["video"] == ["1.mkv"]
+        assert calls == [("/new/", True), ("/", True), ("/new/", True)]
+
+
+def test_refresh_always_and_never(make_amr, tmp_path):
+    """
+    测试 always 策略每次刷新但不刷新父文件夹, never 策略从不刷新
+    """
+
+    tree = {"/": ["show"], "/show/": ["1.mkv", "1.ass"]}
+    calls: list = []
+
+    amr, services = make_amr(0, config=refresh_config(tmp_path, "always"))
+    make_tree(services.alist, tree, calls)
+    with amr:
+        assert amr._list_folder("/show/") == {"video": ["1.mkv"], "subtitle": ["1.ass"]}
+        amr._list_folder("/show/")
+        assert calls == [("/show/", True), ("/show/", True)]
+
+    calls.clear()
+    amr, services = make_amr(0, config=refresh_config(tmp_path, "never"))
+    make_tree(services.alist, tree, calls)
+    with amr:
+        amr._list_folder("/show/")
+        assert calls == [("/show/", False)]
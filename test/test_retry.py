@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+
+from AlistMediaRename.api import AlistApi, TMDBApi
+from AlistMediaRename.client import HttpClients
+from AlistMediaRename.retry import RetryPolicy, retry_counter
+
+
+def test_retry_after_and_counter():
+    """
+    测试 TMDB 返回 429 时按 Retry-After 等待后重试, 并统计重试次数
+    """
+
+    statuses = [429, 503, 200]
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        headers = {"Retry-After": "0"} if status == 429 else {}
+        return httpx.Response(status, json={"id": 1}, headers=headers)
+
+    clients = HttpClients(
+        transport=httpx.MockTransport(handle),
+        async_transport=httpx.MockTransport(handle),
+    )
+    tmdb = TMDBApi("http://tmdb", "key", clients, retry=RetryPolicy(3, backoff=0))
+
+    async def main():
+        counter = [0]
+        retry_counter.set(counter)
+        await tmdb._get_async("/tv/1", {})
+        return counter[0]
+
+    assert asyncio.run(main()) == 2
+    assert tmdb.retry.retries == 2
+
+    statuses[:] = [500] * 4
+    data, status_code = tmdb._get("/tv/1", {})
+    assert status_code == 500 and tmdb.retry.retries == 5
+    clients.close()
+
+
+def test_retry_policy():
+    """
+    测试退避时间范围及 Retry-After 解析, 非幂等请求仅在请求未发出时重试
+    """
+
+    policy = RetryPolicy(backoff=1, max_backoff=4)
+    assert all(0.5 <= policy.delay(0) <= 1 for _ in range(100))
+    assert all(2 <= policy.delay(10) <= 4 for _ in range(100))
+    response = httpx.Response(429, headers={"Retry-After": "60"})
+    assert policy.delay(0, response) == 4
+    response = httpx.Response(
+        429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    )
+    assert policy.delay(0, response) == 0
+
+    read = RetryPolicy()
+    write = RetryPolicy(idempotent=False)
+    timeout = httpx.ReadTimeout("timeout")
+    connect = httpx.ConnectError("refused")
+    assert read.retryable(error=timeout) and read.retryable(httpx.Response(500))
+    assert not write.retryable(error=timeout) and not write.retryable(
+        httpx.Response(500)
+    )
+    assert write.retryable(error=connect) and write.retryable(httpx.Response(429))
+    assert not read.retryable(error=ValueError())
+
+    calls = []
+
+    def send() -> httpx.Response:
+        calls.append(1)
+        raise connect
+
+    try:
+        RetryPolicy(2, backoff=0, idempotent=False).send(send)
+    except httpx.ConnectError:
+        pass
+    assert len(calls) == 3
+
+
+def test_alist_body_code_retry():
+    """
+    测试 Alist 返回 HTTP 200 及响应体错误码 500 时, 获取文件列表重试, 重命名及确定的错误不重试
+    """
+
+    codes = {"/api/fs/list": [500, 500, 200], "/api/fs/rename": [500, 200]}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        code = codes[request.url.path].pop(0)
+        message = "success" if code == 200 else "failed get storage: timeout"
+        return httpx.Response(
+            200, json={"code": code, "message": message, "data": None}
+        )
+
+    clients = HttpClients(transport=httpx.MockTransport(handle))
+    alist = AlistApi(
+        "http://alist",
+        clients=clients,
+        read_retry=RetryPolicy(3, backoff=0),
+        write_retry=RetryPolicy(3, backoff=0, idempotent=False),
+    )
+    alist.token = "token"
+
+    assert alist._post("/api/fs/list", params={"path": "/"})["code"] == 200
+    assert alist.read_retry.retries == 2
+    body = {"name": "b", "path": "/a"}
+    assert alist._post("/api/fs/rename", write=True, json=body)["code"] == 500
+    assert alist.write_retry.retries == 0 and codes["/api/fs/rename"] == [200]
+
+    missing = httpx.Response(
+        200, json={"code": 500, "message": "object not found", "data": None}
+    )
+    assert not alist.read_retry.retryable(missing, body_code=True)
+    assert not alist.read_retry.retryable(httpx.Response(200, json={"code": 500}))
+    clients.close()
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+from AlistMediaRename.models import ApiResponseModel
+from AlistMediaRename.scheduler import AdaptiveLimiter, RateLimiter
+
+
+def make_result(success: bool) -> ApiResponseModel:
+    return ApiResponseModel(
+        success=success,
+        status_code=200 if success else 500,
+        error="" if success else "too many requests",
+        data={},
+        function="rename",
+        args=(),
+        kwargs={},
+    )
+
+
+def run_requests(limiter: AdaptiveLimiter, count: int, throttle: int):
+    """模拟后端, 同时请求数量超过 throttle 时返回错误"""
+
+    state = {"in_flight": 0, "peak": 0}
+
+    async def request() -> ApiResponseModel:
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        overloaded = state["in_flight"] > throttle
+        await asyncio.sleep(0.001)
+        state["in_flight"] -= 1
+        return make_result(not overloaded)
+
+    async def main():
+        return await asyncio.gather(*[limiter.run(request) for _ in range(count)])
+
+    return asyncio.run(main()), state["peak"]
+
+
+def test_limiter_bounds_in_flight_requests():
+    """
+    测试固定并发模式下, 同时进行的请求数量不超过最大并发数
+    """
+
+    limiter = AdaptiveLimiter(max_concurrency=4, adaptive=False)
+    results, peak = run_requests(limiter, 200, throttle=100)
+
+    assert peak == 4
+    assert all(result.success for result in results)
+
+
+def test_limiter_backs_off_on_errors():
+    """
+    测试自适应模式下, 出现错误时降低并发数, 请求正常时逐步提高并发数
+    """
+
+    limiter = AdaptiveLimiter(max_concurrency=32, adaptive=True)
+    results, _ = run_requests(limiter, 500, throttle=4)
+
+    assert limiter.limit < 16
+    assert sum(not result.success for result in results) < 100
+
+    limiter = AdaptiveLimiter(max_concurrency=32, adaptive=True)
+    # 请求均成功, 忽略机器负载造成的延迟波动
+    limiter.spike_factor = float("inf")
+    run_requests(limiter, 500, throttle=100)
+    assert limiter.limit == 32
+
+
+def test_rate_limiter_shared_by_threads_and_tasks():
+    """
+    测试多个线程及事件循环共享令牌桶, 总请求速率不超过限制, 并统计等待时间
+    """
+
+    limiter = RateLimiter(rate=200, burst=10)
+
+    def thread_requests():
+        for _ in range(15):
+            limiter.acquire()
+
+    async def task_requests():
+        await asyncio.gather(*[limiter.acquire_async() for _ in range(15)])
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=thread_requests) for _ in range(2)]
+    threads.append(threading.Thread(target=lambda: asyncio.run(task_requests())))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    stats = limiter.stats()
+    assert stats["requests"] == 45
+    # 突发 10 个请求后, 其余 35 个请求按每秒 200 个放行
+    assert elapsed >= 35 / 200 * 0.9
+    assert stats["wait_count"] >= 35 and stats["wait_time"] > 0
+
+    assert RateLimiter.shared("tmdb", 10, 1) is RateLimiter.shared("tmdb", 20, 2)
+    assert RateLimiter.shared("tmdb").rate == 0
+    unlimited = RateLimiter()
+    start = time.monotonic()
+    for _ in range(1000):
+        unlimited.acquire()
+    assert time.monotonic() - start < 1 and unlimited.wait_count == 0
@@ -0,0 +1,80 @@
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+
+from AlistMediaRename.api import AlistApi
+from AlistMediaRename.client import HttpClients
+from AlistMediaRename.session import TokenStore
+
+
+def make_jwt(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode())
+    return "header." + payload.decode().rstrip("=") + ".signature"
+
+
+def test_token_store_expires(tmp_path):
+    """
+    测试 Token 按地址及用户保存, 并根据 JWT 过期时间判断有效性
+    """
+
+    store = TokenStore(str(tmp_path / "token.json"))
+    valid_token = make_jwt(time.time() + 3600)
+    expired_token = make_jwt(time.time() - 1)
+
+    store.set("http://127.0.0.1:5244/", "admin", valid_token)
+    store.set("http://127.0.0.1:5244", "guest", expired_token)
+
+    assert store.get("http://127.0.0.1:5244", "admin") == valid_token
+    assert store.get("http://127.0.0.1:5244", "guest") is None
+    assert store.get("http://127.0.0.1:5244", "other") is None
+
+    store.remove("http://127.0.0.1:5244", "admin")
+    assert store.get("http://127.0.0.1:5244", "admin") is None
+
+
+def test_token_store_unparsable_token(tmp_path):
+    """
+    测试无法解析过期时间的 Token 使用默认有效期
+    """
+
+    store = TokenStore(str(tmp_path / "token.json"))
+    store.set("http://127.0.0.1:5244", "admin", "not-a-jwt")
+
+    assert store.get("http://127.0.0.1:5244", "admin") == "not-a-jwt"
+
+
+def test_async_login_does_not_block_loop():
+    """
+    测试异步请求中登录时不阻塞事件循环, 多个请求同时等待时只登录一次
+    """
+
+    logins = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        logins.append(request.url.path)
+        time.sleep(0.2)
+        return httpx.Response(
+            200, json={"code": 200, "message": "success", "data": {"token": "t"}}
+        )
+
+    clients = HttpClients(transport=httpx.MockTransport(handle))
+    alist = AlistApi("http://alist", "user", "password", clients=clients)
+
+    async def main() -> int:
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while not alist.token:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[alist._ensure_login_async() for _ in range(3)], tick())
+        return ticks
+
+    assert asyncio.run(main()) > 5
+    assert logins == ["/api/auth/login"] and alist.token == "t"
+    clients.close()
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from unittest import mock
+
+import httpx
+
+from AlistMediaRename import AsyncAmr, Config
+from AlistMediaRename.client import HttpClients
+from AlistMediaRename.utils import Tools
+
+
+def test_map_season_folders():
+    """
+    测试按文件夹名称匹配季度, 名称均无法识别时按文件夹顺序匹配
+    """
+
+    names = [
+        "Season 1",
+        "S02",
+        "season.03",
+        "第4季",
+        "第十二季",
+        "第二十季",
+        "Specials",
+    ]
+    assert [Tools.parse_season_number(name) for name in names] == [
+        1,
+        2,
+        3,
+        4,
+        12,
+        20,
+        0,
+    ]
+    assert Tools.parse_season_number("Extras") is None
+    assert Tools.parse_season_number("S01E01") is None
+
+    folders = ["Season 2", "Season 10", "SP", "Season 1", "Extras", "S01"]
+    assert Tools.map_season_folders(folders, [0, 1, 2]) == [
+        (0, "SP"),
+        (1, "S01"),
+        (2, "Season 2"),
+    ]
+    assert Tools.map_season_folders(["B", "A", "C10", "C9"], [0, 1, 2, 3]) == [
+        (1, "A"),
+        (2, "B"),
+        (3, "C9"),
+    ]
+
+
+def test_show_rename(tmp_path):
+    """
+    测试整部剧集重命名: 季度信息在同一请求中获取, 所有季度统一确认后重命名
+    """
+
+    tree = {
+        "/show/": [("Season 1", True), ("S02", True), ("poster.jpg", False)],
+        "/show/Season 1/": [("01.mkv", False), ("02.mkv", False)],
+        "/show/S02/": [("01.mp4", False), ("01.ass", False)],
+    }
+    tmdb_requests: list = []
+    renamed: list = []
+
+    def season(number: int) -> dict:
+        episodes = [
+            {"episode_number": i, "air_date": "", "vote_average": 0, "name": f"E{i}"}
+            for i in (1, 2)
+        ]
+        return {"season_number": number, "air_date": "2020", "episodes": episodes}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/api/auth/login":
+            data: dict = {"token": "token"}
+        elif path == "/api/fs/list":
+            content = [
+                {"name": name, "is_dir": is_dir, "modified": ""}
+                for name, is_dir in tree[request.url.params["path"]]
+            ]
+            data = {"content": content, "total": len(content)}
+        elif path == "/api/fs/rename":
+            renamed.append(json.loads(request.content))
+            data = {}
+        else:
+            tmdb_requests.append(request.url.params.get("append_to_response"))
+            tv = {
+                "name": "Show",
+                "original_name": "Show",
+                "first_air_date": "2020-01-01",
+                "original_language": "ja",
+                "origin_country": ["JP"],
+                "vote_average": 8.0,
+                "seasons": [
+                    {
+                        "season_number": n,
+                        "air_date": "2020",
+                        "episode_count": 2,
+                        "name": "",
+                    }
+                    for n in (1, 2, 3)
+                ],
+            }
+            for item in (request.url.params.get("append_to_response") or "").split(","):
+                if item:
+                    tv[item] = season(int(item.split("/")[1]))
+            return httpx.Response(200, json=tv)
+        return httpx.Response(
+            200, json={"code": 200, "message": "success", "data": data}
+        )
+
+    config = Config()
+    config.filepath = str(tmp_path / "config.yaml")
+    config.alist.url = "http://alist"
+    config.amr.connection_warmup = False
+    clients = HttpClients(
+        transport=httpx.MockTransport(handle),
+        async_transport=httpx.MockTransport(handle),
+    )
+
+    async def main():
+        async with AsyncAmr(config, clients=clients) as amr:
+            return await amr.show_rename_id("1", "/show/")
+
+    with mock.patch("rich.prompt.Confirm.ask", return_value=True):
+        assert asyncio.run(main())
+
+    assert tmdb_requests == [None, "season/1,season/2"]
+    assert sorted((r["path"], r["name"]) for r in renamed[:-1]) == [
+        ("/show/S02/01.ass", "Show-S02E01.E1.ass"),
+        ("/show/S02/01.mp4", "Show-S02E01.E1.mp4"),
+        ("/show/Season 1/01.mkv", "Show-S01E01.E1.mkv"),
+        ("/show/Season 1/02.mkv", "Show-S01E02.E2.mkv"),
+    ]
+    # 剧集文件夹最后重命名
+    assert renamed[-1] == {"name": "Show (2020)", "path": "/show"}
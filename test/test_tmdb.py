@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+from AlistMediaRename.api import AsyncTMDBApi, TMDBApi
+from AlistMediaRename.cache import TMDBCache
+from AlistMediaRename.client import HttpClients
+
+
+def make_clients(requests: list) -> HttpClients:
+    """模拟 TMDB 剧集接口, 支持 append_to_response 附加季度信息"""
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params.get("append_to_response", ""))
+        data: dict = {
+            "id": 1,
+            "name": "Show",
+            "original_name": "Show",
+            "first_air_date": "2020-01-01",
+            "overview": "",
+            "seasons": [],
+        }
+        for item in request.url.params.get("append_to_response", "").split(","):
+            # 第 99 季不存在, TMDB 不返回该季度
+            if item and item != "season/99":
+                number = int(item.split("/")[1])
+                data[item] = {
+                    "season_number": number,
+                    "air_date": "2020-01-01",
+                    "episodes": [],
+                }
+        return httpx.Response(200, json=data)
+
+    return HttpClients(
+        transport=httpx.MockTransport(handle),
+        async_transport=httpx.MockTransport(handle),
+    )
+
+
+def test_tv_seasons_info(tmp_path):
+    """
+    测试每次请求最多附加 20 个季度, 拆分结果并写入缓存, 之后的请求直接读取缓存
+    """
+
+    requests: list = []
+    cache = TMDBCache(str(tmp_path / "cache.db"))
+    tmdb = TMDBApi("http://tmdb", "key", make_clients(requests), cache)
+    numbers = [*range(1, 26), 99]
+
+    result = tmdb.tv_seasons_info("1", numbers)
+    assert [len(r.split(",")) for r in requests] == [20, 6]
+    assert result.data["tv"]["name"] == "Show"
+    assert not any(key.startswith("season/") for key in result.data["tv"])
+    assert list(result.data["seasons"]) == list(range(1, 26))
+    assert result.data["seasons"][25]["season_number"] == 25
+
+    requests.clear()
+    assert tmdb.tv_season_info("1", 3).data["season_number"] == 3
+    assert tmdb.tv_info("1").data["name"] == "Show"
+    assert tmdb.tv_seasons_info("1", [1, 2]).data["seasons"][2]["season_number"] == 2
+    assert requests == []
+
+    # 缓存中不存在的季度仍需请求
+    tmdb.tv_seasons_info("1", [2, 30])
+    assert requests == ["season/30"]
+    cache.close()
+
+
+def test_tv_seasons_info_async():
+    """
+    测试异步获取多个季度信息, 各分组请求同时进行
+    """
+
+    requests: list = []
+    tmdb = AsyncTMDBApi("http://tmdb", "key", make_clients(requests))
+
+    result = asyncio.run(tmdb.tv_seasons_info("1", list(range(41, 0, -1))))
+    assert sorted(len(r.split(",")) for r in requests) == [1, 20, 20]
+    assert list(result.data["seasons"]) == list(range(41, 0, -1))
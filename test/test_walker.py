@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+
+from AlistMediaRename.api import AlistApi
+from AlistMediaRename.client import HttpClients
+from AlistMediaRename.walker import AlistWalker
+
+
+def make_alist(tree: dict[str, list[str]], state: dict) -> AlistApi:
+    """
+    模拟 Alist 文件列表接口, 文件夹名以 / 结尾
+    /secret/ 文件夹需要密码 123 才能访问
+    """
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/auth/login":
+            data = {"token": "token"}
+            return httpx.Response(
+                200, json={"code": 200, "message": "success", "data": data}
+            )
+
+        path = request.url.params["path"]
+        if path not in tree or (
+            path.startswith("/secret/") and request.url.params.get("password") != "123"
+        ):
+            return httpx.Response(
+                200, json={"code": 500, "message": "object not found", "data": None}
+            )
+        content = [
+            {"name": name.rstrip("/"), "is_dir": name.endswith("/"), "size": 1}
+            for name in tree[path]
+        ]
+        per_page = int(request.url.params.get("per_page", 0))
+        if per_page > 0:
+            page = int(request.url.params["page"])
+            state["pages"].append(page)
+            content = content[(page - 1) * per_page : page * per_page]
+        data = {"content": content, "total": len(tree[path])}
+        return httpx.Response(
+            200, json={"code": 200, "message": "success", "data": data}
+        )
+
+    async def ahandle(request: httpx.Request) -> httpx.Response:
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.001)
+        state["in_flight"] -= 1
+        return handle(request)
+
+    clients = HttpClients(
+        transport=httpx.MockTransport(handle),
+        async_transport=httpx.MockTransport(ahandle),
+    )
+    return AlistApi("http://alist", "user", "password", clients=clients)
+
+
+def make_tree(width: int) -> dict[str, list[str]]:
+    tree = {"/": ["a/", "b/", "secret/", "readme.txt"], "/secret/": ["s.mkv"]}
+    for folder in ("/a/", "/b/"):
+        tree[folder] = [f"{i}/" for i in range(width)] + ["Extras/"]
+        tree[folder + "Extras/"] = ["extra.mkv"]
+        for i in range(width):
+            tree[f"{folder}{i}/"] = ["1.mkv", "1.ass", "cover.jpg"]
+    return tree
+
+
+def test_walker_traverses_tree():
+    """
+    测试遍历全部文件夹, 同时请求数量不超过最大并发数, 并使用上级文件夹密码
+    """
+
+    state = {"in_flight": 0, "peak": 0, "pages": []}
+    alist = make_alist(make_tree(20), state)
+    walker = AlistWalker(alist, max_concurrency=4, passwords={"/secret": "123"})
+
+    paths = [entry.path for entry in walker.walk("/")]
+
+    # 2 个文件夹, 各含 20 个子文件夹及 Extras 文件夹
+    assert len(paths) == 4 + 2 * (21 + 20 * 3 + 1) + 1
+    assert len(paths) == len(set(paths))
+    assert "/secret/s.mkv" in paths
+    assert walker.errors == []
+    assert 1 < state["peak"] <= 4
+    alist.clients.close()
+
+
+def test_walker_filters():
+    """
+    测试层级限制, include/exclude 规则, 以及获取失败的文件夹
+    """
+
+    state = {"in_flight": 0, "peak": 0, "pages": []}
+    alist = make_alist(make_tree(3), state)
+
+    walker = AlistWalker(alist, max_depth=2)
+    entries = list(walker.walk("/"))
+    assert max(entry.depth for entry in entries) == 2
+    assert "/a/Extras" in [entry.path for entry in entries]
+    # 未设置密码
+    assert len(walker.errors) == 1
+
+    walker = AlistWalker(alist, include=["*.mkv"], exclude=["Extras", "/secret"])
+    files = sorted(entry.path for entry in walker.walk("/a") if not entry.is_dir)
+    assert files == ["/a/0/1.mkv", "/a/1/1.mkv", "/a/2/1.mkv"]
+    assert walker.errors == []
+    alist.clients.close()
+
+
+def test_file_list_pages():
+    """
+    测试分页获取文件列表, 按顺序逐项返回全部文件
+    """
+
+    state = {"in_flight": 0, "peak": 0, "pages": []}
+    tree = {"/big/": [f"{i}.mkv" for i in range(1, 2502)]}
+    alist = make_alist(tree, state)
+
+    names = [item["name"] for item in alist.iter_file_list("/big/", per_page=500)]
+    assert names == [f"{i}.mkv" for i in range(1, 2502)]
+    assert sorted(state["pages"]) == [1, 2, 3, 4, 5, 6]
+    assert state["peak"] > 1
+
+    # 不分页时一次获取全部
+    state["pages"].clear()
+    assert len(list(alist.iter_file_list("/big/", per_page=0))) == 2501
+    assert state["pages"] == []
+    alist.clients.close()
+
+
+def test_walker_pages():
+    """
+    测试遍历时分页获取大文件夹的文件列表
+    """
+
+    state = {"in_flight": 0, "peak": 0, "pages": []}
+    tree = {"/": ["big/"], "/big/": [f"{i}.mkv" for i in range(1, 2502)]}
+    alist = make_alist(tree, state)
+
+    walker = AlistWalker(alist, per_page=500, page_concurrency=2)
+    files = [entry.name for entry in walker.walk("/") if not entry.is_dir]
+    assert files == [f"{i}.mkv" for i in range(1, 2502)]
+    assert sorted(state["pages"]) == [1, 1, 2, 3, 4, 5, 6]
+    assert walker.errors == []
+    alist.clients.close()
@@ -0,0 +1,86 @@
+import asyncio
+
+from AlistMediaRename import AsyncAmr
+from AlistMediaRename.cache import TMDBCache
+from AlistMediaRename.models import BatchEntry
+
+
+def test_watch_renames_new_arrivals(make_amr):
+    """
+    测试监视模式仅重命名新增文件, 文件列表无变化时不再请求 TMDB, 父文件夹重命名后继续监视新路径
+    """
+
+    amr, services = make_amr(3, amr_class=AsyncAmr)
+    services.tmdb.episodes = 12
+    alist, tmdb = services.alist, services.tmdb
+
+    async def main():
+        async with amr:
+            watcher = amr.watcher([BatchEntry(tmdb_id="1", dir="/show")], interval=0)
+
+            # 首次检查: 重命名已有文件及父文件夹
+            results = await watcher.poll()
+            assert len(results) == 1 and results[0].success
+            assert results[0].video_count == 3
+            assert results[0].folder_count == 1
+            assert watcher.states[0].folder_path == "/Show (2020)/"
+            tmdb_requests = tmdb.requests
+
+            # 文件列表无变化
+            assert await watcher.poll() == []
+            assert tmdb.requests == tmdb_requests
+
+            # 新增一集, 使用已获取的季度信息重命名
+            alist.fs["/Show (2020)/"]["[Group] Show - 000004 [1080p].mkv"] = False
+            results = await watcher.poll()
+            assert len(results) == 1 and results[0].video_count == 1
+            assert results[0].folder_count == 0
+            assert tmdb.requests == tmdb_requests
+            assert "Show-S01E04.Episode 4.mkv" in alist.fs["/Show (2020)/"]
+            assert watcher.states[0].renamed == 4
+
+            assert await watcher.poll() == []
+
+    asyncio.run(main())
+
+
+def test_watch_refetches_new_episode(make_amr, tmp_path):
+    """
+    测试新增一集超出已缓存的集数时忽略缓存重新获取季度信息, 预告片等无法解析集数的文件不重新获取
+    """
+
+    amr, services = make_amr(3, amr_class=AsyncAmr)
+    alist, tmdb = services.alist, services.tmdb
+    tmdb.episodes = 3
+    amr.tmdb_cache = amr.tmdb.cache = TMDBCache(str(tmp_path / "amr_cache.db"))
+
+    async def main():
+        async with amr:
+            watcher = amr.watcher([BatchEntry(tmdb_id="1", dir="/show")], interval=0)
+            results = await watcher.poll()
+            assert results[0].video_count == 3
+            folder = alist.fs["/Show (2020)/"]
+            tmdb_requests = tmdb.requests
+
+            # 预告片不视为新的一集
+            folder["[Group] Show - Trailer [1080p].mkv"] = False
+            assert await watcher.poll() == []
+            assert tmdb.requests == tmdb_requests
+
+            # 第 4 集尚未更新到 TMDB, 之后每次检查重新获取
+            folder["[Group] Show - 000004 [1080p].mkv"] = False
+            assert await watcher.poll() == []
+            assert tmdb.requests == tmdb_requests + 1
+
+            # TMDB 更新后, 不使用已缓存的 3 集季度信息
+            tmdb.episodes = 4
+            results = await watcher.poll()
+            assert len(results) == 1 and results[0].video_count == 1
+            assert tmdb.requests == tmdb_requests + 2
+            assert "Show-S01E04.Episode 4.mkv" in folder
+            assert "[Group] Show - Trailer [1080p].mkv" in folder
+
+            assert await watcher.poll() == []
+            assert tmdb.requests == tmdb_requests + 2
+
+    asyncio.run(main())